@@ -4,3 +4,7 @@ class ActionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.actions'
     verbose_name = "SDG Actions"
+
+    def ready(self):
+        # Drop the tag rows of records deleted through the ORM
+        from . import signals  # noqa: F401
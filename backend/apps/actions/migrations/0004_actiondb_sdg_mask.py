@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:00
+
+import re
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# Frozen copy of apps.catalog.sdg.sdg_mask, so the backfill does not change with the live helper
+SDG_COUNT = 17
+ALL_SDGS = 18
+
+
+def sdg_mask(value):
+    mask = 0
+    for part in re.split(r"\'| |\]|\[|,|\.|\;", str(value or '')):
+        if not part.strip().isdigit():
+            continue
+        sdg_num = int(part.strip())
+        if sdg_num == ALL_SDGS:
+            return (1 << SDG_COUNT) - 1
+        if 1 <= sdg_num <= SDG_COUNT:
+            mask |= 1 << (sdg_num - 1)
+    return mask
+
+
+def backfill_sdg_mask(apps, schema_editor):
+    ActionDb = apps.get_model('actions', 'ActionDb')
+    ids_by_mask = defaultdict(list)
+    for record_id, sdgs in ActionDb.objects.values_list('id', 'field_sdgs').iterator():
+        ids_by_mask[sdg_mask(sdgs)].append(record_id)
+    for mask, ids in ids_by_mask.items():
+        for start in range(0, len(ids), 1000):
+            ActionDb.objects.filter(id__in=ids[start:start + 1000]).update(sdg_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actions', '0003_alter_actiondb_level'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actiondb',
+            name='sdg_mask',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_sdg_mask, migrations.RunPython.noop),
+    ]
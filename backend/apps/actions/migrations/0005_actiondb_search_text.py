@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:00
+
+from django.db import migrations, models
+
+# Frozen copies of apps.catalog.text.search_text and the FULLTEXT index DDL,
+# so the backfill and the index do not change with the live helpers
+QUOTE_TABLE = str.maketrans({quote: "'" for quote in "’‘´`"})
+
+
+def search_text(*fields):
+    return '\n'.join(' '.join((field or '').translate(QUOTE_TABLE).lower().split()) for field in fields)
+
+
+def backfill_search_text(apps, schema_editor):
+    ActionDb = apps.get_model('actions', 'ActionDb')
+    batch = []
+    for record in ActionDb.objects.only('id', 'actions', 'action_detail', 'additional_notes').iterator():
+        record.search_text = search_text(record.actions, record.action_detail, record.additional_notes)
+        batch.append(record)
+        if len(batch) >= 1000:
+            ActionDb.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        ActionDb.objects.bulk_update(batch, ['search_text'])
+
+
+def add_fulltext_index(apps, schema_editor):
+    # ngram FULLTEXT index used by apps.catalog.text.filter_search_text; stopwords would drop ngrams
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute('SET SESSION innodb_ft_enable_stopword = OFF')
+    schema_editor.execute(
+        'ALTER TABLE action_db ADD FULLTEXT INDEX action_db_search_text_ft (search_text) WITH PARSER ngram'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actions', '0004_actiondb_sdg_mask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actiondb',
+            name='search_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(add_fulltext_index, migrations.RunPython.noop),
+    ]
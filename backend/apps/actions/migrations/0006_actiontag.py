@@ -0,0 +1,88 @@
+# Generated by Django 5.2.6 on 2026-10-17 15:00
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copies of the apps.catalog.tags helpers, apps.actions.models.parse_levels
+# and ActionDb.TAG_FIELDS, so the backfill does not change with the live tag configuration
+TAG_LENGTH = 191
+
+
+def normalize_tag(value):
+    return ' '.join(str(value).lower().split())[:TAG_LENGTH]
+
+
+def split_commas(text):
+    return str(text).split(',')
+
+
+def level_tags(level):
+    if not level:
+        return []
+    levels = set()
+    for part in re.split(r"\'| |\]|\[|,|\.|\;", str(level)):
+        if part.strip().isdigit() and 1 <= int(part.strip()) <= 6:
+            levels.add(int(part.strip()))
+    return [str(level_num) for level_num in sorted(levels)]
+
+
+TAG_FIELDS = {
+    'level': ('level', level_tags),
+    'industry': ('related_industry_org_only_field', split_commas),
+}
+
+
+def record_tags(record):
+    tags = set()
+    for kind, (column, split) in TAG_FIELDS.items():
+        text = getattr(record, column)
+        if text is None:
+            continue
+        for value in split(text):
+            value = normalize_tag(value)
+            if value:
+                tags.add((kind, value))
+    return tags
+
+
+def backfill_tags(apps, schema_editor):
+    ActionDb = apps.get_model('actions', 'ActionDb')
+    ActionTag = apps.get_model('actions', 'ActionTag')
+    columns = ['id'] + [column for column, _ in TAG_FIELDS.values()]
+    batch = []
+    for record in ActionDb.objects.only(*columns).iterator():
+        batch.extend(
+            ActionTag(record_id=record.id, kind=kind, value=value)
+            for kind, value in sorted(record_tags(record))
+        )
+        if len(batch) >= 1000:
+            ActionTag.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        ActionTag.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actions', '0005_actiondb_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActionTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('record_id', models.IntegerField()),
+                ('kind', models.CharField(max_length=16)),
+                ('value', models.CharField(max_length=191)),
+            ],
+            options={
+                'db_table': 'action_tags',
+                'indexes': [models.Index(fields=['kind', 'value', 'record_id'], name='action_tags_lookup_idx')],
+                'unique_together': {('record_id', 'kind', 'value')},
+            },
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,12 @@
 from django.db import models
 import re
+from functools import lru_cache
 from django.contrib.auth.models import User
 
+from apps.catalog.sdg import parse_sdgs, sdg_mask
+from apps.catalog.tags import TAG_LENGTH, split_commas, sync_tags
+from apps.catalog.text import search_text
+
 SDG_CHOICES = (
     (1, '1'), (2, '2'), (3, '3'), (4, '4'), (5, '5'), (6, '6'),
     (7, '7'), (8, '8'), (9, '9'), (10, '10'), (11, '11'), (12, '12'),
@@ -52,6 +57,41 @@ INDUSTRY_CHOICES = [
     'Arts and recreation services'
 ]
 
+def parse_levels(level):
+    """Level numbers (1-6) in the Level text, e.g. "1, 3" or "[2]" """
+    if not level:
+        return []
+
+    level_list = []
+    level_string = str(level)
+    level_parts = re.split(r"\'| |\]|\[|,|\.|\;", level_string)
+
+    for part in level_parts:
+        if part.strip() and part.strip().isdigit():
+            level_num = int(part.strip())
+            if 1 <= level_num <= 6:  # 假设level范围是1-6
+                level_list.append(level_num)
+
+    return sorted(list(set(level_list)))
+
+
+@lru_cache(maxsize=1024)
+def format_level_label(level):
+    """ActionDb.level_label for a Level text, memoized for the list serializer"""
+    levels = parse_levels(level)
+    if not levels:
+        return ''
+    if len(levels) == 1:
+        level_dict = dict(LEVEL_CHOICES)
+        return level_dict.get(levels[0], '')
+    else:
+        return f"Levels {', '.join(map(str, levels))}"
+
+
+def level_tags(level):
+    return [str(level_num) for level_num in parse_levels(level)]
+
+
 class ActionDb(models.Model):
     """
     Action Database Model
@@ -75,6 +115,21 @@ class ActionDb(models.Model):
     additional_notes = models.TextField(db_column='Additional Notes', blank=True, null=True)
     column15 = models.CharField(db_column='Column15', max_length=50, blank=True, null=True)
     award_descriptions = models.TextField(db_column='Award descriptions', blank=True, null=True)
+    # Derived from the SDG text on save: bit N-1 set for SDG N
+    sdg_mask = models.IntegerField(default=0, editable=False)
+    # Derived from Actions, Action detail and Additional Notes on save, for the list search (apps.catalog.text)
+    search_text = models.TextField(default='', editable=False)
+
+    # Source columns of each derived column
+    DERIVED_FIELDS = {
+        'sdg_mask': ('field_sdgs',),
+        'search_text': ('actions', 'action_detail', 'additional_notes'),
+    }
+    # Tag kind -> (source column, splitter) of the action_tags rows (apps.catalog.tags)
+    TAG_FIELDS = {
+        'level': ('level', level_tags),
+        'industry': ('related_industry_org_only_field', split_commas),
+    }
     
     class Meta: 
         db_table = 'action_db'
@@ -84,55 +139,36 @@ class ActionDb(models.Model):
     
     def __str__(self):
         return self.actions or f"Action Resource {self.id}"
+
+    def save(self, *args, **kwargs):
+        self.refresh_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                derived for derived, sources in self.DERIVED_FIELDS.items() if set(sources) & set(update_fields)
+            }
+        super().save(*args, **kwargs)
+        if update_fields is None or {column for column, _ in self.TAG_FIELDS.values()} & set(update_fields):
+            sync_tags(ActionTag, [self], self.TAG_FIELDS)
+
+    def refresh_derived_fields(self):
+        """Recompute columns derived from the SDG text and searchable text"""
+        self.sdg_mask = sdg_mask(self.field_sdgs)
+        self.search_text = search_text(self.actions, self.action_detail, self.additional_notes)
     
     @property
     def sdgs_list(self):
-        if not self.field_sdgs:
-            return []
-        
-        sdg_list = []
-        item_sdg_string = str(self.field_sdgs)
-        item_sdg_parts = re.split(r"\'| |\]|\[|,|\.|\;", item_sdg_string)
-        
-        for part in item_sdg_parts:
-            if part.strip() and part.strip().isdigit():
-                sdg_num = int(part.strip())
-                if 1 <= sdg_num <= 17:
-                    sdg_list.append(sdg_num)
-                elif sdg_num == 18:  
-                    return list(range(1, 18))  
-        
-        return sorted(list(set(sdg_list)))  
-    
+        return parse_sdgs(self.field_sdgs)
+
     @property
     def level_list(self):
         """Get the level as a list of integers"""
-        if not self.level:
-            return []
-        
-        level_list = []
-        level_string = str(self.level)
-        level_parts = re.split(r"\'| |\]|\[|,|\.|\;", level_string)
-        
-        for part in level_parts:
-            if part.strip() and part.strip().isdigit():
-                level_num = int(part.strip())
-                if 1 <= level_num <= 6:  # 假设level范围是1-6
-                    level_list.append(level_num)
-        
-        return sorted(list(set(level_list)))
+        return parse_levels(self.level)
 
     @property
     def level_label(self):
         """Get the level label"""
-        levels = self.level_list
-        if not levels:
-            return ''
-        if len(levels) == 1:
-            level_dict = dict(LEVEL_CHOICES)
-            return level_dict.get(levels[0], '')
-        else:
-            return f"Levels {', '.join(map(str, levels))}"
+        return format_level_label(self.level)
     
     @property
     def individual_organization_label(self):
@@ -174,6 +210,22 @@ class ActionDb(models.Model):
     def get_absolute_url(self):
         return f"/action/{self.id}/"
 
+class ActionTag(models.Model):
+    """
+    One normalized tag of an action record, derived from ActionDb.TAG_FIELDS.
+    Keyed by record id without a foreign key, since records are also deleted with raw SQL.
+    """
+    record_id = models.IntegerField()
+    kind = models.CharField(max_length=16)
+    value = models.CharField(max_length=TAG_LENGTH)
+
+    class Meta:
+        db_table = 'action_tags'
+        unique_together = ('record_id', 'kind', 'value')
+        indexes = [
+            models.Index(fields=['kind', 'value', 'record_id'], name='action_tags_lookup_idx'),
+        ]
+
 class LikedAction(models.Model):
     """
     The user's collection and likes table for Action
@@ -1,5 +1,8 @@
 from rest_framework import serializers
-from .models import ActionDb
+from apps.catalog.likes import LikedField
+from apps.catalog.rows import ListRows
+from apps.catalog.sdg import cached_sdgs
+from .models import ActionDb, INDIVIDUAL_ORGANIZATION_CHOICES, format_level_label
 from .models import LikedAction
 
 class ActionDbSerializer(serializers.ModelSerializer):
@@ -13,6 +16,7 @@ class ActionDbSerializer(serializers.ModelSerializer):
     industry_list = serializers.ReadOnlyField()
     location = serializers.ReadOnlyField()
     related_industry = serializers.ReadOnlyField()
+    is_liked = LikedField(LikedAction, 'action_id')
     
     class Meta:
         model = ActionDb
@@ -26,7 +30,7 @@ class ActionDbSerializer(serializers.ModelSerializer):
             'digital_actions', 'digital_actions_label',
             'source_descriptions', 'source_links',
             'award', 'award_label', 'award_descriptions',
-            'additional_notes'
+            'additional_notes', 'is_liked'
         ]
 
 class ActionDbListSerializer(serializers.ModelSerializer):
@@ -45,6 +49,34 @@ class ActionDbListSerializer(serializers.ModelSerializer):
             'location', 'award', 'award_label'
         ]
 
+INDIVIDUAL_ORGANIZATION_LABELS = dict(INDIVIDUAL_ORGANIZATION_CHOICES)
+
+def individual_organization_label(value):
+    return INDIVIDUAL_ORGANIZATION_LABELS.get(value, '') if value is not None else ''
+
+def award_label(award):
+    return ('Yes' if award == 1 else 'No') if award is not None else ''
+
+# ActionDbListSerializer's output built directly from values() rows (apps.catalog.rows)
+ACTION_LIST_ROWS = ListRows({
+    'id': (('id',), lambda row: row['id']),
+    'actions': (('actions',), lambda row: row['actions']),
+    'action_detail': (('action_detail',), lambda row: row['action_detail']),
+    'sdgs_list': (('field_sdgs',), lambda row: list(cached_sdgs(row['field_sdgs']))),
+    'level': (('level',), lambda row: row['level']),
+    'level_label': (('level',), lambda row: format_level_label(row['level'])),
+    'individual_organization': (('individual_organization',), lambda row: row['individual_organization']),
+    'individual_organization_label': (
+        ('individual_organization',), lambda row: individual_organization_label(row['individual_organization'])
+    ),
+    'location': (
+        ('location_specific_actions_org_onlyonly_field',),
+        lambda row: row['location_specific_actions_org_onlyonly_field'] or '',
+    ),
+    'award': (('award',), lambda row: row['award']),
+    'award_label': (('award',), lambda row: award_label(row['award'])),
+}, text_fields=('actions', 'action_detail'))
+
 class ActionSearchSerializer(serializers.Serializer):
 
     search = serializers.CharField(max_length=255, required=False, help_text="Search for titles and details")
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.catalog.tags import delete_tags
+
+from .models import ActionDb, ActionTag
+
+
+@receiver(post_delete, sender=ActionDb)
+def action_deleted(sender, instance, **kwargs):
+    # action_tags has no foreign key to cascade; the raw SQL delete path cleans up itself
+    delete_tags(ActionTag, [instance.pk])
@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.actions.models import ActionDb, LikedAction
+from apps.actions.serializers import ActionDbListSerializer
+
+
+class ActionListRowsTestCase(TestCase):
+    def test_list_payload_matches_list_serializer(self):
+        ActionDb.objects.create(actions='Compost', field_sdgs='12', level='2', individual_organization=1, award=1)
+        ActionDb.objects.create(actions='Vote ', level='[3, 1]', location_specific_actions_org_onlyonly_field='Perth')
+        ActionDb.objects.create(actions='Cycle', level='9', individual_organization=7, award=0)
+
+        response = APIClient().get('/api/actions/')
+        records = ActionDb.objects.order_by('-award', 'actions')
+        expected = JSONRenderer().render(ActionDbListSerializer(records, many=True).data)
+        self.assertEqual(response.content, b'{"count":3,"next":null,"previous":null,"results":' + expected + b'}')
+
+    def test_liked_actions_support_sparse_fields(self):
+        user = User.objects.create_user(username='liker', password='pass')
+        action = ActionDb.objects.create(actions='Compost', action_detail='x' * 5000, level='2')
+        LikedAction.objects.create(user=user, action_id=action.id)
+
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/api/actions/liked/detail/', {'fields': 'action_detail,level_label', 'truncate': '3'})
+        self.assertEqual(response.json(), [
+            {'id': action.id, 'action_detail': 'xxx…', 'level_label': 'Level 2 - at Home, Individual action'},
+        ])
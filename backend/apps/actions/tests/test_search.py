@@ -0,0 +1,15 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.actions.models import ActionDb
+
+
+class ActionSearchTestCase(TestCase):
+    def test_searches_actions_detail_and_notes(self):
+        notes = ActionDb.objects.create(actions='Cycle', additional_notes='Don’t drive')
+        detail = ActionDb.objects.create(actions='Compost', action_detail='Reduce food waste')
+
+        response = APIClient().get('/api/actions/', {'search': "don't"})
+        self.assertEqual([item['id'] for item in response.json()['results']], [notes.id])
+        response = APIClient().get('/api/actions/', {'search': 'FOOD compost'})
+        self.assertEqual([item['id'] for item in response.json()['results']], [detail.id])
@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.actions.models import ActionDb
+from apps.catalog.version import bump_catalog_version
+
+
+class ActionStatsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        ActionDb.objects.create(actions='Plant trees', field_sdgs='13, 15', level='1', individual_organization=0,
+                                digital_actions=0, award=1)
+        ActionDb.objects.create(actions='Everything', field_sdgs='18', level='2', individual_organization=1,
+                                digital_actions=1, award=0)
+        ActionDb.objects.create(actions='Untagged', field_sdgs='', level='2')
+
+    def test_counts_in_one_query_and_cached_per_version(self):
+        # aggregate, latest resources
+        with self.assertNumQueries(2):
+            data = self.client.get('/api/actions/stats/').json()
+        self.assertEqual(data['total_resources'], 3)
+        self.assertEqual(data['sdg_distribution']['sdg_13'], 2)
+        self.assertEqual(data['sdg_distribution']['sdg_1'], 1)
+        self.assertEqual(data['level_distribution']['level_2'], 2)
+        self.assertEqual(data['individual_organization_distribution']['io_0'], 1)
+        self.assertEqual(data['digital_actions_stats'], {'digital_yes': 1, 'digital_no': 1})
+        self.assertEqual(data['award_stats'], {'award_yes': 1, 'award_no': 1})
+        self.assertEqual(data['latest_resources'][0]['actions'], 'Untagged')
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/actions/stats/')
+
+        ActionDb.objects.create(actions='New', field_sdgs='1')
+        bump_catalog_version()
+        data = self.client.get('/api/actions/stats/').json()
+        self.assertEqual(data['total_resources'], 4)
+        self.assertEqual(data['sdg_distribution']['sdg_1'], 2)
@@ -0,0 +1,44 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.actions.models import ActionDb, ActionTag
+
+
+class ActionTagFilterTestCase(TestCase):
+    def ids(self, params):
+        response = APIClient().get('/api/actions/', params)
+        return sorted(item['id'] for item in response.json()['results'])
+
+    def test_level_matches_each_listed_level(self):
+        single = ActionDb.objects.create(actions='Recycle', level='1')
+        listed = ActionDb.objects.create(actions='Vote', level='3, 1')
+        other = ActionDb.objects.create(actions='Lobby', level='6')
+
+        self.assertEqual(self.ids({'level': '1'}), [single.id, listed.id])
+        self.assertEqual(self.ids({'level': ['3', '6']}), [listed.id, other.id])
+        self.assertEqual(self.ids({'level': '2'}), [])
+
+    def test_industry_matches_the_start_of_a_tag_and_location_any_part(self):
+        match = ActionDb.objects.create(
+            actions='Audit', related_industry_org_only_field='Mining, Wholesale and retail trade',
+            location_specific_actions_org_onlyonly_field='New South Wales',
+        )
+        ActionDb.objects.create(actions='Plant', related_industry_org_only_field='Construction')
+
+        self.assertEqual(self.ids({'industry': 'WHOLESALE'}), [match.id])
+        self.assertEqual(self.ids({'industry': 'retail'}), [])
+        self.assertEqual(self.ids({'location': 'new south'}), [match.id])
+        self.assertEqual(self.ids({'location': 'south wales'}), [match.id])
+        self.assertEqual(self.ids({'industry': 'mining, wholesale'}), [])
+
+    def test_tags_follow_saves(self):
+        action = ActionDb.objects.create(actions='Audit', level='2', related_industry_org_only_field='Mining')
+        action.level = '4'
+        action.save(update_fields=['level'])
+
+        tags = set(ActionTag.objects.filter(record_id=action.id).values_list('kind', 'value'))
+        self.assertEqual(tags, {('level', '4'), ('industry', 'mining')})
+
+        action_id = action.id
+        action.delete()
+        self.assertFalse(ActionTag.objects.filter(record_id=action_id).exists())
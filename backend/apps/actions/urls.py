@@ -1,20 +1,23 @@
 from django.urls import path
+
+from apps.catalog.async_views import catalog_view
 from . import views
 from .views import LikeActionView, ListLikedActionView, LikedActionDetailView
 
 app_name = 'action'
 
 urlpatterns = [
-    path('', views.ActionListView.as_view(), name='action-list'),
-    path('<int:id>/', views.ActionDetailView.as_view(), name='action-detail'),
+    path('', catalog_view(views.ActionListView.as_view()), name='action-list'),
+    path('<int:id>/', catalog_view(views.ActionDetailView.as_view()), name='action-detail'),
+    path('bulk/', catalog_view(views.action_bulk), name='action-bulk'),
     
 
-    path('stats/', views.action_stats, name='action-stats'),
-    path('filters/', views.action_filters, name='action-filters'),
+    path('stats/', catalog_view(views.action_stats), name='action-stats'),
+    path('filters/', catalog_view(views.action_filters), name='action-filters'),
     
-    path('sdg/<int:sdg_number>/', views.action_by_sdg, name='action-by-sdg'),
+    path('sdg/<int:sdg_number>/', catalog_view(views.action_by_sdg), name='action-by-sdg'),
     
-    path('level/<int:level_number>/', views.action_by_level, name='action-by-level'),
+    path('level/<int:level_number>/', catalog_view(views.action_by_level), name='action-by-level'),
     
     path('like/', LikeActionView.as_view(), name='like-action'),
     path('liked/', ListLikedActionView.as_view(), name='liked-action-list'),  
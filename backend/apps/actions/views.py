@@ -2,8 +2,7 @@ from rest_framework import generics, status, filters
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, Count, Case, When, Value, CharField, TextField
-from django.db.models.functions import Replace
+from django.db.models import Q, Count, Case, When, Value, CharField
 from django.http import JsonResponse
 import re
 from rest_framework import generics, status
@@ -13,11 +12,18 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db.models import Q
 
-from .models import ActionDb, LikedAction
+from apps.catalog.bulk import bulk_response
+from apps.catalog.rows import FastJSONRenderer, list_rows
+from apps.catalog.sdg import filter_by_sdgs, parse_sdg_params, sdg_count_aggregates
+from apps.catalog.tags import filter_by_tag, filter_by_tags
+from apps.catalog.text import filter_search_text
+from apps.catalog.version import cached_for_catalog_version
+from .models import ActionDb, ActionTag, LikedAction
 from .serializers import ActionDbSerializer, ActionDbListSerializer
 
 from .models import ActionDb, LEVEL_CHOICES, INDIVIDUAL_ORGANIZATION_CHOICES, INDUSTRY_CHOICES
 from .serializers import (
+    ACTION_LIST_ROWS,
     ActionDbSerializer, 
     ActionDbListSerializer,
     ActionSearchSerializer
@@ -42,6 +48,7 @@ class ActionPagination(PageNumberPagination):
 class ActionListView(generics.ListAPIView):
     serializer_class = ActionDbListSerializer
     pagination_class = ActionPagination
+    renderer_classes = [FastJSONRenderer]
 
     def get_queryset(self):
         queryset = ActionDb.objects.all()
@@ -49,64 +56,20 @@ class ActionListView(generics.ListAPIView):
         # Basic Search - Titles and Details
         search = self.request.query_params.get('search', None)
         if search:
-            query = Q()
-            for keyword in search.strip().lower().split():
-                word_query = Q()
-                
-                variants = [keyword]
-                
-                if any(quote in keyword for quote in ["'", "’", "‘", "´", "`"]):
-                    base_word = keyword
-                    for old_quote in ["'", "’", "‘", "´", "`"]:
-                        for new_quote in ["'", "’", "‘", "´", "`"]:
-                            variants.append(base_word.replace(old_quote, new_quote))
-                
-                variants = list(set(variants))
-                
-                for variant in variants:
-                    word_query |= (
-                        Q(actions__icontains=variant) |
-                        Q(action_detail__icontains=variant) |
-                        Q(additional_notes__icontains=variant)
-                    )
-                
-                query &= word_query
-            queryset = queryset.filter(query)
+            # Every word must appear in the normalized text (quote variants unified, case-folded)
+            queryset = filter_search_text(queryset, search)
         
         # SDG Filtering
-        sdg = self.request.query_params.getlist('sdg')
+        sdg = parse_sdg_params(self.request.query_params.getlist('sdg'))
         if sdg:
-            for sdg_num in sdg:
-                if sdg_num.isdigit():
-                    queryset = queryset.annotate(
-                        sdgs_no_space=Replace(
-                            'field_sdgs', 
-                            Value(' '), 
-                            Value(''), 
-                            output_field=TextField()
-                        )
-                    ).filter(
-                        Q(sdgs_no_space__exact=sdg_num) |
-                        Q(sdgs_no_space__startswith=f'{sdg_num},') |
-                        Q(sdgs_no_space__contains=f',{sdg_num},') |
-                        Q(sdgs_no_space__endswith=f',{sdg_num}') |
-                        Q(sdgs_no_space__contains='18')
-                    )
+            # Every requested SDG by default, any of them with sdg_mode=any
+            sdg_mode = self.request.query_params.get('sdg_mode', 'all')
+            queryset = filter_by_sdgs(queryset, sdg, mode=sdg_mode)
         
-        # Level Filtering
-        level = self.request.query_params.getlist('level')
+        # Level Filtering - normalized action_tags rows, one per level of a record
+        level = [level_num for level_num in self.request.query_params.getlist('level') if level_num.isdigit()]
         if level:
-            level_query = Q()
-            for level_num in level:
-                if level_num.isdigit():
-                    level_query |= (
-                        Q(level__exact=level_num) |
-                        Q(level__regex=f'^{level_num}\\s*,') |
-                        Q(level__regex=f',\\s*{level_num}\\s*,') |
-                        Q(level__regex=f',\\s*{level_num}$')
-                    )
-            
-            queryset = queryset.filter(level_query)
+            queryset = filter_by_tags(queryset, ActionTag, 'level', [str(int(level_num)) for level_num in level], exact=True)
         
         # individual_organization Filtering
         individual_organization = self.request.query_params.getlist('individual_organization')
@@ -125,9 +88,7 @@ class ActionListView(generics.ListAPIView):
         # industry filtering
         industry = self.request.query_params.get('industry', None)
         if industry:
-            queryset = queryset.filter(
-                related_industry_org_only_field__icontains=industry
-            )
+            queryset = filter_by_tag(queryset, ActionTag, 'industry', industry)
         
         # digital_actions
         digital_actions = self.request.query_params.get('digital_actions', None)
@@ -150,73 +111,63 @@ class ActionListView(generics.ListAPIView):
         
         return queryset.distinct()
 
+    def list(self, request, *args, **kwargs):
+        # values() rows instead of ActionDbListSerializer, same payload
+        return list_rows(request, self.get_queryset(), ACTION_LIST_ROWS, view=self)
+
 class ActionDetailView(generics.RetrieveAPIView):
     """Action Resource Details API"""
     queryset = ActionDb.objects.all()
     serializer_class = ActionDbSerializer
     lookup_field = 'id'
 
+@api_view(['GET'])
+def action_bulk(request):
+    """Several action resources by ID (?ids=3,1,2) in one query, in the requested order"""
+    return bulk_response(request, ActionDb.objects.all(), ActionDbSerializer)
+
 @api_view(['GET'])
 def action_stats(request):
     """
     Action Statistics Information API
     """
-    queryset = ActionDb.objects.all()
-    total_resources = queryset.count()
-    
-    sdg_count = [0] * 18 
-    
-    for item in queryset:
-        if item.field_sdgs:
-            item_sdg_string = str(item.field_sdgs)
-            item_sdg_list = re.split(r"\'| |\]|\[|,|\.|\;", item_sdg_string)
-            
-            for e in item_sdg_list:
-                if e.strip() and e.strip().isdigit():
-                    e_int = int(e.strip())
-                    if 1 <= e_int <= 17:
-                        sdg_count[e_int] += 1
-                    elif e_int == 18:  
-                        for i in range(1, 18):
-                            sdg_count[i] += 1
-    
-    sdg_distribution = {f'sdg_{i}': sdg_count[i] for i in range(1, 18)}
-    
-    level_stats = {}
-    for level_num, level_label in LEVEL_CHOICES:
-        count = queryset.filter(level=level_num).count()
-        level_stats[f'level_{level_num}'] = count
-    
-    io_stats = {}
-    for io_num, io_label in INDIVIDUAL_ORGANIZATION_CHOICES:
-        count = queryset.filter(individual_organization=io_num).count()
-        io_stats[f'io_{io_num}'] = count
-    
-    digital_yes = queryset.filter(digital_actions=0).count()
-    digital_no = queryset.filter(digital_actions=1).count()
-    
-    award_yes = queryset.filter(award=1).count()
-    award_no = queryset.filter(award=0).count()
+    return Response(cached_for_catalog_version('actions:stats', compute_action_stats))
+
+def compute_action_stats():
+    """All counts in one aggregate query over the SDG bitmask and the choice columns"""
+    counts = ActionDb.objects.aggregate(
+        total_resources=Count('pk'),
+        **sdg_count_aggregates(),
+        **{f'level_{level_num}': Count('pk', filter=Q(level=level_num)) for level_num, _ in LEVEL_CHOICES},
+        **{f'io_{io_num}': Count('pk', filter=Q(individual_organization=io_num))
+           for io_num, _ in INDIVIDUAL_ORGANIZATION_CHOICES},
+        digital_yes=Count('pk', filter=Q(digital_actions=0)),
+        digital_no=Count('pk', filter=Q(digital_actions=1)),
+        award_yes=Count('pk', filter=Q(award=1)),
+        award_no=Count('pk', filter=Q(award=0)),
+    )
     
-    latest_resources = queryset.order_by('-id')[:5]
+    latest_resources = ActionDb.objects.order_by('-id')[:5]
     latest_serializer = ActionDbListSerializer(latest_resources, many=True)
     
-    return Response({
-        'total_resources': total_resources,
-        'sdg_distribution': sdg_distribution,
-        'level_distribution': level_stats,
-        'individual_organization_distribution': io_stats,
+    return {
+        'total_resources': counts['total_resources'],
+        'sdg_distribution': {f'sdg_{i}': counts[f'sdg_{i}'] for i in range(1, 18)},
+        'level_distribution': {f'level_{n}': counts[f'level_{n}'] for n, _ in LEVEL_CHOICES},
+        'individual_organization_distribution': {
+            f'io_{n}': counts[f'io_{n}'] for n, _ in INDIVIDUAL_ORGANIZATION_CHOICES
+        },
         'digital_actions_stats': {
-            'digital_yes': digital_yes,
-            'digital_no': digital_no
+            'digital_yes': counts['digital_yes'],
+            'digital_no': counts['digital_no']
         },
         'award_stats': {
-            'award_yes': award_yes,
-            'award_no': award_no
+            'award_yes': counts['award_yes'],
+            'award_no': counts['award_no']
         },
-        'latest_resources': latest_serializer.data,
+        'latest_resources': list(latest_serializer.data),
         'filter_options': get_filter_options()
-    })
+    }
 
 @api_view(['GET'])
 def action_filters(request):
@@ -259,18 +210,8 @@ def action_by_sdg(request, sdg_number):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    queryset = ActionDb.objects.all()
-    
-    if sdg_number == 1:
-        sdg_query = Q(field_sdgs__startswith='1,') | Q(field_sdgs__exact='1')
-    elif sdg_number < 10:
-        sdg_query = Q(field_sdgs__contains=f',{sdg_number},') | Q(field_sdgs__endswith=f',{sdg_number}')
-    else:
-        sdg_query = Q(field_sdgs__contains=str(sdg_number))
-    
-    sdg_query |= Q(field_sdgs__contains='18')
-    
-    queryset = queryset.filter(sdg_query)
+    # Records tagged 18 (all SDGs) have every bit set and always match
+    queryset = filter_by_sdgs(ActionDb.objects.all(), [sdg_number])
     
     paginator = ActionPagination()
     page = paginator.paginate_queryset(queryset, request)
@@ -332,9 +273,9 @@ class ListLikedActionView(APIView):
 
 class LikedActionDetailView(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
 
     def get(self, request):
         liked_ids = LikedAction.objects.filter(user=request.user).values_list('action_id', flat=True)
         resources = ActionDb.objects.filter(id__in=liked_ids)
-        serializer = ActionDbListSerializer(resources, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return list_rows(request, resources, ACTION_LIST_ROWS)
\ No newline at end of file
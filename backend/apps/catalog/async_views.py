@@ -0,0 +1,72 @@
+"""
+Async entry points for the catalog read endpoints.
+
+Under daphne a sync view borrows a thread from the shared sync_to_async
+pool for the whole request, so a burst of searches can leave the WebSocket
+consumers waiting for threads. `catalog_view` wraps a sync view in a native
+async view that runs it on a dedicated pool of CATALOG_ASYNC_CONCURRENCY
+threads instead. Once CATALOG_ASYNC_QUEUE_LIMIT requests are in flight on
+that pool, further requests get a 503 rather than piling up.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = 0
+
+
+def get_catalog_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'CATALOG_ASYNC_CONCURRENCY', 8),
+                thread_name_prefix='catalog',
+            )
+    return _executor
+
+
+def run_view(view, request, *args, **kwargs):
+    """Call the sync view and render its response on the catalog pool thread"""
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_catalog_view(view):
+    """Native async version of a sync catalog view"""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        global _pending
+        if _pending >= getattr(settings, 'CATALOG_ASYNC_QUEUE_LIMIT', 100):
+            response = JsonResponse({'error': 'Too many concurrent requests, please retry'}, status=503)
+            response['Retry-After'] = '1'
+            return response
+
+        _pending += 1
+        try:
+            return await sync_to_async(run_view, thread_sensitive=False, executor=get_catalog_executor())(
+                view, request, *args, **kwargs
+            )
+        finally:
+            _pending -= 1
+    return wrapper
+
+
+def catalog_view(view):
+    """The view itself, or its async version when CATALOG_ASYNC_VIEWS is on"""
+    if getattr(settings, 'CATALOG_ASYNC_VIEWS', False):
+        return async_catalog_view(view)
+    return view
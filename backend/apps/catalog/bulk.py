@@ -0,0 +1,62 @@
+"""
+Bulk detail fetches for the education, action and keyword endpoints.
+
+Pages showing several records (liked items, search results) fetch them with
+one request, `bulk/?ids=3,1,2`, answered with one id__in query and returned
+in the requested order, instead of one detail request and query per record.
+IDs without a record are listed under `missing`. A request may carry at most
+CATALOG_BULK_MAX_IDS IDs.
+"""
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class InvalidBulkRequest(ValueError):
+    """Raised for a missing, malformed or oversized list of IDs"""
+
+
+def max_bulk_ids():
+    return getattr(settings, 'CATALOG_BULK_MAX_IDS', 100)
+
+
+def check_batch_size(count):
+    if not count:
+        raise InvalidBulkRequest('No IDs provided')
+    limit = max_bulk_ids()
+    if count > limit:
+        raise InvalidBulkRequest(f'At most {limit} IDs per request')
+
+
+def parse_ids(params, name='ids'):
+    """Distinct IDs from ?ids=3,1,2 (or repeated ids=) in request order"""
+    ids = []
+    for value in params.getlist(name):
+        for part in value.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if not part.isdigit():
+                raise InvalidBulkRequest(f'Invalid ID: {part}')
+            ids.append(int(part))
+    ids = list(dict.fromkeys(ids))
+    check_batch_size(len(ids))
+    return ids
+
+
+def fetch_in_order(queryset, ids):
+    """Records for `ids` in that order with one id__in query, and the IDs that have none"""
+    records = queryset.in_bulk(ids)
+    return [records[pk] for pk in ids if pk in records], [pk for pk in ids if pk not in records]
+
+
+def bulk_response(request, queryset, serializer_class):
+    """Response for a bulk/?ids= request, serialized like the detail view"""
+    try:
+        ids = parse_ids(request.query_params)
+    except InvalidBulkRequest as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    records, missing = fetch_in_order(queryset, ids)
+    serializer = serializer_class(records, many=True, context={'request': request})
+    return Response({'results': serializer.data, 'missing': missing})
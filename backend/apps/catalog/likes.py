@@ -0,0 +1,37 @@
+"""
+Per-request "is liked" lookups shared by the catalog serializers.
+
+`liked_ids` loads the IDs a user has liked from one of the like tables
+(KeywordLike, LikedAction, LikedEducation) with a single query and keeps the
+set on the request, so every serializer and view that asks again while
+serving the same request reuses it instead of querying once per row.
+"""
+from rest_framework import serializers
+
+
+def liked_ids(request, model, field):
+    """Set of `field` values in `model` liked by the request's user; empty for anonymous requests"""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return frozenset()
+
+    # DRF's Request wraps the HttpRequest; keep the sets on the inner one so both share them
+    holder = getattr(request, '_request', request)
+    cache = holder.__dict__.setdefault('_liked_ids', {})
+    key = (model._meta.label, field)
+    if key not in cache:
+        cache[key] = frozenset(model.objects.filter(user=user).values_list(field, flat=True))
+    return cache[key]
+
+
+class LikedField(serializers.ReadOnlyField):
+    """Whether the object's pk is among the current user's likes in `model`"""
+
+    def __init__(self, model, field, **kwargs):
+        self.model = model
+        self.like_field = field
+        kwargs['source'] = 'pk'
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return value in liked_ids(self.context.get('request'), self.model, self.like_field)
@@ -0,0 +1,145 @@
+"""
+Fast serialization path for the education and action list endpoints.
+
+The list views fetch their page with values() and build each row dict
+directly from the columns, following a ListRows spec (EDUCATION_LIST_ROWS,
+ACTION_LIST_ROWS in the apps' serializers). The parsed SDG, type and level
+lists are memoized since catalogs repeat the same few strings. The result
+is the exact payload the ModelSerializer list serializers produce, without
+the per-field and per-property overhead, and FastJSONRenderer writes it
+with orjson when that is installed.
+
+Clients may ask for a sparse fieldset with `?fields=id,title` and for long
+text to be cut with `?truncate=N`. Only the columns behind the requested
+fields are selected, and truncation happens in SQL, so long descriptions
+are neither read nor sent.
+"""
+from functools import lru_cache
+
+from django.db.models.functions import Left
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+try:
+    import orjson
+except ImportError:  # optional; JSONRenderer's output is identical, only slower
+    orjson = None
+
+ELLIPSIS = '…'
+
+
+class InvalidListParams(ValueError):
+    """Raised for a `fields` or `truncate` parameter the endpoint can't honour"""
+
+
+@lru_cache(maxsize=4096)
+def split_list(value):
+    """Comma-separated text as a tuple of stripped, non-empty items (the models' *_list properties)"""
+    if not value:
+        return ()
+    return tuple(item.strip() for item in value.split(',') if item.strip())
+
+
+def truncate_text(value, length):
+    if value is None or len(value) <= length:
+        return value
+    return value[:length] + ELLIPSIS
+
+
+class ListRows:
+    """
+    Output fields of a list row, {field: (source columns, getter of a values() row)}
+    in payload order. `text_fields` are fields read straight from the column of the
+    same name, which ?truncate=N may cut.
+    """
+
+    def __init__(self, fields, text_fields=()):
+        self.fields = fields
+        self.text_fields = frozenset(text_fields)
+
+    def parse_fields(self, params):
+        """Fields requested with ?fields=a,b in payload order, always with id; every field by default"""
+        requested = {name.strip() for name in params.get('fields', '').split(',') if name.strip()}
+        if not requested:
+            return list(self.fields)
+        unknown = requested - set(self.fields)
+        if unknown:
+            raise InvalidListParams(f"Unknown fields: {', '.join(sorted(unknown))}")
+        requested.add('id')
+        return [name for name in self.fields if name in requested]
+
+    @staticmethod
+    def parse_truncate(params):
+        value = params.get('truncate', '').strip()
+        if not value:
+            return None
+        if not value.isdigit() or int(value) < 1:
+            raise InvalidListParams('truncate must be a positive integer')
+        return int(value)
+
+    def select(self, queryset, fields, truncate=None, extra_columns=()):
+        """queryset.values() with only the columns `fields` need, text columns cut to truncate + 1 characters"""
+        columns = []
+        for name in fields:
+            columns.extend(column for column in self.fields[name][0] if column not in columns)
+        columns.extend(column for column in extra_columns if column not in columns)
+        cut = [name for name in fields if truncate and name in self.text_fields]
+        return queryset.values(
+            *[column for column in columns if column not in cut],
+            **{f'{name}_truncated': Left(name, truncate + 1) for name in cut}
+        )
+
+    def row_builder(self, fields=None, truncate=None):
+        """Function building the payload of a row selected by select(fields, truncate)"""
+        getters = [(name, self.fields[name][1]) for name in (fields or self.fields)]
+        cut = [name for name, _ in getters if truncate and name in self.text_fields]
+        if not cut:
+            return lambda row: {name: get(row) for name, get in getters}
+
+        def build(row):
+            for name in cut:
+                row[name] = truncate_text(row.pop(f'{name}_truncated'), truncate)
+            return {name: get(row) for name, get in getters}
+        return build
+
+
+def list_rows(request, queryset, spec, view=None, extra_columns=()):
+    """
+    Response with `spec` rows for queryset, honouring ?fields= and ?truncate=.
+    With a `view`, filtered and paginated like ListAPIView.list().
+    """
+    try:
+        fields = spec.parse_fields(request.query_params)
+        truncate = spec.parse_truncate(request.query_params)
+    except InvalidListParams as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if view is not None:
+        queryset = view.filter_queryset(queryset)
+    queryset = spec.select(queryset, fields, truncate, extra_columns)
+    build = spec.row_builder(fields, truncate)
+    page = view.paginate_queryset(queryset) if view is not None else None
+    rows = [build(row) for row in (queryset if page is None else page)]
+    if page is None:
+        return Response(rows)
+    return view.get_paginated_response(rows)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same bytes through orjson, for the list
+    endpoints. Their payloads hold no floats, which orjson formats
+    differently. Falls back to JSONRenderer for indented output and for
+    values orjson can't encode (lazy strings, invalid surrogates).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer escapes these two, which are valid JSON but not valid JavaScript
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,97 @@
+"""
+SDG membership helpers shared by education, actions and search.
+
+Records store SDGs as free text ("1, 4", "[13]", "18"...). Each record also
+keeps a 17-bit `sdg_mask` derived from that text, where bit N-1 is set for
+SDG N and "18" means every SDG. Filters test bits instead of matching text.
+"""
+import re
+from functools import lru_cache
+
+from django.db.models import Count, F
+from django.db.models.lookups import GreaterThan
+
+SDG_COUNT = 17
+ALL_SDGS = 18
+ALL_SDGS_MASK = (1 << SDG_COUNT) - 1
+
+SDG_SPLIT_RE = re.compile(r"\'| |\]|\[|,|\.|\;")
+
+
+def parse_sdgs(value):
+    """Parse an SDG string into a sorted list of SDG numbers, expanding 18 to all"""
+    if not value:
+        return []
+
+    sdg_list = []
+    for part in SDG_SPLIT_RE.split(str(value)):
+        part = part.strip()
+        if part and part.isdigit():
+            sdg_num = int(part)
+            if 1 <= sdg_num <= SDG_COUNT:
+                sdg_list.append(sdg_num)
+            elif sdg_num == ALL_SDGS:
+                return list(range(1, SDG_COUNT + 1))
+
+    return sorted(set(sdg_list))
+
+
+@lru_cache(maxsize=4096)
+def cached_sdgs(value):
+    """parse_sdgs memoized for the list serializers; a tuple, since results are shared"""
+    return tuple(parse_sdgs(value))
+
+
+def sdgs_to_mask(sdg_numbers):
+    """Bitmask for a list of SDG numbers; 18 selects every SDG, out-of-range numbers are ignored"""
+    mask = 0
+    for sdg_num in sdg_numbers:
+        sdg_num = int(sdg_num)
+        if sdg_num == ALL_SDGS:
+            return ALL_SDGS_MASK
+        if 1 <= sdg_num <= SDG_COUNT:
+            mask |= 1 << (sdg_num - 1)
+    return mask
+
+
+def sdg_mask(value):
+    """Bitmask for an SDG string as stored on a record"""
+    return sdgs_to_mask(parse_sdgs(value))
+
+
+def mask_to_sdgs(mask):
+    return [sdg_num for sdg_num in range(1, SDG_COUNT + 1) if mask & (1 << (sdg_num - 1))]
+
+
+def parse_sdg_params(values):
+    """Collect SDG numbers from query parameters such as ['3', '4,5']"""
+    sdg_numbers = []
+    for value in values:
+        for part in str(value).split(','):
+            part = part.strip()
+            if part.isdigit():
+                sdg_numbers.append(int(part))
+    return sdg_numbers
+
+
+def filter_by_sdgs(queryset, sdg_numbers, mode='all'):
+    """
+    Filter a queryset with an `sdg_mask` field. mode 'all' keeps records
+    tagged with every requested SDG, 'any' keeps records tagged with at least one.
+    """
+    mask = sdgs_to_mask(sdg_numbers)
+    if not mask:
+        return queryset
+
+    queryset = queryset.annotate(sdg_match=F('sdg_mask').bitand(mask))
+    if mode == 'any':
+        return queryset.filter(sdg_match__gt=0)
+    return queryset.filter(sdg_match=mask)
+
+
+def sdg_count_aggregates(field='sdg_mask'):
+    """Aggregates counting the records tagged with each SDG, keyed sdg_1..sdg_17, for a single aggregate() call"""
+    return {
+        f'sdg_{sdg_num}': Count('pk', filter=GreaterThan(F(field).bitand(1 << (sdg_num - 1)), 0))
+        for sdg_num in range(1, SDG_COUNT + 1)
+    }
@@ -0,0 +1,108 @@
+"""
+Normalized tags behind the education and action list filters.
+
+Industries, disciplines and levels are stored as comma-separated text.
+Each record's values are also kept as one tag row per (kind, value) in a tag
+table (education_tags, action_tags), lower-cased and whitespace-collapsed,
+so a filter is an indexed lookup on (kind, value) joined back by record id
+instead of a LIKE scan over the catalog table. Filters match a whole tag or
+its beginning; a prefix LIKE can still use the index, a substring one can't.
+Free-text columns such as locations and organizations have no list items to
+tag and keep their icontains filters.
+
+The models list their tag sources in TAG_FIELDS, {kind: (column, split)},
+where `split` turns the column's text into its values (split_commas or a
+parser of the column's own format). Tags are synced by the models'
+save() and by the Excel import and delete paths, which write with raw SQL;
+the apps' post_delete handlers drop the tags of records deleted through the
+ORM.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+TAG_LENGTH = 191  # longest utf8mb4 column MySQL can index in full
+SYNC_BATCH = 1000
+
+
+def normalize_tag(value):
+    return ' '.join(str(value).lower().split())[:TAG_LENGTH]
+
+
+def split_commas(text):
+    return str(text).split(',')
+
+
+def record_tags(record, tag_fields):
+    """Set of (kind, value) tags of a record"""
+    tags = set()
+    for kind, (column, split) in tag_fields.items():
+        text = getattr(record, column)
+        if text is None:
+            continue
+        for value in split(text):
+            value = normalize_tag(value)
+            if value:
+                tags.add((kind, value))
+    return tags
+
+
+def sync_tags(tag_model, records, tag_fields):
+    """Replace the tags of the given (saved) records"""
+    records = list(records)
+    if not records:
+        return
+    rows = [
+        tag_model(record_id=record.pk, kind=kind, value=value)
+        for record in records
+        for kind, value in sorted(record_tags(record, tag_fields))
+    ]
+    with transaction.atomic():
+        tag_model.objects.filter(record_id__in=[record.pk for record in records]).delete()
+        tag_model.objects.bulk_create(rows, batch_size=SYNC_BATCH)
+
+
+def delete_tags(tag_model, record_ids):
+    tag_model.objects.filter(record_id__in=list(record_ids)).delete()
+
+
+def rebuild_tags(model, tag_model, tag_fields):
+    """Recreate the whole tag table from the catalog table; returns the number of tag rows"""
+    columns = ['id'] + [column for column, _ in tag_fields.values()]
+    with transaction.atomic():
+        tag_model.objects.all().delete()
+        batch = []
+        for record in model.objects.only(*columns).iterator(chunk_size=SYNC_BATCH):
+            batch.append(record)
+            if len(batch) >= SYNC_BATCH:
+                sync_tags(tag_model, batch, tag_fields)
+                batch = []
+        sync_tags(tag_model, batch, tag_fields)
+    return tag_model.objects.count()
+
+
+def filter_by_tag(queryset, tag_model, kind, value, exact=False):
+    """Records with a `kind` tag equal to `value` (exact) or starting with it"""
+    value = normalize_tag(value)
+    if not value:
+        return queryset
+    tags = tag_model.objects.filter(kind=kind)
+    # Tag values are lower-cased already; istartswith is a plain LIKE 'v%' the index serves
+    tags = tags.filter(value=value) if exact else tags.filter(value__istartswith=value)
+    return queryset.filter(pk__in=tags.values('record_id'))
+
+
+def filter_by_tags(queryset, tag_model, kind, values, exact=False):
+    """Records with a `kind` tag matching any of the values"""
+    values = [normalize_tag(value) for value in values]
+    values = [value for value in values if value]
+    if not values:
+        return queryset
+    tags = tag_model.objects.filter(kind=kind)
+    if exact:
+        tags = tags.filter(value__in=values)
+    else:
+        query = Q()
+        for value in values:
+            query |= Q(value__istartswith=value)
+        tags = tags.filter(query)
+    return queryset.filter(pk__in=tags.values('record_id'))
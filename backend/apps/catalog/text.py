@@ -0,0 +1,56 @@
+"""
+Normalized search text shared by the education and action list searches.
+
+Each record keeps a derived `search_text` column: its searchable fields
+lower-cased, with every quote variant unified and whitespace collapsed. A
+query is normalized the same way once, and each of its words becomes a
+single `contains` test on that column instead of one LIKE per quote variant
+and field. On MySQL the column also has an ngram FULLTEXT index, used as a
+prefilter so the LIKE tests only run on candidate rows.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+QUOTES = "'’‘´`"
+QUOTE_TABLE = str.maketrans({quote: "'" for quote in QUOTES[1:]})
+# Fields are joined with a character no query word can contain, so a word never matches across fields
+FIELD_SEPARATOR = '\n'
+# ngram_token_size of the FULLTEXT index; shorter words can't be looked up in it
+NGRAM_SIZE = 2
+NGRAM_WORD_RE = re.compile(r'^\w+$')
+
+
+def normalize_text(text):
+    return ' '.join((text or '').translate(QUOTE_TABLE).lower().split())
+
+
+def search_text(*fields):
+    """Value of the search_text column for a record's searchable fields"""
+    return FIELD_SEPARATOR.join(normalize_text(field) for field in fields)
+
+
+def search_words(query):
+    return normalize_text(query).split()
+
+
+def filter_search_text(queryset, query, field='search_text'):
+    """Records whose normalized text contains every word of the query"""
+    words = search_words(query)
+    if not words:
+        return queryset
+
+    if connection.vendor == 'mysql':
+        indexed = [word for word in words if len(word) >= NGRAM_SIZE and NGRAM_WORD_RE.match(word)]
+        if indexed:
+            # Every row containing a word contains its ngram phrase, so this only drops non-matches
+            against = ' '.join(f'+"{word}"' for word in indexed)
+            queryset = queryset.alias(
+                search_score=RawSQL(f'MATCH({field}) AGAINST (%s IN BOOLEAN MODE)', [against], output_field=FloatField())
+            ).filter(search_score__gt=0)
+
+    for word in words:
+        queryset = queryset.filter(**{f'{field}__contains': word})
+    return queryset
@@ -0,0 +1,127 @@
+"""
+Catalog version shared by all workers through the cache.
+
+Every write to education_db, action_db or keyword_resources bumps the
+version; anything derived from the catalog (search result cache, in-memory
+indexes) is keyed by or rebuilt on the version instead of expiring blindly.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def get_catalog_version():
+    """Return the current catalog version, or None if the cache is unavailable"""
+    try:
+        version = cache.get(CATALOG_VERSION_KEY)
+        if version is None:
+            # Seed from the clock so an evicted key never reuses an old version
+            cache.add(CATALOG_VERSION_KEY, int(time.time()), timeout=None)
+            version = cache.get(CATALOG_VERSION_KEY)
+        return version
+    except Exception as e:
+        logger.warning(f"Catalog version unavailable: {e}")
+        return None
+
+
+def bump_catalog_version():
+    """Invalidate everything derived from the catalog; call after any catalog write"""
+    try:
+        try:
+            return cache.incr(CATALOG_VERSION_KEY)
+        except ValueError:
+            cache.set(CATALOG_VERSION_KEY, int(time.time()), timeout=None)
+            return cache.get(CATALOG_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Failed to bump catalog version: {e}")
+        return None
+
+
+def cached_for_catalog_version(key, compute, timeout=86400):
+    """
+    compute(), shared by all workers through the cache until the catalog
+    version changes. Older entries become unreachable; `timeout` only bounds
+    how long they linger.
+    """
+    version = get_catalog_version()
+    if version is None:
+        return compute()
+
+    cache_key = f'{key}:v{version}'
+    try:
+        value = cache.get(cache_key)
+    except Exception as e:
+        logger.warning(f"Cache read of {key} failed: {e}")
+        return compute()
+    if value is None:
+        value = compute()
+        try:
+            cache.set(cache_key, value, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Cache write of {key} failed: {e}")
+    return value
+
+
+class CatalogBoundResource:
+    """
+    A per-process object built from the catalog and rebuilt when the catalog
+    version changes or when it is older than the `max_age_setting` seconds.
+
+    The shared version is read at most once every CATALOG_VERSION_CHECK_SECONDS.
+    While one thread rebuilds, other threads keep serving the previous value.
+    With `incremental`, the builder receives the previous value (or None) so
+    it can reuse the parts that did not change.
+    """
+
+    def __init__(self, builder, max_age_setting=None, incremental=False):
+        self.builder = builder
+        self.max_age_setting = max_age_setting
+        self.incremental = incremental
+        self._value = None
+        self._version = None
+        self._built_at = 0
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def _needs_rebuild(self):
+        now = time.monotonic()
+        if self.max_age_setting:
+            max_age = getattr(settings, self.max_age_setting, None)
+            if max_age is not None and now - self._built_at > max_age:
+                return True
+
+        if now - self._checked_at < getattr(settings, 'CATALOG_VERSION_CHECK_SECONDS', 5):
+            return False
+        self._checked_at = now
+        version = get_catalog_version()
+        return version is not None and version != self._version
+
+    def get(self):
+        value = self._value
+        if value is not None and not self._needs_rebuild():
+            return value
+
+        if not self._lock.acquire(blocking=value is None):
+            return value
+        try:
+            # Skip the build if another thread replaced the value while we waited
+            if self._value is None or self._value is value:
+                version = get_catalog_version()
+                self._value = self.builder(self._value) if self.incremental else self.builder()
+                self._version = version
+                self._built_at = self._checked_at = time.monotonic()
+            return self._value
+        finally:
+            self._lock.release()
+
+    def reset(self):
+        with self._lock:
+            self._value = None
+            self._version = None
@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from apps.actions.models import ActionDb, ActionTag
+from apps.catalog.tags import rebuild_tags
+from apps.catalog.version import bump_catalog_version
+from apps.education.models import EducationDb, EducationTag
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute derived catalog columns (sdg_mask, year_numeric, title_sort, search_text) '
+        'and the filter tag tables after edits outside the app'
+    )
+
+    def handle(self, *args, **options):
+        changed = 0
+        for model, tag_model in ((EducationDb, EducationTag), (ActionDb, ActionTag)):
+            changed += self.refresh(model)
+            tag_count = rebuild_tags(model, tag_model, model.TAG_FIELDS)
+            self.stdout.write(f'{tag_model._meta.db_table}: {tag_count} tag(s) rebuilt')
+
+        # The tag rebuild may have changed list filter results even when no column did
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f'Updated {changed} record(s)'))
+
+    def refresh(self, model):
+        """Group stale rows by their new values and update each group with one query"""
+        fields = list(model.DERIVED_FIELDS)
+        ids_by_values = defaultdict(list)
+        for record in model.objects.all().iterator():
+            current = tuple(getattr(record, field) for field in fields)
+            record.refresh_derived_fields()
+            values = tuple(getattr(record, field) for field in fields)
+            if values != current:
+                ids_by_values[values].append(record.id)
+
+        changed = 0
+        for values, ids in ids_by_values.items():
+            for start in range(0, len(ids), 1000):
+                changed += model.objects.filter(id__in=ids[start:start + 1000]).update(**dict(zip(fields, values)))
+
+        self.stdout.write(f'{model._meta.db_table}: {changed} record(s) updated')
+        return changed
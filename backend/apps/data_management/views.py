@@ -8,12 +8,20 @@ from django.db.models import Q
 from django.core.paginator import Paginator
 from django.db import connection
 import pandas as pd
+import logging
 import re
 import traceback
 
 # Import your existing models
-from ..education.models import EducationDb
-from ..actions.models import ActionDb
+from ..education.models import EducationDb, EducationTag, title_sort_key, year_number
+from ..actions.models import ActionDb, ActionTag
+from ..catalog.sdg import sdg_mask
+from ..catalog.tags import delete_tags, sync_tags
+from ..catalog.text import search_text
+from ..catalog.version import bump_catalog_version
+from ..keywords.tagger import get_keyword_tagger
+
+logger = logging.getLogger(__name__)
 
 # Permission check for admin users
 def is_admin_user(user):
@@ -103,6 +111,11 @@ def education_management_delete(request):
             cursor.execute(f"DELETE FROM education_db WHERE id IN ({ids_str})")
             deleted_count = cursor.rowcount
         
+        delete_tags(EducationTag, record_ids)
+        
+        if deleted_count:
+            bump_catalog_version()
+        
         return Response({
             'message': f'Successfully deleted {deleted_count} record(s)',
             'deleted_count': deleted_count
@@ -181,6 +194,7 @@ def education_import_confirm(request):
         skipped_count = 0
         failed_count = 0
         failed_records = []
+        imported_ids = []
         
         with connection.cursor() as cursor:
             for i, record in enumerate(import_data):
@@ -221,6 +235,11 @@ def education_import_confirm(request):
                         record.get('useful_for_which_industries', ''),
                         record.get('source', ''),
                         record.get('link', ''),
+                        sdg_mask(record.get('sdgs_related', '')),
+                        year_number(record.get('year', '')),
+                        title_sort_key(record.get('title', '')),
+                        # The sheet's Description goes to `descriptions`; the Description column stays empty
+                        search_text(record.get('title', ''), None, record.get('aims', '')),
                     ]
                     
                     # Insert record
@@ -229,11 +248,12 @@ def education_import_confirm(request):
                             Title, descriptions, Aims, `Learning outcome( Expecting outcome)`, 
                             `SDGs related`, `Type label`, Location, Organization, Year, 
                             `Related to which discipline`, `Useful for which industries`, 
-                            Source, Link
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                            Source, Link, sdg_mask, year_numeric, title_sort, search_text
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """
 
                     cursor.execute(insert_sql, insert_data)
+                    imported_ids.append(cursor.lastrowid)
                     imported_count += 1
                     
                 except Exception as e:
@@ -262,6 +282,12 @@ def education_import_confirm(request):
                     })
                     continue
         
+        # The raw INSERTs bypass save(), so tag the new records here
+        sync_tags(EducationTag, EducationDb.objects.filter(id__in=imported_ids), EducationDb.TAG_FIELDS)
+        
+        if imported_count:
+            bump_catalog_version()
+        
         return Response({
             'message': f'Import completed successfully',
             'imported_count': imported_count,
@@ -359,6 +385,11 @@ def actions_management_delete(request):
             cursor.execute(f"DELETE FROM action_db WHERE id IN ({ids_str})")
             deleted_count = cursor.rowcount
         
+        delete_tags(ActionTag, record_ids)
+        
+        if deleted_count:
+            bump_catalog_version()
+        
         return Response({
             'message': f'Successfully deleted {deleted_count} record(s)',
             'deleted_count': deleted_count
@@ -437,6 +468,7 @@ def actions_import_confirm(request):
         skipped_count = 0
         failed_count = 0
         failed_records = []
+        imported_ids = []
         
         with connection.cursor() as cursor:
             for i, record in enumerate(import_data):
@@ -477,6 +509,10 @@ def actions_import_confirm(request):
                         record.get('award', None),
                         record.get('source_links', ''),
                         record.get('additional_notes', ''),
+                        sdg_mask(record.get('field_sdgs', '')),
+                        search_text(
+                            record.get('actions', ''), record.get('action_detail', ''), record.get('additional_notes', '')
+                        ),
                     ]
                     
                     # Insert record
@@ -485,11 +521,12 @@ def actions_import_confirm(request):
                             Actions, `Action detail`, ` SDGs`, Level, `Individual/Organization`,
                             `Location (specific actions/org onlyonly)`, `Related Industry (org only)`,
                             `Digital actions`, `Source descriptions`, `Award descriptions`, Award,
-                            `Source Links`, `Additional Notes`
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                            `Source Links`, `Additional Notes`, sdg_mask, search_text
+                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """
                     
                     cursor.execute(insert_sql, insert_data)
+                    imported_ids.append(cursor.lastrowid)
                     imported_count += 1
                     
                 except Exception as e:
@@ -521,6 +558,12 @@ def actions_import_confirm(request):
                     })
                     continue
         
+        # The raw INSERTs bypass save(), so tag the new records here
+        sync_tags(ActionTag, ActionDb.objects.filter(id__in=imported_ids), ActionDb.TAG_FIELDS)
+        
+        if imported_count:
+            bump_catalog_version()
+        
         return Response({
             'message': f'Import completed successfully',
             'imported_count': imported_count,
@@ -625,6 +668,17 @@ def map_actions_columns(excel_columns):
     
     return mapping
 
+def suggest_sdgs(records, text_fields):
+    """Add the SDGs and targets the keyword tagger finds in each record's text fields as _suggested_* keys"""
+    try:
+        # The separator keeps keywords from matching across fields
+        texts = [' | '.join(record.get(field, '') for field in text_fields) for record in records]
+        for record, tags in zip(records, get_keyword_tagger().tag_many(texts)):
+            record['_suggested_sdgs'] = tags['sdgs']
+            record['_suggested_targets'] = tags['targets']
+    except Exception as e:
+        logger.warning(f"SDG suggestions unavailable: {e}")
+
 def validate_education_data(df, column_mapping):
     """Validate education data from Excel"""
     valid_records = []
@@ -658,6 +712,9 @@ def validate_education_data(df, column_mapping):
             record['_row_index'] = index + 2
             valid_records.append(record)
     
+    # Suggest SDGs from the curated keywords for the admin to review
+    suggest_sdgs(valid_records, ['title', 'descriptions', 'aims', 'learning_outcome_expecting_outcome_field'])
+    
     return {
         'valid_records': valid_records,
         'invalid_records': invalid_records,
@@ -698,6 +755,9 @@ def validate_actions_data(df, column_mapping):
             record['_row_index'] = index + 2
             valid_records.append(record)
     
+    # Suggest SDGs from the curated keywords for the admin to review
+    suggest_sdgs(valid_records, ['actions', 'action_detail'])
+    
     return {
         'valid_records': valid_records,
         'invalid_records': invalid_records,
@@ -4,3 +4,7 @@ class EducationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.education'
     verbose_name = "SDG Education"
+
+    def ready(self):
+        # Drop the tag rows of records deleted through the ORM
+        from . import signals  # noqa: F401
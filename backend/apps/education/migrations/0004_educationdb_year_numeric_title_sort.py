@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-17 12:00
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copies of apps.education.models.year_number / title_sort_key, so the
+# backfill does not change with the live helpers
+TITLE_SORT_LENGTH = 191
+
+
+def year_number(year):
+    if not year:
+        return 0
+    if year.isdigit():
+        return int(year)
+    match = re.match(r'\d+', year[:4])
+    return int(match.group()) if match else 0
+
+
+def title_sort_key(title):
+    cleaned = ' '.join(re.sub(r'^\W+', '', title or '').split()).lower()
+    return cleaned[:TITLE_SORT_LENGTH]
+
+
+def backfill_sort_columns(apps, schema_editor):
+    EducationDb = apps.get_model('education', 'EducationDb')
+    batch = []
+    for record in EducationDb.objects.only('id', 'year', 'title').iterator():
+        record.year_numeric = year_number(record.year)
+        record.title_sort = title_sort_key(record.title)
+        batch.append(record)
+        if len(batch) >= 1000:
+            EducationDb.objects.bulk_update(batch, ['year_numeric', 'title_sort'])
+            batch = []
+    if batch:
+        EducationDb.objects.bulk_update(batch, ['year_numeric', 'title_sort'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0003_educationdb_sdg_mask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='educationdb',
+            name='year_numeric',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='educationdb',
+            name='title_sort',
+            field=models.CharField(default='', editable=False, max_length=191),
+        ),
+        migrations.RunPython(backfill_sort_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='educationdb',
+            index=models.Index(fields=['-year_numeric', 'title_sort', 'id'], name='education_year_title_idx'),
+        ),
+    ]
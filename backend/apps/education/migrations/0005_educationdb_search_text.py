@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:00
+
+from django.db import migrations, models
+
+# Frozen copies of apps.catalog.text.search_text and the FULLTEXT index DDL,
+# so the backfill and the index do not change with the live helpers
+QUOTE_TABLE = str.maketrans({quote: "'" for quote in "’‘´`"})
+
+
+def search_text(*fields):
+    return '\n'.join(' '.join((field or '').translate(QUOTE_TABLE).lower().split()) for field in fields)
+
+
+def backfill_search_text(apps, schema_editor):
+    EducationDb = apps.get_model('education', 'EducationDb')
+    batch = []
+    for record in EducationDb.objects.only('id', 'title', 'description', 'aims').iterator():
+        record.search_text = search_text(record.title, record.description, record.aims)
+        batch.append(record)
+        if len(batch) >= 1000:
+            EducationDb.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        EducationDb.objects.bulk_update(batch, ['search_text'])
+
+
+def add_fulltext_index(apps, schema_editor):
+    # ngram FULLTEXT index used by apps.catalog.text.filter_search_text; stopwords would drop ngrams
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute('SET SESSION innodb_ft_enable_stopword = OFF')
+    schema_editor.execute(
+        'ALTER TABLE education_db ADD FULLTEXT INDEX education_db_search_text_ft (search_text) WITH PARSER ngram'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0004_educationdb_year_numeric_title_sort'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='educationdb',
+            name='search_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(add_fulltext_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.6 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+# Frozen copies of the apps.catalog.tags helpers and EducationDb.TAG_FIELDS,
+# so the backfill does not change with the live tag configuration
+TAG_LENGTH = 191
+
+
+def normalize_tag(value):
+    return ' '.join(str(value).lower().split())[:TAG_LENGTH]
+
+
+def split_commas(text):
+    return str(text).split(',')
+
+
+TAG_FIELDS = {
+    'discipline': ('related_to_which_discipline', split_commas),
+    'industry': ('useful_for_which_industries', split_commas),
+}
+
+
+def record_tags(record):
+    tags = set()
+    for kind, (column, split) in TAG_FIELDS.items():
+        text = getattr(record, column)
+        if text is None:
+            continue
+        for value in split(text):
+            value = normalize_tag(value)
+            if value:
+                tags.add((kind, value))
+    return tags
+
+
+def backfill_tags(apps, schema_editor):
+    EducationDb = apps.get_model('education', 'EducationDb')
+    EducationTag = apps.get_model('education', 'EducationTag')
+    columns = ['id'] + [column for column, _ in TAG_FIELDS.values()]
+    batch = []
+    for record in EducationDb.objects.only(*columns).iterator():
+        batch.extend(
+            EducationTag(record_id=record.id, kind=kind, value=value)
+            for kind, value in sorted(record_tags(record))
+        )
+        if len(batch) >= 1000:
+            EducationTag.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        EducationTag.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0005_educationdb_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EducationTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('record_id', models.IntegerField()),
+                ('kind', models.CharField(max_length=16)),
+                ('value', models.CharField(max_length=191)),
+            ],
+            options={
+                'db_table': 'education_tags',
+                'indexes': [models.Index(fields=['kind', 'value', 'record_id'], name='education_tags_lookup_idx')],
+                'unique_together': {('record_id', 'kind', 'value')},
+            },
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,33 @@
-from django.db import models
 import re
+
+from django.db import models
 from django.contrib.auth.models import User
 
+from apps.catalog.sdg import parse_sdgs, sdg_mask
+from apps.catalog.tags import TAG_LENGTH, split_commas, sync_tags
+from apps.catalog.text import search_text
+
+TITLE_SORT_LENGTH = 191  # longest utf8mb4 column MySQL can index in full
+
+
+def year_number(year):
+    """
+    Numeric year for sorting: the whole value if it is all digits, else the
+    leading digits of its first four characters, else 0 ("2019-2020" -> 2019)
+    """
+    if not year:
+        return 0
+    if year.isdigit():
+        return int(year)
+    match = re.match(r'\d+', year[:4])
+    return int(match.group()) if match else 0
+
+
+def title_sort_key(title):
+    """Case-folded title without leading punctuation or repeated whitespace, for sorting"""
+    cleaned = ' '.join(re.sub(r'^\W+', '', title or '').split()).lower()
+    return cleaned[:TITLE_SORT_LENGTH]
+
 class EducationDb(models.Model):
     """
     Education database model - Based on actual database structure
@@ -24,37 +50,63 @@ class EducationDb(models.Model):
     column14 = models.IntegerField(db_column='Column14', blank=True, null=True)
     column15 = models.CharField(db_column='Column15', max_length=50, blank=True, null=True)
     column16 = models.CharField(db_column='Column16', max_length=50, blank=True, null=True)
+    # Derived from the SDG text on save: bit N-1 set for SDG N
+    sdg_mask = models.IntegerField(default=0, editable=False)
+    # Derived from Year and Title on save, for the list ordering
+    year_numeric = models.IntegerField(default=0, editable=False)
+    title_sort = models.CharField(max_length=TITLE_SORT_LENGTH, default='', editable=False)
+    # Derived from Title, Description and Aims on save, for the list search (apps.catalog.text)
+    search_text = models.TextField(default='', editable=False)
+    
+    # Source columns of each derived column
+    DERIVED_FIELDS = {
+        'sdg_mask': ('sdgs_related',),
+        'year_numeric': ('year',),
+        'title_sort': ('title',),
+        'search_text': ('title', 'description', 'aims'),
+    }
+    # Tag kind -> (source column, splitter) of the education_tags rows (apps.catalog.tags)
+    TAG_FIELDS = {
+        'discipline': ('related_to_which_discipline', split_commas),
+        'industry': ('useful_for_which_industries', split_commas),
+    }
     
     class Meta: 
         db_table = 'education_db'
         verbose_name = 'Education Resource'
         verbose_name_plural = 'Education Resources'
         ordering = ['-id']
+        indexes = [
+            # EducationListView ordering, also used for keyset pagination
+            models.Index(fields=['-year_numeric', 'title_sort', 'id'], name='education_year_title_idx'),
+        ]
     
     def __str__(self):
         return self.title or f"Education Resource {self.id}"
+
+    def save(self, *args, **kwargs):
+        self.refresh_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                derived for derived, sources in self.DERIVED_FIELDS.items() if set(sources) & set(update_fields)
+            }
+        super().save(*args, **kwargs)
+        if update_fields is None or {column for column, _ in self.TAG_FIELDS.values()} & set(update_fields):
+            sync_tags(EducationTag, [self], self.TAG_FIELDS)
+
+    def refresh_derived_fields(self):
+        """Recompute columns derived from the SDG text, year, title and searchable text"""
+        self.sdg_mask = sdg_mask(self.sdgs_related)
+        self.year_numeric = year_number(self.year)
+        self.title_sort = title_sort_key(self.title)
+        self.search_text = search_text(self.title, self.description, self.aims)
     
     @property
     def sdgs_list(self):
         """Parse the SDG string and return the list of SDG numbers"""
-        if not self.sdgs_related:
-            return []
-        
-
-        sdg_list = []
-        item_sdg_string = str(self.sdgs_related)
-        item_sdg_parts = re.split(r"\'| |\]|\[|,|\.|\;", item_sdg_string)
-        
-        for part in item_sdg_parts:
-            if part.strip() and part.strip().isdigit():
-                sdg_num = int(part.strip())
-                if 1 <= sdg_num <= 17:
-                    sdg_list.append(sdg_num)
-                elif sdg_num == 18:  
-                    return list(range(1, 18))  
-        
-        return sorted(list(set(sdg_list))) 
-    
+        return parse_sdgs(self.sdgs_related)
+
     @property
     def type_list(self):
         """Parse the list of type tags"""
@@ -86,6 +138,22 @@ class EducationDb(models.Model):
     def get_absolute_url(self):
         return f"/education/{self.id}/"
 
+class EducationTag(models.Model):
+    """
+    One normalized tag of an education record, derived from EducationDb.TAG_FIELDS.
+    Keyed by record id without a foreign key, since records are also deleted with raw SQL.
+    """
+    record_id = models.IntegerField()
+    kind = models.CharField(max_length=16)
+    value = models.CharField(max_length=TAG_LENGTH)
+
+    class Meta:
+        db_table = 'education_tags'
+        unique_together = ('record_id', 'kind', 'value')
+        indexes = [
+            models.Index(fields=['kind', 'value', 'record_id'], name='education_tags_lookup_idx'),
+        ]
+
 class LikedEducation(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     education_id = models.IntegerField()  
@@ -1,4 +1,7 @@
 from rest_framework import serializers
+from apps.catalog.likes import LikedField
+from apps.catalog.rows import ListRows, split_list
+from apps.catalog.sdg import cached_sdgs
 from .models import EducationDb
 from .models import LikedEducation
 
@@ -11,6 +14,7 @@ class EducationDbSerializer(serializers.ModelSerializer):
     discipline_list = serializers.ReadOnlyField()
     industry_list = serializers.ReadOnlyField()
     year_int = serializers.ReadOnlyField()
+    is_liked = LikedField(LikedEducation, 'education_id')
     
     class Meta:
         model = EducationDb
@@ -22,7 +26,7 @@ class EducationDbSerializer(serializers.ModelSerializer):
             'location', 'organization', 'year', 'year_int',
             'related_to_which_discipline', 'discipline_list',
             'useful_for_which_industries', 'industry_list',
-            'source', 'link'
+            'source', 'link', 'is_liked'
         ]
 
 class EducationDbListSerializer(serializers.ModelSerializer):
@@ -41,6 +45,22 @@ class EducationDbListSerializer(serializers.ModelSerializer):
             'organization', 'location', 'year', 'year_int'
         ]
 
+def year_int(year):
+    return int(year) if year and year.isdigit() else None
+
+# EducationDbListSerializer's output built directly from values() rows (apps.catalog.rows)
+EDUCATION_LIST_ROWS = ListRows({
+    'id': (('id',), lambda row: row['id']),
+    'title': (('title',), lambda row: row['title']),
+    'description': (('description',), lambda row: row['description']),
+    'sdgs_list': (('sdgs_related',), lambda row: list(cached_sdgs(row['sdgs_related']))),
+    'type_list': (('type_label',), lambda row: list(split_list(row['type_label']))),
+    'organization': (('organization',), lambda row: row['organization']),
+    'location': (('location',), lambda row: row['location']),
+    'year': (('year',), lambda row: row['year']),
+    'year_int': (('year',), lambda row: year_int(row['year'])),
+}, text_fields=('title', 'description'))
+
 class EducationSearchSerializer(serializers.Serializer):
     """
     Search parameter serializer
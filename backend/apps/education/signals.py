@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.catalog.tags import delete_tags
+
+from .models import EducationDb, EducationTag
+
+
+@receiver(post_delete, sender=EducationDb)
+def education_deleted(sender, instance, **kwargs):
+    # education_tags has no foreign key to cascade; the raw SQL delete path cleans up itself
+    delete_tags(EducationTag, [instance.pk])
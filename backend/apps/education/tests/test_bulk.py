@@ -0,0 +1,24 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.education.models import EducationDb
+
+
+class EducationBulkTestCase(TestCase):
+    def test_returns_requested_order_and_missing_ids(self):
+        first = EducationDb.objects.create(title='First')
+        second = EducationDb.objects.create(title='Second')
+
+        with self.assertNumQueries(1):
+            response = APIClient().get('/api/education/bulk/', {'ids': f'{second.id},999,{first.id},{second.id}'})
+        body = response.json()
+        self.assertEqual([item['title'] for item in body['results']], ['Second', 'First'])
+        self.assertEqual(body['missing'], [999])
+        self.assertIn('is_liked', body['results'][0])
+
+    @override_settings(CATALOG_BULK_MAX_IDS=2)
+    def test_rejects_bad_or_oversized_id_lists(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/education/bulk/').status_code, 400)
+        self.assertEqual(client.get('/api/education/bulk/', {'ids': '1,x'}).status_code, 400)
+        self.assertEqual(client.get('/api/education/bulk/', {'ids': '1,2,3'}).status_code, 400)
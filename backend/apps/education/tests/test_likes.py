@@ -3,7 +3,7 @@
 from django.test import TestCase
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
-from apps.education.models import LikedEducation
+from apps.education.models import EducationDb, LikedEducation
 
 class LikeEducationTestCase(TestCase):
     def setUp(self):
@@ -31,4 +31,12 @@ class LikeEducationTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         liked_ids = response.json().get('liked_ids', [])
         self.assertIn(123, liked_ids)
-        self.assertIn(456, liked_ids)
\ No newline at end of file
+        self.assertIn(456, liked_ids)
+    def test_detail_reports_is_liked(self):
+        liked = EducationDb.objects.create(title='Liked course')
+        other = EducationDb.objects.create(title='Other course')
+        LikedEducation.objects.create(user=self.user, education_id=liked.id)
+
+        self.assertTrue(self.client.get(f'/api/education/{liked.id}/').json()['is_liked'])
+        self.assertFalse(self.client.get(f'/api/education/{other.id}/').json()['is_liked'])
+        self.assertFalse(APIClient().get(f'/api/education/{liked.id}/').json()['is_liked'])
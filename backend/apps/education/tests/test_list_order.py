@@ -0,0 +1,52 @@
+# apps/education/tests/test_list_order.py
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.education.models import EducationDb, title_sort_key, year_number
+
+class DerivedSortColumnsTestCase(TestCase):
+    def test_year_number_matches_the_old_sql_expression(self):
+        self.assertEqual(year_number('2021'), 2021)
+        self.assertEqual(year_number('2019-2020'), 2019)
+        self.assertEqual(year_number('20s'), 20)
+        self.assertEqual(year_number('n/a'), 0)
+        self.assertEqual(year_number(None), 0)
+
+    def test_columns_are_maintained_on_save(self):
+        record = EducationDb.objects.create(title='  "Ocean  Literacy"', year='2018/19')
+        self.assertEqual((record.year_numeric, record.title_sort), (2018, 'ocean literacy"'))
+        record.year = '2022'
+        record.save(update_fields=['year'])
+        record.refresh_from_db()
+        self.assertEqual(record.year_numeric, 2022)
+        self.assertEqual(title_sort_key(None), '')
+
+class EducationListOrderTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for title, year in [('beta', '2020'), ('Alpha', '2020'), ('Gamma', '2023'), ('Delta', ''), ('alpha', '2020')]:
+            EducationDb.objects.create(title=title, year=year)
+
+    def titles(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.json()['results']]
+
+    def test_newest_year_first_then_title(self):
+        response = self.client.get('/api/education/')
+        self.assertEqual(self.titles(response), ['Gamma', 'Alpha', 'alpha', 'beta', 'Delta'])
+
+    def test_keyset_pages_follow_the_same_order(self):
+        titles = []
+        params = {'cursor': '', 'page_size': 2}
+        while True:
+            response = self.client.get('/api/education/', params)
+            titles += self.titles(response)
+            if not response.json()['next_cursor']:
+                break
+            params['cursor'] = response.json()['next_cursor']
+        self.assertEqual(titles, ['Gamma', 'Alpha', 'alpha', 'beta', 'Delta'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/education/', {'cursor': 'nope'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Invalid cursor'})
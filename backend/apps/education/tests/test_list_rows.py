@@ -0,0 +1,39 @@
+from django.test import TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.catalog.rows import FastJSONRenderer
+from apps.education.models import EducationDb
+from apps.education.serializers import EducationDbListSerializer
+
+
+class EducationListRowsTestCase(TestCase):
+    def test_list_payload_matches_list_serializer(self):
+        EducationDb.objects.create(
+            title='Café "quoted"', description='tab\there', sdgs_related='18', type_label='Course, , Video',
+            organization='UNSW', location=None, year='2019-2020',
+        )
+        EducationDb.objects.create(title='Plain', sdgs_related='[3, 4]', year='2021')
+
+        response = APIClient().get('/api/education/', {'page_size': 10})
+        records = EducationDb.objects.order_by('-year_numeric', 'title_sort', 'id')
+        expected = JSONRenderer().render(EducationDbListSerializer(records, many=True).data)
+        self.assertEqual(response.content, b'{"count":2,"next":null,"previous":null,"results":' + expected + b'}')
+
+    def test_renderer_output_matches_json_renderer(self):
+        for data in ({'text': 'line\u2028separator\u2029 \x01 中'}, {'error': gettext_lazy('Not found')}):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_sparse_fields_and_truncation(self):
+        record = EducationDb.objects.create(title='Water', description='Clean water for everyone', year='2020')
+
+        response = APIClient().get('/api/education/', {'fields': 'title,description', 'truncate': '11'})
+        self.assertEqual(response.json()['results'], [
+            {'id': record.id, 'title': 'Water', 'description': 'Clean water…'},
+        ])
+
+        response = APIClient().get('/api/education/', {'fields': 'title,secret'})
+        self.assertEqual(response.status_code, 400)
+        response = APIClient().get('/api/education/', {'truncate': '0'})
+        self.assertEqual(response.status_code, 400)
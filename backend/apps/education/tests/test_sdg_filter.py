@@ -0,0 +1,66 @@
+# apps/education/tests/test_sdg_filter.py
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.catalog.sdg import ALL_SDGS_MASK, parse_sdgs, sdg_mask
+from apps.education.models import EducationDb
+
+class SdgMaskTestCase(TestCase):
+    def test_parse_matches_sdgs_list_rules(self):
+        self.assertEqual(parse_sdgs('4, 1,4'), [1, 4])
+        self.assertEqual(parse_sdgs('[13]; 2.'), [2, 13])
+        self.assertEqual(parse_sdgs('3, 18'), list(range(1, 18)))
+        self.assertEqual(sdg_mask('1, 3'), 0b101)
+        self.assertEqual(sdg_mask('18'), ALL_SDGS_MASK)
+        self.assertEqual(sdg_mask(None), 0)
+
+    def test_mask_is_maintained_on_save(self):
+        record = EducationDb.objects.create(title='Course', sdgs_related='2, 5')
+        self.assertEqual(record.sdg_mask, 0b10010)
+        record.sdgs_related = '1'
+        record.save(update_fields=['sdgs_related'])
+        record.refresh_from_db()
+        self.assertEqual(record.sdg_mask, 1)
+
+class SdgFilterTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.quality = EducationDb.objects.create(title='Quality', sdgs_related='4, 10')
+        self.climate = EducationDb.objects.create(title='Climate', sdgs_related='13')
+        self.everything = EducationDb.objects.create(title='Everything', sdgs_related='18')
+        self.untagged = EducationDb.objects.create(title='Untagged', sdgs_related='')
+
+    def list_ids(self, params):
+        response = self.client.get('/api/education/', params)
+        self.assertEqual(response.status_code, 200)
+        return {item['id'] for item in response.json()['results']}
+
+    def test_multiple_sdgs_require_all_by_default(self):
+        self.assertEqual(self.list_ids({'sdg': ['4', '10']}), {self.quality.id, self.everything.id})
+        self.assertEqual(self.list_ids({'sdg': ['4', '13']}), {self.everything.id})
+
+    def test_sdg_mode_any(self):
+        self.assertEqual(
+            self.list_ids({'sdg': ['4', '13'], 'sdg_mode': 'any'}),
+            {self.quality.id, self.climate.id, self.everything.id}
+        )
+
+    def test_single_digit_sdg_does_not_match_two_digit_sdg(self):
+        self.assertEqual(self.list_ids({'sdg': '1'}), {self.everything.id})
+
+    def test_by_sdg_endpoint(self):
+        response = self.client.get('/api/education/sdg/13/')
+        self.assertEqual(response.status_code, 200)
+        ids = {item['id'] for item in response.json()['results']}
+        self.assertEqual(ids, {self.climate.id, self.everything.id})
+
+    def test_stats_count_sdgs_from_the_mask(self):
+        cache.clear()
+        with self.assertNumQueries(2):
+            data = self.client.get('/api/education/stats/').json()
+        self.assertEqual(data['total_resources'], 4)
+        self.assertEqual(data['sdg_distribution']['sdg_4'], 2)
+        self.assertEqual(data['sdg_distribution']['sdg_13'], 2)
+        self.assertEqual(data['sdg_distribution']['sdg_1'], 1)
+        self.assertEqual(data['latest_resources'][0]['title'], 'Untagged')
@@ -0,0 +1,38 @@
+# apps/education/tests/test_search.py
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.catalog.text import search_text, search_words
+from apps.education.models import EducationDb
+
+class SearchTextTestCase(TestCase):
+    def test_normalization(self):
+        self.assertEqual(search_text('Children’s  RIGHTS', None, 'a`b'), "children's rights\n\na'b")
+        self.assertEqual(search_words("  Women‘s Health "), ["women's", 'health'])
+
+    def test_column_is_maintained_on_save(self):
+        record = EducationDb.objects.create(title='Ocean', aims='Clean seas')
+        record.description = 'Plastic’s impact'
+        record.save(update_fields=['description'])
+        record.refresh_from_db()
+        self.assertEqual(record.search_text, "ocean\nplastic's impact\nclean seas")
+
+class EducationSearchTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.rights = EducationDb.objects.create(title='Children’s rights', aims='Education')
+        self.health = EducationDb.objects.create(title='Health', description="Women's HEALTH programs")
+        self.split = EducationDb.objects.create(title='Water', aims='Quality')
+
+    def search(self, query):
+        response = self.client.get('/api/education/', {'search': query})
+        self.assertEqual(response.status_code, 200)
+        return {item['id'] for item in response.json()['results']}
+
+    def test_quote_variants_and_case_match(self):
+        self.assertEqual(self.search("children's"), {self.rights.id})
+        self.assertEqual(self.search('WOMEN´S health'), {self.health.id})
+
+    def test_every_word_must_match_somewhere(self):
+        self.assertEqual(self.search('water quality'), {self.split.id})
+        self.assertEqual(self.search('water education'), set())
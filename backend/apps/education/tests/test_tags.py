@@ -0,0 +1,41 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.education.models import EducationDb, EducationTag
+
+
+class EducationTagFilterTestCase(TestCase):
+    def ids(self, params):
+        response = APIClient().get('/api/education/', params)
+        return sorted(item['id'] for item in response.json()['results'])
+
+    def test_filters_use_normalized_tags(self):
+        course = EducationDb.objects.create(
+            title='Water', type_label='Course, Video', location='Sydney, Australia', organization='University of Sydney',
+            related_to_which_discipline='Engineering, Science', useful_for_which_industries='Mining',
+        )
+        EducationDb.objects.create(
+            title='Energy', type_label='Workshop', location='Perth', organization='UWA',
+            related_to_which_discipline='Business', useful_for_which_industries='Finance',
+        )
+
+        self.assertEqual(self.ids({'location': 'SYD'}), [course.id])
+        self.assertEqual(self.ids({'location': 'Australia'}), [course.id])
+        self.assertEqual(self.ids({'organization': 'sydney'}), [course.id])
+        self.assertEqual(self.ids({'organization': 'of syd'}), [course.id])
+        self.assertEqual(self.ids({'organization': 'perth'}), [])
+        self.assertEqual(self.ids({'discipline': 'science', 'industry': 'mining'}), [course.id])
+        self.assertEqual(self.ids({'discipline': 'science', 'industry': 'finance'}), [])
+
+    def test_tags_are_replaced_on_save(self):
+        record = EducationDb.objects.create(title='Water', useful_for_which_industries='Mining, Energy')
+        record.useful_for_which_industries = 'Energy'
+        record.save()
+
+        tags = list(EducationTag.objects.filter(record_id=record.id).values_list('kind', 'value'))
+        self.assertEqual(tags, [('industry', 'energy')])
+
+    def test_tags_are_removed_with_the_record(self):
+        record = EducationDb.objects.create(title='Water', useful_for_which_industries='Mining')
+        EducationDb.objects.filter(pk=record.pk).delete()
+        self.assertFalse(EducationTag.objects.filter(record_id=record.id).exists())
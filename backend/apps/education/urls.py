@@ -1,4 +1,6 @@
 from django.urls import path
+
+from apps.catalog.async_views import catalog_view
 from . import views
 from .views import LikeEducationView, ListLikedEducationView, LikedEducationDetailView
 
@@ -6,15 +8,16 @@ app_name = 'education'
 
 urlpatterns = [
     # Main API endpoints
-    path('', views.EducationListView.as_view(), name='education-list'),
-    path('<int:id>/', views.EducationDetailView.as_view(), name='education-detail'),
+    path('', catalog_view(views.EducationListView.as_view()), name='education-list'),
+    path('<int:id>/', catalog_view(views.EducationDetailView.as_view()), name='education-detail'),
+    path('bulk/', catalog_view(views.education_bulk), name='education-bulk'),
     
     # Statistics and filtering
-    path('stats/', views.education_stats, name='education-stats'),
-    path('filters/', views.education_filters, name='education-filters'),
+    path('stats/', catalog_view(views.education_stats), name='education-stats'),
+    path('filters/', catalog_view(views.education_filters), name='education-filters'),
     
     # Query by SDG
-    path('sdg/<int:sdg_number>/', views.education_by_sdg, name='education-by-sdg'),
+    path('sdg/<int:sdg_number>/', catalog_view(views.education_by_sdg), name='education-by-sdg'),
 
     path('like/', LikeEducationView.as_view(), name='like-education'),
     path('liked/', ListLikedEducationView.as_view(), name='liked-education-list'),
@@ -2,18 +2,25 @@ from rest_framework import generics, status, filters
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, Count, Case, When, Value, CharField, TextField
-from django.db.models.functions import Replace
+from django.db.models import Q, Count, Case, When, Value, CharField
 from django.http import JsonResponse
 import re
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from apps.catalog.bulk import bulk_response
+from apps.catalog.cursors import InvalidCursor, KeysetPagination
+from apps.catalog.rows import FastJSONRenderer, list_rows
+from apps.catalog.sdg import filter_by_sdgs, parse_sdg_params, sdg_count_aggregates
+from apps.catalog.tags import filter_by_tag
+from apps.catalog.text import filter_search_text
+from apps.catalog.version import cached_for_catalog_version
 from .models import LikedEducation
 from .serializers import LikedEducationSerializer
 from django.shortcuts import get_object_or_404
 
-from .models import EducationDb
+from .models import EducationDb, EducationTag
 from .serializers import (
+    EDUCATION_LIST_ROWS,
     EducationDbSerializer, 
     EducationDbListSerializer,
     EducationSearchSerializer
@@ -36,12 +43,18 @@ class EducationPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+class EducationKeysetPagination(KeysetPagination):
+    """Keyset pagination in the list order: newest year first, then title"""
+    ordering = ('-year_numeric', 'title_sort', 'id')
+    page_size = 20
+
 class EducationListView(generics.ListAPIView):
     """
     Education Resource List API - Function based on the master project
     """
     serializer_class = EducationDbListSerializer
     pagination_class = EducationPagination
+    renderer_classes = [FastJSONRenderer]
 
     def get_queryset(self):
         queryset = EducationDb.objects.all()
@@ -49,50 +62,15 @@ class EducationListView(generics.ListAPIView):
         # Basic Search - Titles and DescriptionsBasic Search - Titles and Descriptions
         search = self.request.query_params.get('search', None)
         if search:
-            # Part-of-speech search - The logic is the same as that of the master project
-            query = Q()
-            for keyword in search.strip().lower().split():
-                word_query = Q()
-                
-                variants = [keyword]
-                
-                if any(quote in keyword for quote in ["'", "’", "‘", "´", "`"]):
-                    base_word = keyword
-                    for old_quote in ["'", "’", "‘", "´", "`"]:
-                        for new_quote in ["'", "’", "‘", "´", "`"]:
-                            variants.append(base_word.replace(old_quote, new_quote))
-                
-                variants = list(set(variants))
-                
-                for variant in variants:
-                    word_query |= (
-                        Q(title__icontains=variant) |
-                        Q(description__icontains=variant) |
-                        Q(aims__icontains=variant)
-                    )
-                
-                query &= word_query
-            queryset = queryset.filter(query)
+            # Every word must appear in the normalized text (quote variants unified, case-folded)
+            queryset = filter_search_text(queryset, search)
         
-        # SDG filtering - Complex logic based on the master project
-        sdg = self.request.query_params.getlist('sdg')
+        # SDG filtering on the derived sdg_mask column
+        sdg = parse_sdg_params(self.request.query_params.getlist('sdg'))
         if sdg:
-            for sdg_num in sdg:
-                if sdg_num.isdigit():
-                    queryset = queryset.annotate(
-                        sdgs_no_space=Replace(
-                            'sdgs_related', 
-                            Value(' '), 
-                            Value(''), 
-                            output_field=TextField()
-                        )
-                    ).filter(
-                        Q(sdgs_no_space__exact=sdg_num) |
-                        Q(sdgs_no_space__startswith=f'{sdg_num},') |
-                        Q(sdgs_no_space__contains=f',{sdg_num},') |
-                        Q(sdgs_no_space__endswith=f',{sdg_num}') |
-                        Q(sdgs_no_space__contains='18')
-                    )
+            # Every requested SDG by default, any of them with sdg_mode=any
+            sdg_mode = self.request.query_params.get('sdg_mode', 'all')
+            queryset = filter_by_sdgs(queryset, sdg, mode=sdg_mode)
         
         # Year filtering
         year = self.request.query_params.getlist('year')
@@ -109,31 +87,32 @@ class EducationListView(generics.ListAPIView):
         if organization:
             queryset = queryset.filter(organization__icontains=organization)
         
-        # Discipline filtering
-        discipline = self.request.query_params.get('discipline', None)
-        if discipline:
-            queryset = queryset.filter(related_to_which_discipline__icontains=discipline)
-        
-        # Industry filtering
-        industry = self.request.query_params.get('industry', None)
-        if industry:
-            queryset = queryset.filter(useful_for_which_industries__icontains=industry)
+        # Discipline and industry filtering on the normalized education_tags rows
+        for kind in ('discipline', 'industry'):
+            value = self.request.query_params.get(kind, None)
+            if value:
+                queryset = filter_by_tag(queryset, EducationTag, kind, value)
         
-        queryset = queryset.extra(
-            select={
-                'year_numeric': """
-                    CASE 
-                        WHEN Year IS NOT NULL AND Year != '' AND Year REGEXP '^[0-9]+$' 
-                        THEN CAST(Year AS UNSIGNED)
-                        WHEN Year IS NOT NULL AND Year != '' 
-                        THEN CAST(SUBSTRING(Year, 1, 4) AS UNSIGNED)
-                        ELSE 0 
-                    END
-                """
-            }
-        ).order_by('-year_numeric', 'title').distinct()
-        
-        return queryset.distinct()
+        # Derived year_numeric/title_sort columns, covered by education_year_title_idx
+        return queryset.order_by(*EducationKeysetPagination.ordering)
+
+    @property
+    def paginator(self):
+        """Keyset pagination when the request has a `cursor` parameter (empty for the first page)"""
+        if 'cursor' in self.request.query_params:
+            if not isinstance(getattr(self, '_paginator', None), EducationKeysetPagination):
+                self._paginator = EducationKeysetPagination()
+            return self._paginator
+        return super().paginator
+
+    def list(self, request, *args, **kwargs):
+        # values() rows instead of EducationDbListSerializer, same payload; the sort columns feed the keyset cursor
+        try:
+            return list_rows(
+                request, self.get_queryset(), EDUCATION_LIST_ROWS, view=self, extra_columns=('year_numeric', 'title_sort')
+            )
+        except InvalidCursor:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
 
 class EducationDetailView(generics.RetrieveAPIView):
     """Education Resource Details APIEducation Resource Details API"""
@@ -141,45 +120,32 @@ class EducationDetailView(generics.RetrieveAPIView):
     serializer_class = EducationDbSerializer
     lookup_field = 'id'
 
+@api_view(['GET'])
+def education_bulk(request):
+    """Several education resources by ID (?ids=3,1,2) in one query, in the requested order"""
+    return bulk_response(request, EducationDb.objects.all(), EducationDbSerializer)
+
 @api_view(['GET'])
 def education_stats(request):
     """
     Education Statistical Information API - Statistical logic based on the master project
     """
-    # Obtain the current filtered dataset
-    queryset = EducationDb.objects.all()
-    total_resources = queryset.count()
-    
-    # SDG Distribution Statistics - Using the Logic of the Master Project
-    sdg_count = [0] * 18 
-    
-    for item in queryset:
-        if item.sdgs_related:
-            item_sdg_string = str(item.sdgs_related)
-            item_sdg_list = re.split(r"\'| |\]|\[|,|\.|\;", item_sdg_string)
-            
-            for e in item_sdg_list:
-                if e.strip() and e.strip().isdigit():
-                    e_int = int(e.strip())
-                    if 1 <= e_int <= 17:
-                        sdg_count[e_int] += 1
-                    elif e_int == 18:  
-                        for i in range(1, 18):
-                            sdg_count[i] += 1
-    
-    # Build an SDG distribution dictionary
-    sdg_distribution = {f'sdg_{i}': sdg_count[i] for i in range(1, 18)}
+    return Response(cached_for_catalog_version('education:stats', compute_education_stats))
+
+def compute_education_stats():
+    """Total and SDG distribution in one aggregate query over the SDG bitmask"""
+    counts = EducationDb.objects.aggregate(total_resources=Count('pk'), **sdg_count_aggregates())
     
     # Latest resources
-    latest_resources = queryset.order_by('-id')[:5]
+    latest_resources = EducationDb.objects.order_by('-id')[:5]
     latest_serializer = EducationDbListSerializer(latest_resources, many=True)
     
-    return Response({
-        'total_resources': total_resources,
-        'sdg_distribution': sdg_distribution,
-        'latest_resources': latest_serializer.data,
+    return {
+        'total_resources': counts['total_resources'],
+        'sdg_distribution': {f'sdg_{i}': counts[f'sdg_{i}'] for i in range(1, 18)},
+        'latest_resources': list(latest_serializer.data),
         'filter_options': get_filter_options()
-    })
+    }
 
 @api_view(['GET'])
 def education_filters(request):
@@ -232,21 +198,8 @@ def education_by_sdg(request, sdg_number):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Use the same filtering logic as that of the list view
-    queryset = EducationDb.objects.all()
-    
-    # Build SDG query
-    if sdg_number == 1:
-        sdg_query = Q(sdgs_related__startswith='1,') | Q(sdgs_related__exact='1')
-    elif sdg_number < 10:
-        sdg_query = Q(sdgs_related__contains=f',{sdg_number},') | Q(sdgs_related__endswith=f',{sdg_number}')
-    else:
-        sdg_query = Q(sdgs_related__contains=str(sdg_number))
-    
-    # Incorporating projects that support all of the SDGs
-    sdg_query |= Q(sdgs_related__contains='18')
-    
-    queryset = queryset.filter(sdg_query).order_by('title')
+    # Records tagged 18 (all SDGs) have every bit set and always match
+    queryset = filter_by_sdgs(EducationDb.objects.all(), [sdg_number]).order_by('title')
     
     paginator = EducationPagination()
     page = paginator.paginate_queryset(queryset, request)
@@ -286,9 +239,9 @@ class ListLikedEducationView(APIView):
     
 class LikedEducationDetailView(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [FastJSONRenderer]
 
     def get(self, request):
         liked_ids = LikedEducation.objects.filter(user=request.user).values_list('education_id', flat=True)
         resources = EducationDb.objects.filter(id__in=liked_ids)
-        serializer = EducationDbListSerializer(resources, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return list_rows(request, resources, EDUCATION_LIST_ROWS)
\ No newline at end of file
@@ -10,6 +10,7 @@ from django.contrib.auth.models import User
 from apps.team.models import Team, TeamMembership
 from apps.actions.models import ActionDb
 from apps.education.models import EducationDb
+from apps.catalog.version import bump_catalog_version
 from apps.notifications.models import Notification
 from datetime import timedelta
 from django.db import transaction
@@ -1738,6 +1739,8 @@ def approve_form_review(request, form_id):
             )
             record_id = education_record.id
         
+        bump_catalog_version()
+        
         # Update form status
         form.review_status = 'approved'
         form.reviewed_by = request.user
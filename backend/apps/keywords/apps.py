@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class KeywordsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.keywords'
+
+    def ready(self):
+        # Keep keyword_summary in sync with keyword_resources
+        from . import signals  # noqa: F401
@@ -0,0 +1,113 @@
+"""
+Prefix index behind keyword_autocomplete.
+
+Every word of every case-folded keyword is a sorted suffix entry
+("climate change" is found by "cli" and by "cha"), so a lookup is a bisect
+over the entries instead of an icontains scan of keyword_resources. Matches
+are ranked by target count plus past search popularity. The index is built
+once per worker and rebuilt when the catalog version changes, or after
+KEYWORD_AUTOCOMPLETE_REFRESH_SECONDS so popularity stays current.
+"""
+import bisect
+import heapq
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.analytics.models import UserBehavior
+from apps.catalog.version import CatalogBoundResource
+
+from .models import KeywordSummary
+
+logger = logging.getLogger(__name__)
+
+# One past search of a keyword weighs as much as this many SDG targets
+POPULARITY_WEIGHT = 2
+POPULARITY_WINDOW_DAYS = 90
+# Results for prefixes up to this length are memoized; they have the largest ranges
+MEMO_PREFIX_LENGTH = 3
+
+
+def word_starts(text):
+    return [i for i, char in enumerate(text) if char.isalnum() and (i == 0 or not text[i - 1].isalnum())]
+
+
+class KeywordPrefixIndex:
+    def __init__(self, keywords):
+        """`keywords` yields (keyword_key, display keyword, score) tuples"""
+        self.keys = []
+        self.labels = []
+        self.scores = []
+        entries = []
+        for position, (key, label, score) in enumerate(keywords):
+            self.keys.append(key)
+            self.labels.append(label)
+            self.scores.append(score)
+            for start in word_starts(key):
+                entries.append((key[start:], position, start == 0))
+        entries.sort()
+
+        self.suffixes = [entry[0] for entry in entries]
+        self.positions = [entry[1] for entry in entries]
+        self.whole = [entry[2] for entry in entries]
+        self._memo = {}
+
+    @classmethod
+    def build(cls):
+        started = time.monotonic()
+        searches = search_counts()
+        index = cls(
+            (key, label, target_count + POPULARITY_WEIGHT * searches.get(key, 0))
+            for key, label, target_count in KeywordSummary.objects.order_by('keyword_key').values_list(
+                'keyword_key', 'keyword', 'target_count'
+            ).iterator()
+        )
+        logger.info(f"Keyword prefix index built in {time.monotonic() - started:.2f}s ({len(index.keys)} keywords)")
+        return index
+
+    def suggest(self, prefix, limit=10):
+        """Keywords with a word starting with prefix; keywords starting with it come first, then by score"""
+        if len(prefix) <= MEMO_PREFIX_LENGTH and (prefix, limit) in self._memo:
+            return self._memo[(prefix, limit)]
+
+        start = bisect.bisect_left(self.suffixes, prefix)
+        end = bisect.bisect_left(self.suffixes, prefix + '\uffff')
+        matches = {}
+        for i in range(start, end):
+            position = self.positions[i]
+            matches[position] = matches.get(position, False) or self.whole[i]
+
+        ranked = heapq.nsmallest(
+            limit, matches.items(),
+            key=lambda match: (not match[1], -self.scores[match[0]], self.keys[match[0]]),
+        )
+        suggestions = [self.labels[position] for position, _ in ranked]
+        if len(prefix) <= MEMO_PREFIX_LENGTH:
+            self._memo[(prefix, limit)] = suggestions
+        return suggestions
+
+
+def search_counts():
+    """Recent searches per case-folded query, from the analytics search events"""
+    since = timezone.now() - timedelta(days=POPULARITY_WINDOW_DAYS)
+    counts = Counter()
+    details = UserBehavior.objects.filter(type='search', timestamp__gte=since).values_list('detail', flat=True)
+    for detail in details.iterator():
+        query = (detail or {}).get('query', '') if isinstance(detail, dict) else ''
+        if query.strip():
+            counts[query.strip().lower()] += 1
+    return counts
+
+
+_prefix_index = CatalogBoundResource(KeywordPrefixIndex.build, max_age_setting='KEYWORD_AUTOCOMPLETE_REFRESH_SECONDS')
+
+
+def get_keyword_prefix_index():
+    return _prefix_index.get()
+
+
+def reset_keyword_prefix_index():
+    _prefix_index.reset()
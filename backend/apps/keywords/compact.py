@@ -0,0 +1,57 @@
+"""
+Compact keyword responses.
+
+With `compact=true` the keyword endpoints send each SDG target and reference
+once, in an `included` map keyed by ID. Rows refer to them by ID instead of
+repeating the target description and the reference text, and the resources
+are read without their target_description column.
+"""
+from django.db.models import Q
+
+from .models import Reference, SdgTarget
+from .serializers import KeywordResourceSerializer, ReferenceSerializer
+
+# Resource columns a compact row needs
+COMPACT_FIELDS = ('id', 'keyword', 'sdg_number', 'target_code', 'reference1', 'reference2', 'note', 'created_at')
+
+
+def compact_requested(params):
+    return params.get('compact', '').lower() in ('1', 'true')
+
+
+def resource_references(resources):
+    return {
+        reference_id for resource in resources
+        for reference_id in (resource.reference1_id, resource.reference2_id) if reference_id is not None
+    }
+
+
+def build_included(pairs, reference_ids):
+    """
+    Look up (sdg_number, target_code) pairs and reference IDs with one query each.
+    Returns ({(sdg_number, target_code): target id}, included map).
+    """
+    pairs = set(pairs)
+    targets = []
+    if pairs:
+        query = Q()
+        for sdg_number, code in pairs:
+            query |= Q(sdg_number=sdg_number, code=code)
+        targets = list(SdgTarget.objects.filter(query))
+    references = Reference.objects.filter(id__in=reference_ids) if reference_ids else []
+
+    title = KeywordResourceSerializer().get_sdg_title
+    included = {
+        'targets': {
+            target.id: {
+                'id': target.id,
+                'sdg_number': target.sdg_number,
+                'target_code': target.code,
+                'target_description': target.description,
+                'sdg_title': title(target),
+            }
+            for target in targets
+        },
+        'references': {reference.id: ReferenceSerializer(reference).data for reference in references},
+    }
+    return {(target.sdg_number, target.code): target.id for target in targets}, included
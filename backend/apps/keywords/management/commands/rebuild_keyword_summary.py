@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.catalog.version import bump_catalog_version
+from apps.keywords.stats import refresh_keyword_stats
+from apps.keywords.summary import rebuild_keyword_summaries, rebuild_sdg_targets
+
+
+class Command(BaseCommand):
+    help = 'Rebuild keyword_summary and sdg_targets from keyword_resources, e.g. after a bulk load outside the app'
+
+    def handle(self, *args, **options):
+        count = rebuild_keyword_summaries()
+        target_count = rebuild_sdg_targets()
+        refresh_keyword_stats(bump_catalog_version())
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} keyword summaries and {target_count} SDG targets'))
@@ -0,0 +1,110 @@
+# Generated by Django 5.2.6 on 2026-10-17 10:00
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# Frozen copy of apps.keywords.summary.rebuild_keyword_summaries and its helpers,
+# so the backfill does not change with the live summary code
+SDG_COUNT = 17
+ALL_SDGS = 18
+
+
+def keyword_key(keyword):
+    return (keyword or '').strip().lower()
+
+
+def target_sort_key(target_str):
+    try:
+        if '.' in target_str:
+            major, minor = target_str.split('.')[:2]
+            return (int(major), int(minor) if minor.isdigit() else ord(minor.upper()) - ord('A') + 100)
+        return (int(target_str), 0)
+    except (ValueError, IndexError, TypeError):
+        return (999, 999)
+
+
+def sdgs_to_mask(sdg_numbers):
+    mask = 0
+    for sdg_num in sdg_numbers:
+        sdg_num = int(sdg_num)
+        if sdg_num == ALL_SDGS:
+            return (1 << SDG_COUNT) - 1
+        if 1 <= sdg_num <= SDG_COUNT:
+            mask |= 1 << (sdg_num - 1)
+    return mask
+
+
+def summarize(resources):
+    first = resources[0]
+    target_codes = {r['target_code'].strip() for r in resources if r['target_code'] and r['target_code'].strip()}
+    sdg_numbers = {r['sdg_number'] for r in resources if r['sdg_number'] is not None}
+    # reference1 is still a plain text column in this migration's state
+    reference_ids = {int(r['reference1']) for r in resources if str(r['reference1'] or '').strip().isdigit()}
+    return {
+        'keyword_key': keyword_key(first['keyword']),
+        'keyword': first['keyword'],
+        'first_resource_id': first['id'],
+        'target_codes': ', '.join(sorted(target_codes, key=target_sort_key)) or None,
+        'sdgs': ', '.join(str(sdg) for sdg in sorted(sdg_numbers)) or None,
+        'sdg_mask': sdgs_to_mask(sdg_numbers),
+        'reference_ids': ' | '.join(str(ref) for ref in sorted(reference_ids)) or None,
+        'target_count': len({(r['sdg_number'], r['target_code']) for r in resources}),
+    }
+
+
+def build_summaries(apps, schema_editor):
+    # keyword_resources is unmanaged and may not exist yet on a fresh database
+    if 'keyword_resources' not in schema_editor.connection.introspection.table_names():
+        return
+    KeywordResource = apps.get_model('keywords', 'KeywordResource')
+    KeywordSummary = apps.get_model('keywords', 'KeywordSummary')
+
+    groups = defaultdict(list)
+    rows = KeywordResource.objects.order_by('id').values('id', 'keyword', 'sdg_number', 'target_code', 'reference1')
+    for row in rows.iterator():
+        groups[keyword_key(row['keyword'])].append(row)
+    KeywordSummary.objects.all().delete()
+    KeywordSummary.objects.bulk_create(
+        [KeywordSummary(**summarize(resources)) for resources in groups.values()], batch_size=1000
+    )
+
+
+def add_fulltext_index(apps, schema_editor):
+    # unified_search ranks keywords with MATCH(keyword) AGAINST (...)
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(
+            'ALTER TABLE keyword_summary ADD FULLTEXT INDEX keyword_summary_keyword_ft (keyword)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keywords', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeywordSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword_key', models.CharField(max_length=200, unique=True)),
+                ('keyword', models.CharField(max_length=200)),
+                ('first_resource_id', models.BigIntegerField()),
+                ('target_codes', models.TextField(blank=True, null=True)),
+                ('sdgs', models.CharField(blank=True, max_length=100, null=True)),
+                ('sdg_mask', models.IntegerField(default=0)),
+                ('reference_ids', models.TextField(blank=True, null=True)),
+                ('target_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Keyword Summary',
+                'verbose_name_plural': 'Keyword Summaries',
+                'db_table': 'keyword_summary',
+                'ordering': ['keyword_key'],
+            },
+        ),
+        migrations.RunPython(add_fulltext_index, migrations.RunPython.noop),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
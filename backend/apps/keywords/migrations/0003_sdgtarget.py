@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+def build_targets(apps, schema_editor):
+    # keyword_resources is unmanaged and may not exist yet on a fresh database
+    if 'keyword_resources' not in schema_editor.connection.introspection.table_names():
+        return
+    KeywordResource = apps.get_model('keywords', 'KeywordResource')
+    SdgTarget = apps.get_model('keywords', 'SdgTarget')
+
+    # Frozen copy of apps.keywords.summary.rebuild_sdg_targets: each target's
+    # description is taken from its first resource by id
+    descriptions = {}
+    rows = KeywordResource.objects.order_by('id').values('sdg_number', 'target_code', 'target_description')
+    for row in rows.iterator():
+        descriptions.setdefault((row['sdg_number'], row['target_code']), row['target_description'] or '')
+    SdgTarget.objects.all().delete()
+    SdgTarget.objects.bulk_create(
+        [
+            SdgTarget(sdg_number=sdg_number, code=code, description=description)
+            for (sdg_number, code), description in descriptions.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('keywords', '0002_keywordsummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SdgTarget',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sdg_number', models.IntegerField()),
+                ('code', models.CharField(max_length=10)),
+                ('description', models.TextField()),
+            ],
+            options={
+                'verbose_name': 'SDG Target',
+                'verbose_name_plural': 'SDG Targets',
+                'db_table': 'sdg_targets',
+                'ordering': ['sdg_number', 'code'],
+                'unique_together': {('sdg_number', 'code')},
+            },
+        ),
+        migrations.RunPython(build_targets, migrations.RunPython.noop),
+    ]
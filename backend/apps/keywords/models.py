@@ -65,6 +65,48 @@ class KeywordResource(models.Model):
     def __str__(self):
         return f"{self.keyword} - SDG{self.sdg_number}.{self.target_code}"
 
+class KeywordSummary(models.Model):
+    """
+    One row per case-folded keyword, derived from keyword_resources.
+    Kept up to date by apps.keywords.summary; never edit directly.
+    """
+    keyword_key = models.CharField(max_length=200, unique=True)  # keyword.lower()
+    keyword = models.CharField(max_length=200)  # spelling of the first resource
+    first_resource_id = models.BigIntegerField()
+    target_codes = models.TextField(blank=True, null=True)  # "1.1, 1.2, 13.A", in target order
+    sdgs = models.CharField(max_length=100, blank=True, null=True)  # "1, 13"
+    sdg_mask = models.IntegerField(default=0)
+    reference_ids = models.TextField(blank=True, null=True)  # "3 | 17"
+    target_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'keyword_summary'
+        verbose_name = 'Keyword Summary'
+        verbose_name_plural = 'Keyword Summaries'
+        ordering = ['keyword_key']
+
+    def __str__(self):
+        return self.keyword
+
+class SdgTarget(models.Model):
+    """
+    One row per SDG target with its description, derived from keyword_resources.
+    Kept up to date by apps.keywords.summary; never edit directly.
+    """
+    sdg_number = models.IntegerField()
+    code = models.CharField(max_length=10)  # keyword_resources.target_code
+    description = models.TextField()  # description of the first resource with this target
+
+    class Meta:
+        db_table = 'sdg_targets'
+        verbose_name = 'SDG Target'
+        verbose_name_plural = 'SDG Targets'
+        ordering = ['sdg_number', 'code']
+        unique_together = ['sdg_number', 'code']
+
+    def __str__(self):
+        return f"SDG{self.sdg_number}.{self.code}"
+
 class KeywordLike(models.Model):
     """Keyword like/favorite model"""
     user = models.ForeignKey(User, on_delete=models.CASCADE)
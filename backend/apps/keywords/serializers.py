@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.catalog.likes import LikedField
 from .models import KeywordResource, KeywordLike, Reference
 
 class ReferenceSerializer(serializers.ModelSerializer):
@@ -12,7 +13,7 @@ class ReferenceSerializer(serializers.ModelSerializer):
 class KeywordResourceSerializer(serializers.ModelSerializer):
     """Keyword resource serializer with optimized reference handling"""
     sdg_title = serializers.SerializerMethodField()
-    is_liked = serializers.SerializerMethodField()
+    is_liked = LikedField(KeywordLike, 'keyword_resource_id')
     reference1_detail = serializers.SerializerMethodField()
     reference2_detail = serializers.SerializerMethodField()
     
@@ -38,16 +39,6 @@ class KeywordResourceSerializer(serializers.ModelSerializer):
         }
         return sdg_titles.get(obj.sdg_number, f'SDG {obj.sdg_number}')
     
-    def get_is_liked(self, obj):
-        """Check whether the keyword has been liked by the current user"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return KeywordLike.objects.filter(
-                user=request.user, 
-                keyword_resource=obj
-            ).exists()
-        return False
-    
     def get_reference1_detail(self, obj):
         """Get detailed reference1 information"""
         if obj.reference1:
@@ -60,6 +51,17 @@ class KeywordResourceSerializer(serializers.ModelSerializer):
             return ReferenceSerializer(obj.reference2).data
         return None
 
+class KeywordResourceCompactSerializer(serializers.ModelSerializer):
+    """Keyword resource without target description or reference details, for compact responses"""
+    is_liked = LikedField(KeywordLike, 'keyword_resource_id')
+    
+    class Meta:
+        model = KeywordResource
+        fields = [
+            'id', 'keyword', 'sdg_number', 'target_code',
+            'reference1', 'reference2', 'note', 'is_liked', 'created_at'
+        ]
+
 class KeywordStatsSerializer(serializers.Serializer):
     """Keyword statistics serializer"""
     total_keywords = serializers.IntegerField()
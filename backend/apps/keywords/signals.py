@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.catalog.version import bump_catalog_version
+
+from .models import KeywordResource
+from .stats import refresh_keyword_stats
+from .summary import refresh_keyword_summaries, refresh_sdg_targets
+
+
+def schedule_refresh(keywords, targets):
+    """Refresh the summaries, targets and stats snapshot once the surrounding transaction has committed"""
+    def refresh():
+        refresh_keyword_summaries(keywords)
+        refresh_sdg_targets(targets)
+        refresh_keyword_stats(bump_catalog_version())
+    transaction.on_commit(refresh)
+
+
+@receiver(pre_save, sender=KeywordResource)
+def remember_previous_keyword(sender, instance, **kwargs):
+    """A renamed or retargeted resource leaves its old keyword group and target, which need refreshing too"""
+    instance._previous_keyword = None
+    instance._previous_target = None
+    if instance.pk:
+        previous = KeywordResource.objects.filter(pk=instance.pk).values_list(
+            'keyword', 'sdg_number', 'target_code'
+        ).first()
+        if previous:
+            instance._previous_keyword = previous[0]
+            instance._previous_target = previous[1:]
+
+
+@receiver(post_save, sender=KeywordResource)
+def keyword_resource_saved(sender, instance, **kwargs):
+    previous_target = getattr(instance, '_previous_target', None)
+    schedule_refresh(
+        [instance.keyword, getattr(instance, '_previous_keyword', None)],
+        [(instance.sdg_number, instance.target_code)] + ([previous_target] if previous_target else []),
+    )
+
+
+@receiver(post_delete, sender=KeywordResource)
+def keyword_resource_deleted(sender, instance, **kwargs):
+    schedule_refresh([instance.keyword], [(instance.sdg_number, instance.target_code)])
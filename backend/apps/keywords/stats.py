@@ -0,0 +1,74 @@
+"""
+Snapshot behind keyword_stats.
+
+The counts, distributions and filter options are computed once and kept in
+the cache with the catalog version they were computed at, so requests only
+recompute after keyword_resources (or another catalog table) changed. The
+signal handlers refresh the snapshot right after a write commits, so readers
+rarely pay for it. The ETag is a digest of the contents: a version bump that
+leaves the statistics unchanged still answers conditional GETs with 304.
+"""
+import hashlib
+import json
+import logging
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from apps.catalog.version import get_catalog_version
+
+from .models import KeywordResource
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = 'keywords:stats'
+
+
+def compute_keyword_stats():
+    sdg_counts = KeywordResource.objects.values('sdg_number').annotate(count=Count('id')).order_by('sdg_number')
+    target_counts = KeywordResource.objects.values('target_code').annotate(count=Count('id')).order_by('-count')[:20]
+
+    return {
+        'total_keywords': KeywordResource.objects.count(),
+        'unique_keywords': KeywordResource.objects.values('keyword').distinct().count(),
+        'sdg_distribution': {f"sdg_{item['sdg_number']}": item['count'] for item in sdg_counts},
+        # Target distribution of the 20 most common targets
+        'target_distribution': {item['target_code']: item['count'] for item in target_counts},
+        'filter_options': {
+            'sdgs': [{'value': i, 'label': f'SDG {i}'} for i in range(1, 18)],
+            'target_codes': list(
+                KeywordResource.objects.values_list('target_code', flat=True).distinct().order_by('target_code')
+            ),
+        },
+    }
+
+
+def stats_etag(data):
+    return hashlib.sha1(json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def refresh_keyword_stats(version=None):
+    """Recompute the snapshot and store it for `version` (the current catalog version by default)"""
+    if version is None:
+        version = get_catalog_version()
+    data = compute_keyword_stats()
+    snapshot = {'version': version, 'etag': stats_etag(data), 'data': data}
+    if version is not None:
+        try:
+            cache.set(STATS_CACHE_KEY, snapshot, timeout=None)
+        except Exception as e:
+            logger.warning(f"Keyword stats snapshot not cached: {e}")
+    return snapshot
+
+
+def get_keyword_stats():
+    """{'version', 'etag', 'data'} for the current catalog version"""
+    version = get_catalog_version()
+    try:
+        snapshot = cache.get(STATS_CACHE_KEY)
+    except Exception as e:
+        logger.warning(f"Keyword stats snapshot unavailable: {e}")
+        snapshot = None
+    if snapshot is not None and version is not None and snapshot['version'] == version:
+        return snapshot
+    return refresh_keyword_stats(version)
@@ -0,0 +1,172 @@
+"""
+Maintenance of the keyword_summary and sdg_targets tables.
+
+keyword_resources holds one row per (keyword, SDG target); keyword_summary
+folds them into one row per case-folded keyword with the target codes, SDGs
+and references already joined and sorted, so readers never group at request time.
+sdg_targets keeps each target's description once, for the compact responses.
+"""
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Lower, Trim
+
+from apps.catalog.sdg import sdgs_to_mask
+
+from .models import KeywordResource, KeywordSummary, SdgTarget
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_FIELDS = ('id', 'keyword', 'sdg_number', 'target_code')
+
+
+def keyword_key(keyword):
+    return (keyword or '').strip().lower()
+
+
+def keyword_key_expression(field='keyword'):
+    """keyword_key computed in SQL, to match resources to their summary key"""
+    return Trim(Lower(field))
+
+
+def filter_keyword_keys(queryset, keys):
+    """Resources whose normalized keyword is one of `keys`, including ones stored with surrounding spaces"""
+    return queryset.alias(normalized_keyword=keyword_key_expression()).filter(normalized_keyword__in=list(keys))
+
+
+def target_sort_key(target_str):
+    """Order target codes numerically, with lettered targets (1.a) after numbered ones"""
+    try:
+        if '.' in target_str:
+            parts = target_str.split('.')
+            major = int(parts[0])
+            minor_part = parts[1]
+            if minor_part.isdigit():
+                minor = int(minor_part)
+            else:
+                minor = ord(minor_part.upper()) - ord('A') + 100
+            return (major, minor)
+        else:
+            return (int(target_str), 0)
+    except (ValueError, IndexError, TypeError):
+        return (999, 999)
+
+
+def summarize(resources):
+    """Summary fields for the resource dicts (see resource_values) of one keyword, ordered by id"""
+    first = resources[0]
+    target_codes = {r['target_code'].strip() for r in resources if r['target_code'] and r['target_code'].strip()}
+    sdg_numbers = {r['sdg_number'] for r in resources if r['sdg_number'] is not None}
+    reference_ids = {r['reference_id'] for r in resources if r['reference_id'] is not None}
+    targets = {(r['sdg_number'], r['target_code']) for r in resources}
+
+    return {
+        'keyword_key': keyword_key(first['keyword']),
+        'keyword': first['keyword'],
+        'first_resource_id': first['id'],
+        'target_codes': ', '.join(sorted(target_codes, key=target_sort_key)) or None,
+        'sdgs': ', '.join(str(sdg) for sdg in sorted(sdg_numbers)) or None,
+        'sdg_mask': sdgs_to_mask(sdg_numbers),
+        'reference_ids': ' | '.join(str(ref) for ref in sorted(reference_ids)) or None,
+        'target_count': len(targets),
+    }
+
+
+def resource_values(queryset):
+    return queryset.values(*RESOURCE_FIELDS, reference_id=F('reference1'))
+
+
+def group_resources(rows):
+    """Group resource dicts by case-folded keyword, keeping id order inside each group"""
+    groups = defaultdict(list)
+    for row in sorted(rows, key=lambda r: r['id']):
+        groups[keyword_key(row['keyword'])].append(row)
+    return groups
+
+
+def resources_for_keywords(keys, queryset=None):
+    """Resources of the given keyword keys grouped by key, fetched with a single query"""
+    grouped = defaultdict(list)
+    if not keys:
+        return grouped
+
+    if queryset is None:
+        queryset = KeywordResource.objects.all()
+    for resource in filter_keyword_keys(queryset, keys):
+        grouped[keyword_key(resource.keyword)].append(resource)
+    return grouped
+
+
+def rebuild_keyword_summaries():
+    """Recreate the whole table"""
+    groups = group_resources(resource_values(KeywordResource.objects.all()).iterator())
+    summaries = [KeywordSummary(**summarize(resources)) for resources in groups.values()]
+    with transaction.atomic():
+        KeywordSummary.objects.all().delete()
+        KeywordSummary.objects.bulk_create(summaries, batch_size=1000)
+    return len(summaries)
+
+
+def refresh_keyword_summaries(keywords):
+    """Recompute the summary rows of the given keywords (any case) after their resources changed"""
+    keys = {keyword_key(keyword) for keyword in keywords if keyword_key(keyword)}
+    if not keys:
+        return
+
+    groups = group_resources(resource_values(filter_keyword_keys(KeywordResource.objects.all(), keys)))
+
+    with transaction.atomic():
+        for key in keys:
+            resources = groups.get(key)
+            if resources:
+                fields = summarize(resources)
+                KeywordSummary.objects.update_or_create(keyword_key=key, defaults=fields)
+            else:
+                KeywordSummary.objects.filter(keyword_key=key).delete()
+    logger.info(f"Refreshed keyword summaries: {sorted(keys)}")
+
+
+def target_descriptions(rows):
+    """Description of each (sdg_number, target_code), taken from its first resource by id"""
+    descriptions = {}
+    for row in sorted(rows, key=lambda r: r['id']):
+        descriptions.setdefault((row['sdg_number'], row['target_code']), row['target_description'] or '')
+    return descriptions
+
+
+def rebuild_sdg_targets():
+    """Recreate the whole table"""
+    rows = KeywordResource.objects.values('id', 'sdg_number', 'target_code', 'target_description').iterator()
+    targets = [
+        SdgTarget(sdg_number=sdg_number, code=code, description=description)
+        for (sdg_number, code), description in target_descriptions(rows).items()
+    ]
+    with transaction.atomic():
+        SdgTarget.objects.all().delete()
+        SdgTarget.objects.bulk_create(targets, batch_size=1000)
+    return len(targets)
+
+
+def refresh_sdg_targets(targets):
+    """Recompute the sdg_targets rows of the given (sdg_number, target_code) pairs"""
+    targets = {target for target in targets if target[0] is not None and target[1]}
+    if not targets:
+        return
+
+    query = Q()
+    for sdg_number, code in targets:
+        query |= Q(sdg_number=sdg_number, target_code=code)
+    descriptions = target_descriptions(
+        KeywordResource.objects.filter(query).values('id', 'sdg_number', 'target_code', 'target_description')
+    )
+
+    with transaction.atomic():
+        for sdg_number, code in targets:
+            if (sdg_number, code) in descriptions:
+                SdgTarget.objects.update_or_create(
+                    sdg_number=sdg_number, code=code, defaults={'description': descriptions[(sdg_number, code)]}
+                )
+            else:
+                SdgTarget.objects.filter(sdg_number=sdg_number, code=code).delete()
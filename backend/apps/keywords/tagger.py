@@ -0,0 +1,134 @@
+"""
+SDG tagging of free text with the curated keywords.
+
+Every keyword in keyword_summary is compiled into one Aho-Corasick automaton,
+so a text is scanned once, in time linear in its length, however many
+keywords there are. Matches must start and end on word boundaries ("water"
+does not match inside "wastewater"). The automaton is built once per worker
+and rebuilt when the catalog version changes.
+"""
+import logging
+import time
+
+from apps.catalog.version import CatalogBoundResource
+
+from .models import KeywordSummary
+from .summary import target_sort_key
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(text):
+    """Case-fold and collapse whitespace, the form both keywords and texts are matched in"""
+    return ' '.join((text or '').lower().split())
+
+
+class KeywordTagger:
+    def __init__(self, keywords):
+        """`keywords` yields (display keyword, SDG numbers, target codes) tuples"""
+        self.labels = []
+        self.sdgs = []
+        self.targets = []
+        # Node 0 is the root; goto[n] maps a character to the next node
+        self.goto = [{}]
+        self.fail = [0]
+        # Keyword indexes ending at each node, with their lengths for the boundary check
+        self.output = [()]
+
+        for label, sdgs, targets in keywords:
+            pattern = normalize(label)
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                node = next_node
+            self.output[node] += ((len(self.labels), len(pattern)),)
+            self.labels.append(label)
+            self.sdgs.append(tuple(sdgs))
+            self.targets.append(tuple(targets))
+
+        self._link()
+
+    def _link(self):
+        """Breadth-first failure links; each node's output also gets the outputs of its failure node"""
+        queue = list(self.goto[0].values())
+        for node in queue:
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(char, 0)
+                self.fail[child] = fallback if fallback != child else 0
+                self.output[child] += self.output[self.fail[child]]
+
+    @classmethod
+    def build(cls):
+        started = time.monotonic()
+        rows = KeywordSummary.objects.order_by('keyword_key').values_list('keyword', 'sdgs', 'target_codes')
+        tagger = cls(
+            (keyword, [int(sdg) for sdg in sdgs.split(', ')] if sdgs else [], target_codes.split(', ') if target_codes else [])
+            for keyword, sdgs, target_codes in rows.iterator()
+        )
+        logger.info(f"Keyword tagger built in {time.monotonic() - started:.2f}s ({len(tagger.labels)} keywords)")
+        return tagger
+
+    def matches(self, text):
+        """{keyword index: occurrences} of the keywords found in text"""
+        text = normalize(text)
+        goto, fail, output = self.goto, self.fail, self.output
+        found = {}
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node] or (end < len(text) and text[end].isalnum()):
+                continue
+            for index, length in output[node]:
+                start = end - length
+                if start == 0 or not text[start - 1].isalnum():
+                    found[index] = found.get(index, 0) + 1
+        return found
+
+    def tag(self, text):
+        """Matched keywords with their SDGs and targets, plus the union of SDGs and targets over all matches"""
+        found = self.matches(text)
+        sdgs = set()
+        targets = set()
+        keywords = []
+        for index in sorted(found, key=lambda i: (-found[i], self.labels[i])):
+            sdgs.update(self.sdgs[index])
+            targets.update(self.targets[index])
+            keywords.append({
+                'keyword': self.labels[index],
+                'count': found[index],
+                'sdgs': list(self.sdgs[index]),
+                'targets': list(self.targets[index]),
+            })
+        return {
+            'keywords': keywords,
+            'sdgs': sorted(sdgs),
+            'targets': sorted(targets, key=target_sort_key),
+        }
+
+    def tag_many(self, texts):
+        return [self.tag(text) for text in texts]
+
+
+_tagger = CatalogBoundResource(KeywordTagger.build)
+
+
+def get_keyword_tagger():
+    return _tagger.get()
+
+
+def reset_keyword_tagger():
+    _tagger.reset()
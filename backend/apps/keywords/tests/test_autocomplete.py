@@ -0,0 +1,57 @@
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from apps.analytics.models import UserBehavior
+from apps.keywords.autocomplete import KeywordPrefixIndex, reset_keyword_prefix_index
+from apps.keywords.models import KeywordResource
+from apps.keywords.summary import rebuild_keyword_summaries
+
+from .test_summary import KeywordResourceTableMixin
+
+
+class KeywordPrefixIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = KeywordPrefixIndex([
+            ('climate change', 'Climate change', 5),
+            ('climate finance', 'Climate finance', 9),
+            ('clean water', 'Clean water', 1),
+            ('coastal climate-risk', 'Coastal climate-risk', 20),
+        ])
+
+    def test_keywords_starting_with_prefix_rank_first_then_by_score(self):
+        self.assertEqual(
+            self.index.suggest('cli'),
+            ['Climate finance', 'Climate change', 'Coastal climate-risk'],
+        )
+
+    def test_matches_later_words(self):
+        self.assertEqual(self.index.suggest('wat'), ['Clean water'])
+        self.assertEqual(self.index.suggest('risk'), ['Coastal climate-risk'])
+        self.assertEqual(self.index.suggest('climate ch'), ['Climate change'])
+        self.assertEqual(self.index.suggest('imate'), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.suggest('c', limit=2)), 2)
+
+
+class KeywordAutocompleteViewTest(KeywordResourceTableMixin, TestCase):
+    def setUp(self):
+        for keyword, sdg_number, target_code in [
+            ('Water quality', 6, '6.3'), ('water quality', 6, '6.1'), ('Waste', 12, '12.5'),
+        ]:
+            KeywordResource.objects.create(
+                keyword=keyword, sdg_number=sdg_number, target_code=target_code, target_description='desc'
+            )
+        rebuild_keyword_summaries()
+        reset_keyword_prefix_index()
+        self.addCleanup(reset_keyword_prefix_index)
+
+    def test_suggestions_are_distinct_and_ranked(self):
+        response = APIClient().get('/api/keywords/autocomplete/', {'q': 'wa'})
+        self.assertEqual(response.data['suggestions'], ['Water quality', 'Waste'])
+
+    def test_popular_searches_rank_higher(self):
+        for _ in range(3):
+            UserBehavior.objects.create(user_id='u1', type='search', detail={'query': 'Waste'})
+        response = APIClient().get('/api/keywords/autocomplete/', {'q': 'wa'})
+        self.assertEqual(response.data['suggestions'], ['Waste', 'Water quality'])
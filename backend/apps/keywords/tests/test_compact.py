@@ -0,0 +1,62 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordResource, Reference, SdgTarget
+from apps.keywords.summary import rebuild_keyword_summaries, rebuild_sdg_targets
+
+from .test_summary import KeywordResourceTableMixin
+
+
+class SdgTargetTest(KeywordResourceTableMixin, TestCase):
+    def test_rebuild_and_signals_keep_one_row_per_target(self):
+        KeywordResource.objects.create(keyword='water', sdg_number=6, target_code='6.1', target_description='Water')
+        KeywordResource.objects.create(keyword='drinking', sdg_number=6, target_code='6.1', target_description='Other')
+        self.assertEqual(rebuild_sdg_targets(), 1)
+        self.assertEqual(SdgTarget.objects.get().description, 'Water')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resource = KeywordResource.objects.create(
+                keyword='energy', sdg_number=7, target_code='7.1', target_description='Energy'
+            )
+        self.assertEqual(SdgTarget.objects.get(code='7.1').description, 'Energy')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.target_code = '7.2'
+            resource.save()
+        self.assertEqual(list(SdgTarget.objects.values_list('code', flat=True)), ['6.1', '7.2'])
+
+
+class CompactKeywordResponseTest(KeywordResourceTableMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.reference = Reference.objects.create(source='UN report')
+        for keyword, target_code in [('climate', '13.1'), ('climate', '13.2'), ('climate finance', '13.1')]:
+            KeywordResource.objects.create(
+                keyword=keyword, sdg_number=13, target_code=target_code,
+                target_description=f'Target {target_code}', reference1=self.reference
+            )
+        rebuild_keyword_summaries()
+        rebuild_sdg_targets()
+        self.targets = dict(SdgTarget.objects.values_list('code', 'id'))
+
+    def test_list_side_loads_targets_and_references(self):
+        data = self.client.get('/api/keywords/', {'sdg': '13', 'compact': 'true'}).json()
+        self.assertEqual(
+            [r['all_targets'] for r in data['results']],
+            [[self.targets['13.1'], self.targets['13.2']], [self.targets['13.1']]],
+        )
+        self.assertNotIn('target_description', data['results'][0])
+        self.assertEqual(data['results'][0]['reference1'], self.reference.id)
+        self.assertEqual(data['included']['references'], {str(self.reference.id): {
+            'id': self.reference.id, 'reference_no': str(self.reference.id), 'source': 'UN report',
+        }})
+        self.assertEqual(data['included']['targets'][str(self.targets['13.2'])]['target_description'], 'Target 13.2')
+
+    def test_search_and_detail(self):
+        data = self.client.get('/api/keywords/search/', {'q': 'climate', 'compact': '1'}).json()
+        self.assertEqual([t['target'] for t in data['results'][1]['related_targets']], [self.targets['13.1']])
+        self.assertEqual(set(data['included']['targets']), {str(i) for i in self.targets.values()})
+
+        data = self.client.get('/api/keywords/detail/climate/', {'compact': 'true'}).json()
+        self.assertEqual([t['target'] for t in data['targets']], [self.targets['13.1'], self.targets['13.2']])
+        self.assertEqual(list(data['included']['references']), [str(self.reference.id)])
@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.catalog.version import bump_catalog_version
+from apps.keywords.models import KeywordResource
+
+from .test_summary import KeywordResourceTableMixin
+
+
+class KeywordStatsSnapshotTest(KeywordResourceTableMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        for keyword, sdg_number, target_code in [('water', 6, '6.1'), ('water', 6, '6.2'), ('energy', 7, '7.1')]:
+            KeywordResource.objects.create(
+                keyword=keyword, sdg_number=sdg_number, target_code=target_code, target_description='desc'
+            )
+
+    def test_snapshot_is_served_until_the_catalog_changes(self):
+        response = self.client.get('/api/keywords/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_keywords'], 3)
+        self.assertEqual(response.json()['sdg_distribution'], {'sdg_6': 2, 'sdg_7': 1})
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/keywords/stats/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            KeywordResource.objects.create(keyword='ocean', sdg_number=14, target_code='14.1', target_description='d')
+        # Refreshed by the signal handler, not by the next request
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/keywords/stats/')
+        self.assertEqual(response.json()['total_keywords'], 4)
+        self.assertIn('14.1', response.json()['filter_options']['target_codes'])
+
+    def test_conditional_get(self):
+        etag = self.client.get('/api/keywords/stats/')['ETag']
+
+        response = self.client.get('/api/keywords/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        # A version bump that leaves the statistics unchanged keeps the ETag
+        bump_catalog_version()
+        self.assertEqual(self.client.get('/api/keywords/stats/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        KeywordResource.objects.filter(keyword='energy').delete()
+        bump_catalog_version()
+        response = self.client.get('/api/keywords/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,163 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.keywords.models import KeywordLike, KeywordResource, KeywordSummary, Reference
+from apps.keywords.summary import rebuild_keyword_summaries, refresh_keyword_summaries, resources_for_keywords
+
+
+class KeywordResourceTableMixin:
+    """keyword_resources is unmanaged, so the test database needs it created explicitly"""
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            editor.create_model(KeywordResource)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(KeywordResource)
+
+
+class KeywordSummaryTest(KeywordResourceTableMixin, TestCase):
+    def add(self, keyword, sdg_number, target_code):
+        return KeywordResource.objects.create(
+            keyword=keyword, sdg_number=sdg_number, target_code=target_code, target_description='desc'
+        )
+
+    def test_rebuild_groups_case_insensitively_and_sorts_targets(self):
+        first = self.add('Water', 6, '6.a')
+        self.add('water', 6, '6.10')
+        self.add('water', 14, '14.2')
+        rebuild_keyword_summaries()
+
+        summary = KeywordSummary.objects.get()
+        self.assertEqual(summary.keyword_key, 'water')
+        self.assertEqual(summary.keyword, 'Water')
+        self.assertEqual(summary.first_resource_id, first.id)
+        self.assertEqual(summary.target_codes, '6.10, 6.a, 14.2')
+        self.assertEqual(summary.sdgs, '6, 14')
+        self.assertEqual(summary.sdg_mask, (1 << 5) | (1 << 13))
+        self.assertEqual(summary.target_count, 3)
+
+    def test_keywords_with_surrounding_spaces_match_their_key(self):
+        self.add(' Solar ', 7, '7.2')
+        refresh_keyword_summaries(['solar'])
+
+        self.assertEqual(KeywordSummary.objects.get(keyword_key='solar').target_count, 1)
+        self.assertEqual(len(resources_for_keywords(['solar'])['solar']), 1)
+
+    def test_signals_refresh_incrementally(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resource = self.add('energy', 7, '7.1')
+        self.assertEqual(KeywordSummary.objects.get(keyword_key='energy').target_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.keyword = 'clean energy'
+            resource.save()
+        self.assertEqual(list(KeywordSummary.objects.values_list('keyword_key', flat=True)), ['clean energy'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resource.delete()
+        self.assertFalse(KeywordSummary.objects.exists())
+
+
+class KeywordListFromSummaryTest(KeywordResourceTableMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for keyword, sdg_number, target_code in [
+            ('climate', 13, '13.1'), ('climate', 13, '13.2'), ('climate finance', 13, '13.a'),
+            ('clean water', 6, '6.1'), ('poverty', 1, '1.1'),
+        ]:
+            KeywordResource.objects.create(
+                keyword=keyword, sdg_number=sdg_number, target_code=target_code, target_description='desc'
+            )
+        rebuild_keyword_summaries()
+
+    def test_list_paginates_keyword_groups(self):
+        response = self.client.get('/api/keywords/', {'sdg': '13', 'page_size': 1, 'page': 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([r['keyword'] for r in data['results']], ['climate finance'])
+        self.assertIsNone(data['next'])
+
+        response = self.client.get('/api/keywords/', {'search': 'climate'})
+        result = response.json()['results'][0]
+        self.assertEqual(result['keyword'], 'climate')
+        self.assertEqual([t['target_code'] for t in result['all_targets']], ['13.1', '13.2'])
+
+    def test_sdg_and_target_filters_match_the_same_resource(self):
+        for keyword, sdg_number, target_code in [('clean water', 13, '13.3'), ('cities', 11, '11.1')]:
+            KeywordResource.objects.create(
+                keyword=keyword, sdg_number=sdg_number, target_code=target_code, target_description='desc'
+            )
+        rebuild_keyword_summaries()
+
+        # clean water has an SDG 13 resource and a 6.1 resource, but not both on one row
+        response = self.client.get('/api/keywords/', {'sdg': '13', 'target_code': '6.1'})
+        self.assertEqual(response.json()['count'], 0)
+
+        response = self.client.get('/api/keywords/', {'target_code': '1.1'})
+        self.assertEqual([r['keyword'] for r in response.json()['results']], ['poverty'])
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_keyword_search_reads_summary(self):
+        response = self.client.get('/api/keywords/search/', {'q': 'cl'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(
+            [r['keyword_text'] for r in data['results']], ['clean water', 'climate', 'climate finance']
+        )
+        self.assertEqual(data['results'][1]['target_count'], 2)
+
+    def test_list_loads_only_the_page(self):
+        reference = Reference.objects.create(source='UN report')
+        KeywordResource.objects.filter(keyword='climate').update(reference1=reference)
+
+        # count, page of summaries, page targets, representatives with references
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/keywords/', {'sdg': '13', 'page_size': 1})
+        result = response.json()['results'][0]
+        self.assertEqual(result['keyword'], 'climate')
+        self.assertEqual(result['reference1_detail']['source'], 'UN report')
+        self.assertEqual([t['target_code'] for t in result['all_targets']], ['13.1', '13.2'])
+
+    def test_search_bounds_page_size(self):
+        response = self.client.get('/api/keywords/search/', {'q': 'cl', 'page_size': 1000, 'page': 'x'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r['keyword_text'] for r in response.json()['results']], ['clean water', 'climate', 'climate finance']
+        )
+
+
+class KeywordLikedTest(KeywordResourceTableMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='liker', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.resources = [
+            KeywordResource.objects.create(
+                keyword='climate', sdg_number=13, target_code=f'13.{i}', target_description='desc'
+            )
+            for i in range(1, 4)
+        ]
+        rebuild_keyword_summaries()
+        KeywordLike.objects.create(user=self.user, keyword_resource=self.resources[0])
+
+    def test_detail_resolves_likes_with_one_query(self):
+        # exists check, targets, liked ids
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/keywords/detail/climate/')
+        self.assertEqual([t['is_liked'] for t in response.json()['targets']], [True, False, False])
+
+    def test_list_reports_is_liked(self):
+        response = self.client.get('/api/keywords/', {'search': 'climate'})
+        self.assertTrue(response.json()['results'][0]['is_liked'])
+        response = APIClient().get('/api/keywords/', {'search': 'climate'})
+        self.assertFalse(response.json()['results'][0]['is_liked'])
@@ -0,0 +1,70 @@
+import pandas as pd
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from apps.data_management.views import map_education_columns, validate_education_data
+from apps.keywords.models import KeywordResource
+from apps.keywords.summary import rebuild_keyword_summaries
+from apps.keywords.tagger import KeywordTagger, reset_keyword_tagger
+
+from .test_summary import KeywordResourceTableMixin
+
+
+class KeywordTaggerTest(SimpleTestCase):
+    def setUp(self):
+        self.tagger = KeywordTagger([
+            ('Water', [6], ['6.1']),
+            ('clean water', [6], ['6.2']),
+            ('he', [1], []),
+            ('she', [5], []),
+            ('hers', [5], ['5.10', '5.2']),
+        ])
+
+    def test_overlapping_keywords_on_word_boundaries(self):
+        tags = self.tagger.tag('Clean  WATER, not wastewater; she says the ushers are hers. Water!')
+        self.assertEqual(
+            [(k['keyword'], k['count']) for k in tags['keywords']],
+            [('Water', 2), ('clean water', 1), ('hers', 1), ('she', 1)],
+        )
+        self.assertEqual(tags['sdgs'], [5, 6])
+        self.assertEqual(tags['targets'], ['5.2', '5.10', '6.1', '6.2'])
+
+    def test_no_match(self):
+        self.assertEqual(self.tagger.tag('ushered'), {'keywords': [], 'sdgs': [], 'targets': []})
+        self.assertEqual(self.tagger.tag(''), {'keywords': [], 'sdgs': [], 'targets': []})
+
+
+class KeywordTaggingTest(KeywordResourceTableMixin, TestCase):
+    def setUp(self):
+        for keyword, sdg_number, target_code in [
+            ('renewable energy', 7, '7.2'), ('renewable energy', 13, '13.2'), ('poverty', 1, '1.1'),
+        ]:
+            KeywordResource.objects.create(
+                keyword=keyword, sdg_number=sdg_number, target_code=target_code, target_description='desc'
+            )
+        rebuild_keyword_summaries()
+        reset_keyword_tagger()
+        self.addCleanup(reset_keyword_tagger)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='tagger', password='pass'))
+
+    def test_tag_api(self):
+        response = self.client.post('/api/keywords/tag/', {'text': 'Renewable energy against poverty'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['sdgs'], [1, 7, 13])
+
+        response = self.client.post('/api/keywords/tag/', {'texts': ['poverty', 'nothing']}, format='json')
+        self.assertEqual([r['targets'] for r in response.data['results']], [['1.1'], []])
+
+        response = self.client.post('/api/keywords/tag/', {'texts': 'poverty'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_upload_validation_suggests_sdgs(self):
+        df = pd.DataFrame([
+            {'Title': 'Solar course', 'Description': 'Renewable energy basics'},
+            {'Title': 'History', 'Description': 'Ancient Rome'},
+        ])
+        results = validate_education_data(df, map_education_columns(df.columns.tolist()))
+        self.assertEqual([r['_suggested_sdgs'] for r in results['valid_records']], [[7, 13], []])
+        self.assertEqual(results['valid_records'][0]['_suggested_targets'], ['7.2', '13.2'])
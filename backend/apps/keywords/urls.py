@@ -1,18 +1,22 @@
 from django.urls import path
+
+from apps.catalog.async_views import catalog_view
 from . import views
 
 app_name = 'keywords'
 
 urlpatterns = [
     # Keyword Resource
-    path('', views.KeywordResourceListView.as_view(), name='keyword-list'),
-    path('<int:pk>/', views.KeywordResourceDetailView.as_view(), name='keyword-detail'),
-    path('stats/', views.keyword_stats, name='keyword-stats'),
+    path('', catalog_view(views.KeywordResourceListView.as_view()), name='keyword-list'),
+    path('<int:pk>/', catalog_view(views.KeywordResourceDetailView.as_view()), name='keyword-detail'),
+    path('bulk/', catalog_view(views.keyword_bulk), name='keyword-bulk'),
+    path('stats/', catalog_view(views.keyword_stats), name='keyword-stats'),
     
     # Keyword Search
-    path('search/', views.keyword_search, name='keyword-search'),
-    path('detail/<str:keyword>/', views.keyword_detail, name='keyword-detail-by-name'),
-    path('autocomplete/', views.keyword_autocomplete, name='keyword-autocomplete'),
+    path('search/', catalog_view(views.keyword_search), name='keyword-search'),
+    path('detail/<str:keyword>/', catalog_view(views.keyword_detail), name='keyword-detail-by-name'),
+    path('autocomplete/', catalog_view(views.keyword_autocomplete), name='keyword-autocomplete'),
+    path('tag/', views.tag_text, name='keyword-tag'),
 
     # Keyword References
     path('references/', views.references_list, name='references-list'),
@@ -3,53 +3,103 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, Count, F
+from django.conf import settings
+from django.db.models import Q, Count, Exists, F, OuterRef
 from django.db.models.functions import Lower
-from collections import defaultdict
-from .models import KeywordResource, KeywordLike, Reference
-from .serializers import KeywordResourceSerializer, KeywordStatsSerializer, ReferenceSerializer
+from django.utils.http import parse_etags, quote_etag
+from apps.catalog.bulk import bulk_response
+from apps.catalog.likes import liked_ids
+from apps.catalog.sdg import filter_by_sdgs
+from .models import KeywordResource, KeywordLike, KeywordSummary, Reference
+from .autocomplete import get_keyword_prefix_index
+from .compact import COMPACT_FIELDS, build_included, compact_requested, resource_references
+from .stats import get_keyword_stats
+from .tagger import get_keyword_tagger
+from .summary import keyword_key_expression, resources_for_keywords
+from .serializers import (
+    KeywordResourceCompactSerializer, KeywordResourceSerializer, KeywordStatsSerializer, ReferenceSerializer
+)
+import logging
 import re
 import math
 
+logger = logging.getLogger(__name__)
+
 class KeywordPagination(PageNumberPagination):
     """自定义分页"""
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+# 分组列表每个target只需要这些字段
+TARGET_FIELDS = ('id', 'keyword', 'sdg_number', 'target_code')
+
+def get_page_params(params, default_page_size):
+    """解析页码和每页数量，每页数量不超过max_page_size"""
+    try:
+        page = max(int(params.get('page', 1)), 1)
+    except (TypeError, ValueError):
+        page = 1
+    try:
+        page_size = int(params.get('page_size', default_page_size))
+    except (TypeError, ValueError):
+        page_size = default_page_size
+    return page, min(max(page_size, 1), KeywordPagination.max_page_size)
+
 class KeywordResourceListView(generics.ListAPIView):
     """关键词资源列表视图 - 分组返回"""
     serializer_class = KeywordResourceSerializer
     permission_classes = [AllowAny]
     
     def get_queryset(self):
-        # 使用select_related优化查询
-        queryset = KeywordResource.objects.select_related('reference1', 'reference2')
+        """匹配筛选条件的关键词汇总，每个关键词一行"""
+        queryset = KeywordSummary.objects.all()
         
         # 搜索关键词
         search = self.request.query_params.get('search')
         if search:
             search_clean = re.sub(r'[^\w\s-]', '', search.lower().strip())
-            queryset = queryset.filter(keyword__icontains=search_clean)
-        
-        # SDG筛选
-        sdg_params = self.request.query_params.getlist('sdg')
-        if sdg_params:
-            sdg_numbers = [int(sdg) for sdg in sdg_params if sdg.isdigit()]
-            if sdg_numbers:
-                queryset = queryset.filter(sdg_number__in=sdg_numbers)
+            queryset = queryset.filter(keyword_key__icontains=search_clean)
         
-        # Target Code筛选
-        target_code = self.request.query_params.get('target_code')
+        # SDG和Target筛选必须由同一条资源同时满足，与当前页加载资源的条件一致
+        sdg_numbers = self.get_sdg_numbers()
+        target_code = self.get_target_code()
         if target_code:
-            queryset = queryset.filter(target_code__icontains=target_code)
+            matching = self.filter_resources(KeywordResource.objects.all()).alias(
+                normalized_keyword=keyword_key_expression()
+            ).filter(normalized_keyword=OuterRef('keyword_key'))
+            queryset = queryset.filter(Exists(matching))
+        elif sdg_numbers:
+            # 只有SDG时直接用汇总表的SDG位掩码（任一SDG匹配即可）
+            queryset = filter_by_sdgs(queryset, sdg_numbers, mode='any')
         
-        return queryset.order_by('keyword', 'sdg_number', 'target_code')
+        return queryset.order_by('keyword_key')
 
-    def list(self, request, *args, **kwargs):
-        """重写list方法，实现分组分页"""
-        queryset = self.get_queryset()
+    def filter_resources(self, queryset):
+        """SDG（任一）和Target（完全匹配，不区分大小写）筛选"""
+        sdg_numbers = self.get_sdg_numbers()
+        if sdg_numbers:
+            queryset = queryset.filter(sdg_number__in=sdg_numbers)
         
+        target_code = self.get_target_code()
+        if target_code:
+            queryset = queryset.filter(target_code__iexact=target_code)
+        return queryset
+
+    def get_resource_queryset(self):
+        """当前页关键词的资源，应用同样的SDG和Target筛选"""
+        queryset = self.filter_resources(KeywordResource.objects.all())
+        return queryset.only(*TARGET_FIELDS).order_by('keyword', 'sdg_number', 'target_code')
+
+    def get_target_code(self):
+        return (self.request.query_params.get('target_code') or '').strip()
+
+    def get_sdg_numbers(self):
+        sdg_params = self.request.query_params.getlist('sdg')
+        return [int(sdg) for sdg in sdg_params if sdg.isdigit()]
+
+    def list(self, request, *args, **kwargs):
+        """重写list方法，在汇总表上分页，只加载当前页关键词的资源"""
         # 如果没有搜索条件，返回空结果（避免加载太多数据）
         search = request.query_params.get('search')
         sdg_params = request.query_params.getlist('sdg')
@@ -63,30 +113,70 @@ class KeywordResourceListView(generics.ListAPIView):
                 'results': []
             })
         
-        # 按关键词分组
-        keyword_groups = defaultdict(list)
-        for resource in queryset:
-            keyword_groups[resource.keyword.lower()].append(resource)
+        # 手动分页
+        page, page_size = get_page_params(request.query_params, 20)
+        
+        summaries = self.get_queryset()
+        total_count = summaries.count()
+        total_pages = math.ceil(total_count / page_size) if total_count > 0 else 1
+        
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size
+        page_summaries = list(summaries[start_idx:end_idx])
+        
+        # 按关键词分组，只取当前页关键词的target字段
+        keyword_groups = resources_for_keywords(
+            [summary.keyword_key for summary in page_summaries],
+            self.get_resource_queryset()
+        )
+        
+        # 只有每组的代表资源需要完整字段和reference
+        compact = compact_requested(request.query_params)
+        representative_ids = [resources[0].id for resources in keyword_groups.values() if resources]
+        if compact:
+            representatives = KeywordResource.objects.only(*COMPACT_FIELDS).in_bulk(representative_ids)
+            # 紧凑模式：target和reference各只返回一次
+            target_ids, included = build_included(
+                [(r.sdg_number, r.target_code) for resources in keyword_groups.values() for r in resources],
+                resource_references(representatives.values())
+            )
+        else:
+            representatives = KeywordResource.objects.select_related('reference1', 'reference2').in_bulk(
+                representative_ids
+            )
+        
+        # 当前用户收藏的资源ID，整页只查一次
+        liked = liked_ids(request, KeywordLike, 'keyword_resource_id')
         
         # 转换为分组结果格式
-        grouped_results = []
-        for keyword_text, resources in keyword_groups.items():
+        paginated_results = []
+        for summary in page_summaries:
+            resources = keyword_groups.get(summary.keyword_key)
+            if not resources:
+                continue
+            
             # 为每个分组创建一个代表性的对象
-            representative = resources[0]  # 使用第一个作为代表
+            representative = representatives[resources[0].id]  # 使用第一个作为代表
+            
+            # 收集所有相关的targets（去重，保持顺序）
+            combinations = list(dict.fromkeys((resource.sdg_number, resource.target_code) for resource in resources))
             
-            # 收集所有相关的targets
-            targets_info = []
-            seen_combinations = set()
+            if compact:
+                grouped_result = dict(KeywordResourceCompactSerializer(representative, context={'request': request}).data)
+                grouped_result['target'] = target_ids.get((representative.sdg_number, representative.target_code))
+                grouped_result['all_targets'] = [target_ids.get(combination) for combination in combinations]
+                grouped_result['target_count'] = len(combinations)
+                paginated_results.append(grouped_result)
+                continue
             
-            for resource in resources:
-                combination = (resource.sdg_number, resource.target_code)
-                if combination not in seen_combinations:
-                    targets_info.append({
-                        'sdg_number': resource.sdg_number,
-                        'target_code': resource.target_code,
-                        'sdg_title': self.get_sdg_title(resource.sdg_number)
-                    })
-                    seen_combinations.add(combination)
+            targets_info = [
+                {
+                    'sdg_number': sdg_number,
+                    'target_code': code,
+                    'sdg_title': self.get_sdg_title(sdg_number)
+                }
+                for sdg_number, code in combinations
+            ]
             
             # 获取reference详情
             reference1_detail = None
@@ -111,28 +201,14 @@ class KeywordResourceListView(generics.ListAPIView):
                 'reference2_detail': reference2_detail,
                 'note': representative.note,
                 'sdg_title': self.get_sdg_title(representative.sdg_number),
-                'is_liked': False,  # 暂时设为False
+                'is_liked': representative.id in liked,
                 'created_at': representative.created_at,
                 # 新增字段：所有相关的targets
                 'all_targets': targets_info,
                 'target_count': len(targets_info)
             }
             
-            grouped_results.append(grouped_result)
-        
-        # 按关键词排序
-        grouped_results.sort(key=lambda x: x['keyword'].lower())
-        
-        # 手动分页
-        page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 20))
-        
-        total_count = len(grouped_results)
-        total_pages = math.ceil(total_count / page_size) if total_count > 0 else 1
-        
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_results = grouped_results[start_idx:end_idx]
+            paginated_results.append(grouped_result)
         
         # 构建分页URL
         def build_page_url(page_num):
@@ -145,17 +221,22 @@ class KeywordResourceListView(generics.ListAPIView):
                 params.append(f'target_code={target_code}')
             params.append(f'page={page_num}')
             params.append(f'page_size={page_size}')
+            if compact:
+                params.append('compact=true')
             return '?' + '&'.join(params)
         
         has_next = page < total_pages
         has_previous = page > 1
         
-        return Response({
+        data = {
             'count': total_count,
             'next': build_page_url(page + 1) if has_next else None,
             'previous': build_page_url(page - 1) if has_previous else None,
             'results': paginated_results
-        })
+        }
+        if compact:
+            data['included'] = included
+        return Response(data)
     
     def get_sdg_title(self, sdg_number):
         """获取SDG标题"""
@@ -176,6 +257,14 @@ class KeywordResourceDetailView(generics.RetrieveAPIView):
     serializer_class = KeywordResourceSerializer
     permission_classes = [AllowAny]
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def keyword_bulk(request):
+    """按ID批量获取关键词资源（?ids=3,1,2），一次查询，按请求顺序返回"""
+    return bulk_response(
+        request, KeywordResource.objects.select_related('reference1', 'reference2'), KeywordResourceSerializer
+    )
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def keyword_detail(request, keyword):
@@ -184,15 +273,39 @@ def keyword_detail(request, keyword):
     from urllib.parse import unquote
     keyword_decoded = unquote(keyword)
     
-    resources = KeywordResource.objects.filter(
+    compact = compact_requested(request.GET)
+    if compact:
+        queryset = KeywordResource.objects.only(*COMPACT_FIELDS)
+    else:
+        queryset = KeywordResource.objects.select_related('reference1', 'reference2')
+    
+    resources = queryset.filter(
         keyword__iexact=keyword_decoded
-    ).select_related('reference1', 'reference2').order_by('sdg_number', 'target_code')
+    ).order_by('sdg_number', 'target_code')
     
     if not resources.exists():
         # 尝试模糊匹配
-        resources = KeywordResource.objects.filter(
+        resources = queryset.filter(
             keyword__icontains=keyword_decoded
-        ).select_related('reference1', 'reference2').order_by('sdg_number', 'target_code')[:10]
+        ).order_by('sdg_number', 'target_code')[:10]
+    
+    if compact:
+        resources = list(resources)
+        target_ids, included = build_included(
+            [(resource.sdg_number, resource.target_code) for resource in resources],
+            resource_references(resources)
+        )
+        serializer = KeywordResourceCompactSerializer(resources, many=True, context={'request': request})
+        targets = [
+            dict(row, target=target_ids.get((resource.sdg_number, resource.target_code)))
+            for row, resource in zip(serializer.data, resources)
+        ]
+        return Response({
+            'keyword': keyword_decoded,
+            'targets': targets,
+            'total_targets': len(targets),
+            'included': included
+        })
     
     serializer = KeywordResourceSerializer(
         resources, 
@@ -246,58 +359,25 @@ def references_list(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def keyword_stats(request):
-    """获取关键词统计信息"""
-    # 基础统计
-    total_keywords = KeywordResource.objects.count()
-    unique_keywords = KeywordResource.objects.values('keyword').distinct().count()
-    
-    # SDG分布
-    sdg_distribution = {}
-    sdg_counts = KeywordResource.objects.values('sdg_number').annotate(
-        count=Count('id')
-    ).order_by('sdg_number')
+    """获取关键词统计信息（预计算快照，支持ETag条件请求）"""
+    snapshot = get_keyword_stats()
+    etag = quote_etag(snapshot['etag'])
     
-    for item in sdg_counts:
-        sdg_key = f"sdg_{item['sdg_number']}"
-        sdg_distribution[sdg_key] = item['count']
-    
-    # Target分布（前20个最常见的）
-    target_distribution = {}
-    target_counts = KeywordResource.objects.values('target_code').annotate(
-        count=Count('id')
-    ).order_by('-count')[:20]
-    
-    for item in target_counts:
-        target_distribution[item['target_code']] = item['count']
-    
-    # 筛选选项
-    filter_options = {
-        'sdgs': [
-            {'value': i, 'label': f'SDG {i}'} for i in range(1, 18)
-        ],
-        'target_codes': list(KeywordResource.objects.values_list(
-            'target_code', flat=True
-        ).distinct().order_by('target_code')),
-    }
-    
-    data = {
-        'total_keywords': total_keywords,
-        'unique_keywords': unique_keywords,
-        'sdg_distribution': sdg_distribution,
-        'target_distribution': target_distribution,
-        'filter_options': filter_options
-    }
-    
-    serializer = KeywordStatsSerializer(data)
-    return Response(serializer.data)
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        serializer = KeywordStatsSerializer(snapshot['data'])
+        response = Response(serializer.data)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def keyword_search(request):
     """关键词搜索 - 按关键词分组"""
     query = request.GET.get('q', '').strip()
-    page = int(request.GET.get('page', 1))
-    page_size = int(request.GET.get('page_size', 20))
+    page, page_size = get_page_params(request.GET, 20)
     
     if not query or len(query) < 2:
         return Response({
@@ -307,52 +387,69 @@ def keyword_search(request):
             'previous': None
         })
     
-    # 搜索匹配的关键词资源
+    # 在关键词汇总表上匹配并分页
     search_clean = re.sub(r'[^\w\s-]', '', query.lower().strip())
-    resources = KeywordResource.objects.filter(
-        keyword__icontains=search_clean
-    ).select_related('reference1', 'reference2')
+    summaries = KeywordSummary.objects.filter(
+        keyword_key__icontains=search_clean
+    ).order_by('keyword_key')
     
-    # 按关键词分组
-    keyword_groups = defaultdict(list)
-    for resource in resources:
-        keyword_groups[resource.keyword.lower()].append({
-            'id': resource.id,
-            'sdg_number': resource.sdg_number,
-            'target_code': resource.target_code,
-            'target_description': resource.target_description,
-            'sdg_title': KeywordResourceSerializer().get_sdg_title(resource)
-        })
+    total_count = summaries.count()
+    start_idx = (page - 1) * page_size
+    end_idx = start_idx + page_size
+    page_summaries = list(summaries[start_idx:end_idx])
+    
+    # 只加载当前页关键词的资源
+    compact = compact_requested(request.GET)
+    fields = TARGET_FIELDS if compact else TARGET_FIELDS + ('target_description',)
+    keyword_groups = resources_for_keywords(
+        [summary.keyword_key for summary in page_summaries],
+        KeywordResource.objects.only(*fields).order_by('id')
+    )
+    if compact:
+        target_ids, included = build_included(
+            [(r.sdg_number, r.target_code) for resources in keyword_groups.values() for r in resources], []
+        )
     
     # 转换为搜索结果格式
-    results = []
-    for keyword, targets in keyword_groups.items():
-        results.append({
-            'keyword': targets[0]['id'],  # 使用第一个资源的ID作为标识
-            'keyword_text': keyword,
+    paginated_results = []
+    for summary in page_summaries:
+        if compact:
+            targets = [
+                {'id': resource.id, 'target': target_ids.get((resource.sdg_number, resource.target_code))}
+                for resource in keyword_groups.get(summary.keyword_key, [])
+            ]
+        else:
+            targets = [
+                {
+                    'id': resource.id,
+                    'sdg_number': resource.sdg_number,
+                    'target_code': resource.target_code,
+                    'target_description': resource.target_description,
+                    'sdg_title': KeywordResourceSerializer().get_sdg_title(resource)
+                }
+                for resource in keyword_groups.get(summary.keyword_key, [])
+            ]
+        paginated_results.append({
+            'keyword': summary.first_resource_id,  # 使用第一个资源的ID作为标识
+            'keyword_text': summary.keyword_key,
             'related_targets': targets,
             'target_count': len(targets)
         })
     
-    # 按关键词排序
-    results.sort(key=lambda x: x['keyword_text'])
-    
-    # 手动分页
-    total_count = len(results)
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_results = results[start_idx:end_idx]
-    
     # 构建分页响应
     has_next = end_idx < total_count
     has_previous = page > 1
+    suffix = '&compact=true' if compact else ''
     
-    return Response({
+    data = {
         'results': paginated_results,
         'count': total_count,
-        'next': f'?q={query}&page={page + 1}&page_size={page_size}' if has_next else None,
-        'previous': f'?q={query}&page={page - 1}&page_size={page_size}' if has_previous else None
-    })
+        'next': f'?q={query}&page={page + 1}&page_size={page_size}{suffix}' if has_next else None,
+        'previous': f'?q={query}&page={page - 1}&page_size={page_size}{suffix}' if has_previous else None
+    }
+    if compact:
+        data['included'] = included
+    return Response(data)
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -363,16 +460,41 @@ def keyword_autocomplete(request):
     if len(query) < 2:
         return Response({'suggestions': []})
     
-    # 搜索匹配的关键词
+    # 在内存前缀索引中查找，按目标数量和搜索热度排序
     search_clean = re.sub(r'[^\w\s-]', '', query.lower().strip())
-    suggestions = KeywordResource.objects.filter(
-        keyword__icontains=search_clean
-    ).values_list('keyword', flat=True).distinct()[:10]
+    try:
+        suggestions = get_keyword_prefix_index().suggest(search_clean)
+    except Exception:
+        logger.exception("Keyword prefix index unavailable, falling back to the database")
+        suggestions = KeywordSummary.objects.filter(
+            keyword_key__icontains=search_clean
+        ).order_by('-target_count', 'keyword_key').values_list('keyword', flat=True)[:10]
     
     return Response({
         'suggestions': list(suggestions)
     })
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def tag_text(request):
+    """用关键词为文本标注SDG，支持单条text或批量texts"""
+    texts = request.data.get('texts')
+    single = texts is None
+    if single:
+        texts = [request.data.get('text', '')]
+    
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return Response({'error': 'text must be a string and texts a list of strings'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    max_batch = getattr(settings, 'KEYWORD_TAGGER_MAX_BATCH', 5000)
+    if len(texts) > max_batch:
+        return Response({'error': f'At most {max_batch} texts per request'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    results = get_keyword_tagger().tag_many(texts)
+    if single:
+        return Response(results[0])
+    return Response({'results': results})
+
 # 收藏相关视图
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -0,0 +1,253 @@
+"""
+Search benchmark harness used by `manage.py benchmark_search`.
+
+generate_corpus() fills education_db, action_db and keyword_resources with a
+reproducible synthetic catalog; run_benchmark() replays a query mix against
+the search and list endpoints through the test client and reports latency
+percentiles and queries per request for each endpoint.
+run_serialization_benchmark() compares the list serializers with the values()
+row path of apps.catalog.rows in rows per second.
+"""
+import math
+import random
+import time
+from collections import Counter
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from apps.actions.models import ActionDb, ActionTag
+from apps.actions.serializers import ACTION_LIST_ROWS, ActionDbListSerializer
+from apps.analytics.models import UserBehavior
+from apps.catalog.rows import FastJSONRenderer
+from apps.catalog.tags import rebuild_tags
+from apps.catalog.version import bump_catalog_version
+from apps.education.models import EducationDb, EducationTag
+from apps.education.serializers import EDUCATION_LIST_ROWS, EducationDbListSerializer
+from apps.keywords.models import KeywordResource
+from apps.keywords.summary import rebuild_keyword_summaries, rebuild_sdg_targets
+
+CORPUS_SIZES = {'1k': 1000, '10k': 10000, '100k': 100000}
+
+VOCABULARY = (
+    'climate', 'water', 'energy', 'poverty', 'health', 'education', 'gender', 'ocean',
+    'forest', 'biodiversity', 'renewable', 'sanitation', 'hunger', 'agriculture', 'urban',
+    'transport', 'inequality', 'justice', 'partnership', 'innovation', 'industry', 'waste',
+    'recycling', 'emissions', 'carbon', 'drought', 'flood', 'literacy', 'employment',
+    'finance', 'community', 'youth', 'nutrition', 'solar', 'wind', 'soil', 'fisheries',
+)
+LOCATIONS = ('Australia', 'New Zealand', 'China', 'India', 'Kenya', 'Brazil', 'Germany', 'Canada', 'Global')
+ORGANIZATIONS = ('UNSW', 'UNESCO', 'WWF', 'UNDP', 'Red Cross', 'Local Council')
+DISCIPLINES = ('Engineering', 'Science', 'Business', 'Law', 'Medicine', 'Arts')
+INDUSTRIES = ('Energy', 'Agriculture', 'Finance', 'Healthcare', 'Construction', 'Education')
+
+BATCH_SIZE = 1000
+
+
+def phrase(rng, words):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def sdg_text(rng):
+    if rng.random() < 0.02:
+        return '18'
+    return ', '.join(str(sdg) for sdg in sorted(rng.sample(range(1, 18), rng.randint(1, 4))))
+
+
+def education_row(rng):
+    record = EducationDb(
+        title=phrase(rng, 4).title(),
+        description=phrase(rng, 40),
+        aims=phrase(rng, 15),
+        learning_outcome_expecting_outcome_field=phrase(rng, 15),
+        type_label=rng.choice(('Course', 'Workshop', 'Case study', 'Video')),
+        location=rng.choice(LOCATIONS),
+        organization=rng.choice(ORGANIZATIONS),
+        year=str(rng.randint(2010, 2025)),
+        sdgs_related=sdg_text(rng),
+        related_to_which_discipline=rng.choice(DISCIPLINES),
+        useful_for_which_industries=rng.choice(INDUSTRIES),
+        source='synthetic',
+        link='https://example.org/education',
+    )
+    record.refresh_derived_fields()
+    return record
+
+
+def action_row(rng):
+    record = ActionDb(
+        actions=phrase(rng, 5).capitalize(),
+        action_detail=phrase(rng, 40),
+        field_sdgs=sdg_text(rng),
+        level=str(rng.randint(1, 5)),
+        individual_organization=rng.randint(0, 2),
+        location_specific_actions_org_onlyonly_field=rng.choice(LOCATIONS),
+        related_industry_org_only_field=rng.choice(INDUSTRIES),
+        digital_actions=rng.randint(0, 1),
+        source_descriptions=phrase(rng, 10),
+        award=rng.randint(0, 1),
+        source_links='https://example.org/action',
+    )
+    record.refresh_derived_fields()
+    return record
+
+
+def keyword_rows(rng, keywords, rows):
+    """Resources spread over `keywords`, unique per (keyword, SDG, target) like the real table"""
+    offsets = [rng.randrange(17) for _ in keywords]
+    for i in range(rows):
+        k, j = i % len(keywords), i // len(keywords)
+        sdg_number = (offsets[k] + j) % 17 + 1
+        yield KeywordResource(
+            keyword=keywords[k],
+            sdg_number=sdg_number,
+            target_code=f'{sdg_number}.{j // 17 + 1}',
+            target_description=phrase(rng, 20),
+        )
+
+
+def bulk_insert(model, records):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def generate_corpus(rows, seed=0):
+    """Insert `rows` synthetic records into each of the three tables; the same seed gives the same catalog"""
+    rng = random.Random(seed)
+    # About five resources per keyword, like the real keyword_resources table
+    keywords = sorted({phrase(rng, rng.randint(1, 2)) for _ in range(max(rows // 5, 1))})
+
+    bulk_insert(EducationDb, (education_row(rng) for _ in range(rows)))
+    bulk_insert(ActionDb, (action_row(rng) for _ in range(rows)))
+    bulk_insert(KeywordResource, keyword_rows(rng, keywords, rows))
+    # bulk_create skips save(), which keeps the tag tables in sync
+    rebuild_tags(EducationDb, EducationTag, EducationDb.TAG_FIELDS)
+    rebuild_tags(ActionDb, ActionTag, ActionDb.TAG_FIELDS)
+    rebuild_keyword_summaries()
+    rebuild_sdg_targets()
+    bump_catalog_version()
+
+
+def query_mix(count, seed=0):
+    """
+    Sample `count` search terms, weighted by how often users searched them
+    (UserBehavior 'search' events), or from the synthetic vocabulary when
+    nothing was recorded.
+    """
+    rng = random.Random(seed)
+    terms = Counter()
+    for detail in UserBehavior.objects.filter(type='search').values_list('detail', flat=True).iterator():
+        query = (detail or {}).get('query', '').strip().lower()
+        if len(query) >= 2:
+            terms[query] += 1
+
+    if terms:
+        population, weights = zip(*terms.most_common(500))
+        return rng.choices(population, weights=weights, k=count), 'user_behavior'
+    return [phrase(rng, rng.choice((1, 1, 2, 3))) for _ in range(count)], 'synthetic'
+
+
+ENDPOINTS = {
+    'unified_search': ('/api/search/', lambda q: {'q': q}),
+    'keyword_search': ('/api/keywords/search/', lambda q: {'q': q}),
+    'keyword_list': ('/api/keywords/', lambda q: {'search': q}),
+    'education_list': ('/api/education/', lambda q: {'search': q}),
+    'action_list': ('/api/actions/', lambda q: {'search': q}),
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure(client, path, params):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = client.get(path, params)
+        duration = (time.perf_counter() - start) * 1000
+    return duration, len(queries), response.status_code
+
+
+def run_benchmark(queries, endpoints=None, warmup=3):
+    """Replay `queries` against each endpoint and summarize latency (ms) and DB queries per request"""
+    client = Client()
+    report = {}
+    for name in endpoints or ENDPOINTS:
+        path, params = ENDPOINTS[name]
+        for query in queries[:warmup]:
+            client.get(path, params(query))
+
+        durations, query_counts, errors = [], [], 0
+        for query in queries:
+            duration, query_count, status_code = measure(client, path, params(query))
+            durations.append(duration)
+            query_counts.append(query_count)
+            if status_code >= 400:
+                errors += 1
+
+        report[name] = {
+            'requests': len(durations),
+            'errors': errors,
+            'p50_ms': round(percentile(durations, 50), 2),
+            'p95_ms': round(percentile(durations, 95), 2),
+            'p99_ms': round(percentile(durations, 99), 2),
+            'mean_ms': round(sum(durations) / len(durations), 2),
+            'queries_per_request': round(sum(query_counts) / len(query_counts), 2),
+        }
+    return report
+
+
+SERIALIZERS = {
+    'education_list': (EducationDb, EducationDbListSerializer, EDUCATION_LIST_ROWS),
+    'action_list': (ActionDb, ActionDbListSerializer, ACTION_LIST_ROWS),
+}
+
+
+def run_serialization_benchmark(rows=1000, repeat=5):
+    """
+    Rows per second for fetching and rendering `rows` list rows, through the
+    ModelSerializer list serializer and JSONRenderer ("before") and through
+    values() rows and FastJSONRenderer ("after"); best of `repeat` runs each.
+    Also checks both paths render the same bytes.
+    """
+    report = {}
+    for name, (model, serializer_class, spec) in SERIALIZERS.items():
+        queryset = model.objects.order_by('id')[:rows]
+        build = spec.row_builder()
+
+        def before():
+            return JSONRenderer().render(serializer_class(list(queryset), many=True).data)
+
+        def after():
+            return FastJSONRenderer().render([build(row) for row in spec.select(queryset, list(spec.fields))])
+
+        timings = {}
+        for label, render in (('before', before), ('after', after)):
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                render()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[label] = best
+
+        count = queryset.count()
+        report[name] = {
+            'rows': count,
+            'before_rows_per_sec': round(count / timings['before']) if timings['before'] else None,
+            'after_rows_per_sec': round(count / timings['after']) if timings['after'] else None,
+            'speedup': round(timings['before'] / timings['after'], 2) if timings['after'] else None,
+            'identical': before() == after(),
+        }
+    return report
@@ -0,0 +1,55 @@
+"""
+Cross-source bulk detail fetch behind /api/search/bulk/.
+
+Search results mix education, action and keyword rows, identified by
+(source, id). `?items=education:3,keywords:7,actions:1` returns their
+detail payloads in that order, with one id__in query per source instead of
+one detail request per result.
+"""
+from apps.actions.models import ActionDb
+from apps.actions.serializers import ActionDbSerializer
+from apps.catalog.bulk import InvalidBulkRequest, check_batch_size, fetch_in_order
+from apps.education.models import EducationDb
+from apps.education.serializers import EducationDbSerializer
+from apps.keywords.models import KeywordResource
+from apps.keywords.serializers import KeywordResourceSerializer
+
+# Source name (as in search results) -> (detail queryset, detail serializer)
+BULK_SOURCES = {
+    'education': (lambda: EducationDb.objects.all(), EducationDbSerializer),
+    'actions': (lambda: ActionDb.objects.all(), ActionDbSerializer),
+    'keywords': (lambda: KeywordResource.objects.select_related('reference1', 'reference2'), KeywordResourceSerializer),
+}
+
+
+def parse_items(params):
+    """Distinct (source, id) pairs from ?items=education:3,actions:1 in request order"""
+    items = []
+    for value in params.getlist('items'):
+        for part in value.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            source, _, pk = part.partition(':')
+            if source not in BULK_SOURCES or not pk.isdigit():
+                raise InvalidBulkRequest(f'Invalid item: {part}')
+            items.append((source, int(pk)))
+    items = list(dict.fromkeys(items))
+    check_batch_size(len(items))
+    return items
+
+
+def fetch_items(request, items):
+    """({'source', 'id', 'data'} results in the order of `items`, missing {'source', 'id'} items)"""
+    data = {}
+    for source, (queryset, serializer_class) in BULK_SOURCES.items():
+        ids = [pk for item_source, pk in items if item_source == source]
+        if not ids:
+            continue
+        records, _ = fetch_in_order(queryset(), ids)
+        serialized = serializer_class(records, many=True, context={'request': request}).data
+        data.update(((source, record.pk), row) for record, row in zip(records, serialized))
+
+    results = [{'source': source, 'id': pk, 'data': data[source, pk]} for source, pk in items if (source, pk) in data]
+    missing = [{'source': source, 'id': pk} for source, pk in items if (source, pk) not in data]
+    return results, missing
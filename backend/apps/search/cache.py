@@ -0,0 +1,81 @@
+"""
+Result cache for unified_search.
+
+Entries are keyed by the catalog version, so a bump after an import, delete
+or form approval makes every older entry unreachable; the TTL only bounds
+how long unreachable entries linger.
+"""
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.catalog.version import get_catalog_version
+
+logger = logging.getLogger(__name__)
+
+HITS_KEY = 'search:cache:hits'
+MISSES_KEY = 'search:cache:misses'
+
+
+def search_cache_key(params):
+    """Build the cache key for already-normalized search parameters, or None if caching is unavailable"""
+    version = get_catalog_version()
+    if version is None or not getattr(settings, 'SEARCH_CACHE_TTL', 0):
+        return None
+
+    params = dict(params, engine=getattr(settings, 'SEARCH_ENGINE', 'sql'))
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+    return f'search:results:v{version}:{digest}'
+
+
+def increment_counter(key, delta=1):
+    """Add `delta` to a persistent counter, creating it on first use"""
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+def get_cached_search(key):
+    """Return the cached response payload for `key` and record a hit or miss"""
+    if key is None:
+        return None
+    try:
+        payload = cache.get(key)
+        increment_counter(HITS_KEY if payload is not None else MISSES_KEY)
+        return payload
+    except Exception as e:
+        logger.warning(f"Search cache read failed: {e}")
+        return None
+
+
+def set_cached_search(key, payload):
+    if key is None:
+        return
+    try:
+        cache.set(key, payload, timeout=settings.SEARCH_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Search cache write failed: {e}")
+
+
+def get_cache_stats():
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    lookups = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+        'ttl': getattr(settings, 'SEARCH_CACHE_TTL', 0),
+        'catalog_version': get_catalog_version(),
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
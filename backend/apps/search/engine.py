@@ -0,0 +1,442 @@
+"""
+In-memory BM25 search engine for unified_search.
+
+The index is built from education_db, action_db and keyword_resources and
+returns rows in the same shape as the SQL UNION query in views.py, so both
+backends share the same post-processing and response format.
+"""
+import bisect
+import logging
+import math
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from apps.catalog.sdg import sdg_mask, sdgs_to_mask
+from apps.catalog.version import CatalogBoundResource
+from apps.actions.models import ActionDb
+from apps.education.models import EducationDb
+from apps.keywords.models import KeywordSummary
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+')
+
+# BM25 parameters - title terms count double towards term frequency
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+# Columns returned for every row, in the same order as the SQL query
+ROW_FIELDS = ('id', 'title', 'description', 'organization', 'year', 'link', 'sdgs', 'location', 'source')
+
+# Scoring rules per source, mirroring the CASE expressions of the SQL branches
+SOURCE_CONFIG = {
+    'education': {
+        'fulltext_weight': 8,
+        'index_description': True,
+        'prefix_bonus': 50,
+        'description_bonus': 15,
+        'density_bonus': 5,
+    },
+    'actions': {
+        'fulltext_weight': 8,
+        'index_description': True,
+        'prefix_bonus': 50,
+        'description_bonus': 15,
+        'density_bonus': 5,
+        'award_bonus': 8,
+    },
+    'keywords': {
+        'fulltext_weight': 10,
+        'index_description': False,
+        'prefix_bonus': 60,
+        'description_bonus': 0,
+        'density_bonus': 0,
+    },
+}
+
+SOURCES = ('education', 'actions', 'keywords')
+
+
+def tokenize(text):
+    """Split text into lower-cased word tokens"""
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def parse_boolean_query(boolean_query):
+    """
+    Split a MySQL boolean-mode query built by build_flexible_search_queries
+    into (required, optional) lists of prefix tokens.
+    """
+    required = []
+    optional = []
+    for term in boolean_query.split():
+        target = required if term.startswith('+') else optional
+        target.extend(tokenize(term))
+    return required, optional
+
+
+class SubstringIndex:
+    """
+    Finds documents whose text contains a substring.
+
+    All values are joined into a single string so a lookup is one C-level
+    str.find scan instead of a Python loop over every document.
+    """
+    SEPARATOR = '\x00'
+
+    def __init__(self, values):
+        self.offsets = []
+        parts = []
+        position = 0
+        for value in values:
+            value = value or ''
+            self.offsets.append(position)
+            parts.append(value)
+            position += len(value) + 1
+        self.text = self.SEPARATOR.join(parts)
+
+    def find(self, needle):
+        """Return the set of document positions whose value contains needle"""
+        matches = set()
+        if not needle or self.SEPARATOR in needle:
+            return matches
+
+        start = self.text.find(needle)
+        while start != -1:
+            doc = bisect.bisect_right(self.offsets, start) - 1
+            matches.add(doc)
+            if doc + 1 >= len(self.offsets):
+                break
+            start = self.text.find(needle, self.offsets[doc + 1])
+        return matches
+
+
+class SourceIndex:
+    """Inverted index and scoring for the rows of a single source table"""
+
+    def __init__(self, source, rows):
+        rows = list(rows)
+        self.source = source
+        self.config = SOURCE_CONFIG[source]
+        self.rows = [{field: row.get(field) for field in ROW_FIELDS} for row in rows]
+        for row in self.rows:
+            row['source'] = source
+
+        self.titles = [row['title'].lower() if row['title'] is not None else None for row in self.rows]
+        self.descriptions = [
+            row['description'].lower() if row['description'] is not None else None
+            for row in self.rows
+        ]
+        self.locations = [row['location'].lower() if row['location'] is not None else None for row in self.rows]
+        self.sdg_masks = [sdg_mask(row['sdgs']) for row in self.rows]
+        self.awards = [(row.get('award') or 0) > 0 for row in rows]
+
+        self.title_text = SubstringIndex(self.titles)
+        self.description_text = SubstringIndex(self.descriptions)
+
+        self._build_postings()
+
+    def _build_postings(self):
+        postings = {}
+        lengths = []
+        for doc, row in enumerate(self.rows):
+            counts = Counter()
+            for token in tokenize(row['title']):
+                counts[token] += TITLE_WEIGHT
+            if self.config['index_description']:
+                counts.update(tokenize(row['description']))
+
+            lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((doc, tf))
+
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+        self.lengths = lengths
+        self.average_length = (sum(lengths) / len(lengths)) if lengths else 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _expand_prefix(self, prefix):
+        """Return all indexed words starting with prefix (MySQL `term*`)"""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        end = bisect.bisect_left(self.vocabulary, prefix + '\uffff')
+        return self.vocabulary[start:end]
+
+    def _term_scores(self, prefix):
+        """BM25 score per document for one prefix term, keeping the best expansion"""
+        total_docs = len(self.rows)
+        scores = {}
+        for word in self._expand_prefix(prefix):
+            postings = self.postings[word]
+            idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc] / (self.average_length or 1))
+                score = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                if score > scores.get(doc, 0):
+                    scores[doc] = score
+        return scores
+
+    def fulltext_scores(self, required, optional):
+        """Equivalent of MATCH ... AGAINST in boolean mode"""
+        if not required and not optional:
+            return {}
+
+        scores = None
+        for prefix in required:
+            term_scores = self._term_scores(prefix)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+            if not scores:
+                return {}
+
+        if scores is None:
+            scores = {}
+            for prefix in optional:
+                for doc, score in self._term_scores(prefix).items():
+                    scores[doc] = scores.get(doc, 0) + score
+        else:
+            for prefix in optional:
+                for doc, score in self._term_scores(prefix).items():
+                    if doc in scores:
+                        scores[doc] += score
+        return scores
+
+    def relevance(self, doc, query, fulltext_score):
+        """Relevance of a matched document, following the SQL CASE expressions"""
+        config = self.config
+        title = self.titles[doc]
+        description = self.descriptions[doc]
+
+        score = fulltext_score * config['fulltext_weight']
+        if title is not None:
+            if title == query:
+                score += 100
+            if title.startswith(query):
+                score += config['prefix_bonus']
+            if query and config['density_bonus']:
+                score += title.count(query) * config['density_bonus']
+        if description is not None and config['description_bonus'] and query in description:
+            score += config['description_bonus']
+        if config.get('award_bonus') and self.awards[doc]:
+            score += config['award_bonus']
+        return score
+
+    def search(self, query, required, optional):
+        """Return {doc: relevance} for every document matching the query"""
+        if not query:
+            return {doc: self.relevance(doc, query, 0) for doc in range(len(self.rows))}
+
+        fulltext = self.fulltext_scores(required, optional)
+        matched = set(fulltext)
+        matched |= self.title_text.find(query)
+        if self.config['index_description']:
+            matched |= self.description_text.find(query)
+
+        return {doc: self.relevance(doc, query, fulltext.get(doc, 0)) for doc in matched}
+
+    def passes_filters(self, doc, location, required_sdgs=0, sdg_mode='all'):
+        if location:
+            value = self.locations[doc]
+            if value is None or location not in value:
+                return False
+        if required_sdgs:
+            matched = self.sdg_masks[doc] & required_sdgs
+            if matched != required_sdgs and not (sdg_mode == 'any' and matched):
+                return False
+        return True
+
+
+def sql_title_order_key(title):
+    """Python equivalent of COALESCE(LOWER(TRIM(title)), '')"""
+    return title.strip(' ').lower() if title is not None else ''
+
+
+def _sdg_count_key(row):
+    sdgs = row['sdgs']
+    if sdgs is None:
+        return -1
+    if sdgs.strip() == '18':
+        return 17
+    return sdgs.count(',') + 1
+
+
+def result_sort_key(sort, row, relevance):
+    """Total ordering used for sorting and keyset pagination"""
+    tiebreak = (sql_title_order_key(row['title']), row['source'], row['id'])
+    if sort == 'title':
+        return tiebreak
+    if sort == 'sdg_count':
+        return (-_sdg_count_key(row),) + tiebreak
+    return (-relevance,) + tiebreak
+
+
+def _cursor_key(sort, after):
+    tiebreak = (after['title'], after['source'], after['id'])
+    if sort == 'title':
+        return tiebreak
+    return (-after['relevance'],) + tiebreak
+
+
+class SearchEngine:
+    """In-memory replacement for the unified_search UNION query"""
+
+    def __init__(self, education=(), actions=(), keywords=()):
+        self.indexes = {
+            'education': SourceIndex('education', education),
+            'actions': SourceIndex('actions', actions),
+            'keywords': SourceIndex('keywords', keywords),
+        }
+
+    @classmethod
+    def build(cls):
+        started = time.monotonic()
+        engine = cls(
+            education=load_education_rows(),
+            actions=load_action_rows(),
+            keywords=load_keyword_rows(),
+        )
+        logger.info(
+            "Search index built in %.2fs (%s)",
+            time.monotonic() - started,
+            ', '.join(f'{name}={len(index)}' for name, index in engine.indexes.items()),
+        )
+        return engine
+
+    def search(self, query, boolean_query='', location='', sdg_list=None, sdg_mode='all', source='',
+               sort='relevance', offset=0, limit=None, after=None):
+        """
+        Run a search and return (rows, total).
+
+        Arguments follow the unified_search request parameters; rows carry a
+        `relevance` key exactly like the SQL query results. `after` is a
+        decoded keyset cursor; when given, only rows sorting after it are
+        returned and `offset` is ignored. `total` always counts every match.
+        """
+        required, optional = parse_boolean_query(boolean_query)
+        required_sdgs = 0
+        if sdg_list and '18' not in sdg_list:
+            required_sdgs = sdgs_to_mask(sdg_list)
+
+        matches = []
+        for name in SOURCES:
+            if source and source != name:
+                continue
+            index = self.indexes[name]
+            for doc, relevance in index.search(query, required, optional).items():
+                if index.passes_filters(doc, location, required_sdgs, sdg_mode):
+                    matches.append((index.rows[doc], relevance))
+
+        keyed = sorted(
+            ((result_sort_key(sort, row, relevance), row, relevance) for row, relevance in matches),
+            key=lambda match: match[0],
+        )
+
+        total = len(keyed)
+        if after is not None:
+            offset = bisect.bisect_right([match[0] for match in keyed], _cursor_key(sort, after))
+        end = None if limit is None else offset + limit
+        results = []
+        for _, row, relevance in keyed[offset:end]:
+            result = dict(row)
+            result['relevance'] = relevance
+            results.append(result)
+        return results, total
+
+    def facet_groups(self, query, boolean_query=''):
+        """Return (source, location, sdg_mask, count) groups for every row matching the query"""
+        required, optional = parse_boolean_query(boolean_query)
+        groups = Counter()
+        for name in SOURCES:
+            index = self.indexes[name]
+            for doc in index.search(query, required, optional):
+                groups[(name, index.rows[doc]['location'], index.sdg_masks[doc])] += 1
+        return [key + (count,) for key, count in groups.items()]
+
+
+def load_education_rows():
+    return [
+        {
+            'id': item['id'],
+            'title': item['title'],
+            'description': item['descriptions'],
+            'organization': item['organization'],
+            'year': item['year'],
+            'link': item['link'],
+            'sdgs': item['sdgs_related'],
+            'location': item['location'],
+        }
+        for item in EducationDb.objects.order_by('id').values(
+            'id', 'title', 'descriptions', 'organization', 'year', 'link', 'sdgs_related', 'location'
+        )
+    ]
+
+
+def load_action_rows():
+    organization_labels = {0: 'individual', 1: 'organization'}
+    return [
+        {
+            'id': item['id'],
+            'title': item['actions'],
+            'description': item['action_detail'],
+            'organization': organization_labels.get(item['individual_organization'], ''),
+            'year': '',
+            'link': item['source_links'],
+            'sdgs': item['field_sdgs'],
+            'location': item['location_specific_actions_org_onlyonly_field'],
+            'award': item['award'],
+        }
+        for item in ActionDb.objects.order_by('id').values(
+            'id', 'actions', 'action_detail', 'individual_organization', 'source_links',
+            'field_sdgs', 'location_specific_actions_org_onlyonly_field', 'award'
+        )
+    ]
+
+
+def load_keyword_rows():
+    """One row per keyword, read from the precomputed keyword_summary table"""
+    return [
+        {
+            'id': item['first_resource_id'],
+            'title': item['keyword'],
+            'description': item['reference_ids'],
+            'organization': item['target_codes'],
+            'year': '',
+            'link': '',
+            'sdgs': item['sdgs'],
+            'location': '',
+        }
+        for item in KeywordSummary.objects.order_by('first_resource_id').values(
+            'first_resource_id', 'keyword', 'reference_ids', 'target_codes', 'sdgs'
+        )
+    ]
+
+
+_search_engine = CatalogBoundResource(SearchEngine.build, max_age_setting='SEARCH_ENGINE_REFRESH_SECONDS')
+
+
+def search_engine_enabled():
+    return getattr(settings, 'SEARCH_ENGINE', 'sql') == 'memory'
+
+
+def get_search_engine():
+    """
+    Return the process-wide search engine. It is built on first use and
+    rebuilt when the catalog version changes, or at the latest after
+    SEARCH_ENGINE_REFRESH_SECONDS.
+    """
+    return _search_engine.get()
+
+
+def reset_search_engine():
+    """Drop the cached index so the next search rebuilds it"""
+    _search_engine.reset()
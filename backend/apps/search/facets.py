@@ -0,0 +1,63 @@
+"""
+Facet counts for unified search.
+
+Both search backends reduce the rows matching the text query to
+(source, location, sdg_mask, count) groups; the counts are then computed in
+a single pass over those groups. Each facet applies every active filter
+except its own, so the UI can show how many results picking another value
+would give.
+"""
+from apps.catalog.sdg import SDG_COUNT
+
+from .engine import SOURCES
+
+LOCATION_FACET_LIMIT = 20
+
+
+def count_facets(groups, location='', required_sdgs=0, sdg_mode='all', source=''):
+    """
+    Count matches per SDG, source and location.
+
+    `location` is a lower-cased substring and `required_sdgs` a bitmask, as
+    in the unified_search filters.
+    """
+    sdg_counts = [0] * (SDG_COUNT + 1)
+    source_counts = dict.fromkeys(SOURCES, 0)
+    location_counts = {}
+    location_labels = {}
+    total = 0
+
+    for group_source, group_location, mask, count in groups:
+        mask = int(mask or 0)
+        label = (group_location or '').strip()
+        key = label.lower()
+
+        source_ok = not source or group_source == source
+        location_ok = not location or location in key
+        if required_sdgs:
+            matched = mask & required_sdgs
+            sdg_ok = matched == required_sdgs or (sdg_mode == 'any' and matched != 0)
+        else:
+            sdg_ok = True
+
+        if source_ok and location_ok and sdg_ok:
+            total += count
+        if location_ok and sdg_ok and group_source in source_counts:
+            source_counts[group_source] += count
+        if source_ok and sdg_ok and key:
+            location_counts[key] = location_counts.get(key, 0) + count
+            location_labels.setdefault(key, label)
+        if source_ok and location_ok:
+            for sdg_num in range(1, SDG_COUNT + 1):
+                if mask & (1 << (sdg_num - 1)):
+                    sdg_counts[sdg_num] += count
+
+    top_locations = sorted(location_counts.items(), key=lambda item: (-item[1], item[0]))[:LOCATION_FACET_LIMIT]
+    return {
+        'total': total,
+        'facets': {
+            'sdg': {str(sdg_num): sdg_counts[sdg_num] for sdg_num in range(1, SDG_COUNT + 1)},
+            'source': source_counts,
+            'location': [{'value': location_labels[key], 'count': count} for key, count in top_locations],
+        },
+    }
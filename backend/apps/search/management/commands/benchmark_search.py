@@ -0,0 +1,93 @@
+import json
+import platform
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.actions.models import ActionDb
+from apps.education.models import EducationDb
+from apps.keywords.models import KeywordResource
+from apps.search.benchmark import (
+    CORPUS_SIZES, ENDPOINTS, generate_corpus, query_mix, run_benchmark, run_serialization_benchmark,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark unified_search, keyword_search and the list views. '
+        'Use --settings=sdg_backend.settings_benchmark for SQLite or point the normal settings at a local MySQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--generate', choices=sorted(CORPUS_SIZES),
+                            help='Fill an empty catalog with a synthetic corpus of this many rows per table')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the corpus and the query mix')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--endpoint', action='append', choices=sorted(ENDPOINTS),
+                            help='Endpoint to run; repeat for several (default: all)')
+        parser.add_argument('--with-cache', action='store_true',
+                            help='Keep the unified_search result cache enabled')
+        parser.add_argument('--serialization-rows', type=int, default=0,
+                            help='Also compare list serialization paths (rows/sec) over this many rows per table')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            self.prepare_sqlite()
+
+        if options['generate']:
+            if EducationDb.objects.exists() or ActionDb.objects.exists() or KeywordResource.objects.exists():
+                raise CommandError('--generate needs an empty catalog; use a separate benchmark database')
+            rows = CORPUS_SIZES[options['generate']]
+            self.stderr.write(f'Generating {rows} rows per table...')
+            generate_corpus(rows, seed=options['seed'])
+
+        queries, query_source = query_mix(options['requests'], seed=options['seed'])
+        overrides = {'ALLOWED_HOSTS': ['*']}
+        if not options['with_cache']:
+            overrides['SEARCH_CACHE_TTL'] = 0
+        if connection.vendor != 'mysql':
+            # The unified_search SQL relies on MySQL FULLTEXT
+            overrides['SEARCH_ENGINE'] = 'memory'
+
+        with override_settings(**overrides):
+            endpoints = run_benchmark(queries, options['endpoint'])
+
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'database': connection.vendor,
+                'search_engine': overrides.get('SEARCH_ENGINE', getattr(settings, 'SEARCH_ENGINE', 'sql')),
+                'result_cache': options['with_cache'],
+                'python': platform.python_version(),
+                'seed': options['seed'],
+                'query_source': query_source,
+                'rows': {
+                    'education_db': EducationDb.objects.count(),
+                    'action_db': ActionDb.objects.count(),
+                    'keyword_resources': KeywordResource.objects.count(),
+                },
+            },
+            'endpoints': endpoints,
+        }
+        if options['serialization_rows']:
+            report['serialization'] = run_serialization_benchmark(options['serialization_rows'])
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def prepare_sqlite(self):
+        """Create the schema; keyword_resources is unmanaged and not created by migrate"""
+        call_command('migrate', run_syncdb=True, verbosity=0)
+        if KeywordResource._meta.db_table not in connection.introspection.table_names():
+            with connection.schema_editor() as editor:
+                editor.create_model(KeywordResource)
@@ -0,0 +1,304 @@
+"""
+Semantic search mode for unified_search.
+
+Education, action and keyword rows are embedded with latent semantic
+analysis: TF-IDF vectors reduced by a truncated (randomized) SVD, so words
+that occur in similar documents, such as "renewables" and "solar", end up
+close together. A query is folded into the same space and answered with a
+cosine top-K over the document matrix. Everything runs in-process on NumPy.
+
+When the catalog changes, unchanged documents keep their vectors and
+changed ones are folded into the existing term basis; the SVD is refitted
+once more than SEARCH_SEMANTIC_REFIT_RATIO of the documents were folded in.
+"""
+import hashlib
+import logging
+import math
+import os
+import time
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+
+from apps.catalog.sdg import sdg_mask
+from apps.catalog.version import CatalogBoundResource
+
+from .engine import (
+    ROW_FIELDS, SOURCES, TITLE_WEIGHT, load_action_rows, load_education_rows, load_keyword_rows, tokenize,
+)
+
+logger = logging.getLogger(__name__)
+
+# Terms in more than this share of the documents carry no topic information
+MAX_DOCUMENT_FREQUENCY = 0.5
+MAX_TERMS = 50000
+OVERSAMPLING = 10
+POWER_ITERATIONS = 4
+# Rows per block when multiplying, bounds the temporary nnz x k buffer
+CHUNK_ROWS = 2048
+
+
+class SparseRows:
+    """Minimal CSR matrix with the two products a randomized SVD needs"""
+
+    def __init__(self, indptr, indices, data, n_cols):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_cols = n_cols
+
+    @classmethod
+    def from_rows(cls, rows, n_cols):
+        """Build from a list of (column indices, values) pairs"""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(indices) for indices, _ in rows], out=indptr[1:])
+        if indptr[-1]:
+            indices = np.concatenate([indices for indices, _ in rows])
+            data = np.concatenate([values for _, values in rows])
+        else:
+            indices = np.zeros(0, dtype=np.int64)
+            data = np.zeros(0, dtype=np.float32)
+        return cls(indptr, indices.astype(np.int64), data.astype(np.float32), n_cols)
+
+    @property
+    def shape(self):
+        return len(self.indptr) - 1, self.n_cols
+
+    def dot(self, dense):
+        """self @ dense"""
+        n_rows = self.shape[0]
+        result = np.zeros((n_rows, dense.shape[1]), dtype=np.float32)
+        for start in range(0, n_rows, CHUNK_ROWS):
+            end = min(start + CHUNK_ROWS, n_rows)
+            low, high = self.indptr[start], self.indptr[end]
+            if low == high:
+                continue
+            products = self.data[low:high, None] * dense[self.indices[low:high]]
+            nonempty = np.flatnonzero(np.diff(self.indptr[start:end + 1]))
+            result[start + nonempty] = np.add.reduceat(products, self.indptr[start + nonempty] - low, axis=0)
+        return result
+
+    def transpose(self):
+        n_rows = self.shape[0]
+        row_ids = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(self.n_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=self.n_cols), out=indptr[1:])
+        return SparseRows(indptr, row_ids[order], self.data[order], n_rows)
+
+
+def term_basis(matrix, dimensions, seed=0):
+    """Top right singular vectors of `matrix` as a (terms x k) array, by randomized SVD"""
+    n_docs, n_terms = matrix.shape
+    k = min(dimensions, n_docs, n_terms)
+    if k == 0:
+        return np.zeros((n_terms, 1), dtype=np.float32)
+
+    transposed = matrix.transpose()
+    rng = np.random.default_rng(seed)
+    width = min(k + OVERSAMPLING, n_docs, n_terms)
+    sample = matrix.dot(rng.standard_normal((n_terms, width)).astype(np.float32))
+    for _ in range(POWER_ITERATIONS):
+        sample, _ = np.linalg.qr(sample)
+        sample = matrix.dot(transposed.dot(sample))
+    q, _ = np.linalg.qr(sample)
+    _, _, vt = np.linalg.svd(transposed.dot(q).T, full_matrices=False)
+    return np.ascontiguousarray(vt[:k].T, dtype=np.float32)
+
+
+def normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (vectors / norms).astype(np.float32)
+
+
+def document_tokens(row):
+    tokens = tokenize(row['title']) * TITLE_WEIGHT
+    if row['source'] != 'keywords':  # keyword rows carry reference ids as description
+        tokens += tokenize(row['description'])
+    return tokens
+
+
+def fingerprint(row):
+    text = f"{row['title'] or ''}\x00{row['description'] or ''}"
+    return hashlib.md5(text.encode('utf-8')).digest()
+
+
+def load_rows():
+    rows = []
+    for source, loader in zip(SOURCES, (load_education_rows, load_action_rows, load_keyword_rows)):
+        for row in loader():
+            row['source'] = source
+            rows.append({field: row.get(field) for field in ROW_FIELDS})
+    return rows
+
+
+class SemanticIndex:
+    def __init__(self, rows, vocabulary, idf, basis, vectors, fingerprints, folded=0):
+        self.rows = rows
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.basis = basis
+        self.vectors = vectors
+        self.fingerprints = fingerprints
+        self.folded = folded
+
+        source_codes = {source: code for code, source in enumerate(SOURCES)}
+        self.source_codes = np.array([source_codes[row['source']] for row in rows], dtype=np.int8)
+        self.sdg_masks = np.array([sdg_mask(row['sdgs']) for row in rows], dtype=np.int64)
+        self.locations = [(row['location'] or '').lower() for row in rows]
+
+    @classmethod
+    def fit(cls, rows, dimensions):
+        tokens = [document_tokens(row) for row in rows]
+        document_frequency = Counter()
+        for doc_tokens in tokens:
+            document_frequency.update(set(doc_tokens))
+
+        n_docs = len(rows)
+        max_frequency = max(MAX_DOCUMENT_FREQUENCY * n_docs, 2)
+        terms = [
+            term for term, frequency in document_frequency.most_common()
+            if (frequency >= 2 or n_docs < 10) and frequency <= max_frequency
+        ][:MAX_TERMS]
+        vocabulary = {term: position for position, term in enumerate(sorted(terms))}
+        idf = np.zeros(len(vocabulary), dtype=np.float32)
+        for term, position in vocabulary.items():
+            idf[position] = math.log((1 + n_docs) / (1 + document_frequency[term])) + 1
+
+        matrix = SparseRows.from_rows([tfidf(doc_tokens, vocabulary, idf) for doc_tokens in tokens], len(vocabulary))
+        basis = term_basis(matrix, dimensions)
+        vectors = normalize(matrix.dot(basis))
+        return cls(rows, vocabulary, idf, basis, vectors, [fingerprint(row) for row in rows])
+
+    def embed(self, token_lists):
+        """Fold token lists into the semantic space as unit vectors"""
+        matrix = SparseRows.from_rows(
+            [tfidf(tokens, self.vocabulary, self.idf) for tokens in token_lists], len(self.vocabulary)
+        )
+        return normalize(matrix.dot(self.basis))
+
+    def refresh(self, rows, dimensions, refit_ratio):
+        """Index for the new rows, reusing the vectors of documents whose text did not change"""
+        previous = {(row['source'], row['id']): position for position, row in enumerate(self.rows)}
+        fingerprints = [fingerprint(row) for row in rows]
+        vectors = np.zeros((len(rows), self.vectors.shape[1]), dtype=np.float32)
+        changed = []
+        for position, row in enumerate(rows):
+            old = previous.get((row['source'], row['id']))
+            if old is not None and self.fingerprints[old] == fingerprints[position]:
+                vectors[position] = self.vectors[old]
+            else:
+                changed.append(position)
+
+        folded = self.folded + len(changed)
+        if folded > refit_ratio * max(len(rows), 1):
+            return SemanticIndex.fit(rows, dimensions)
+        if changed:
+            vectors[changed] = self.embed([document_tokens(rows[position]) for position in changed])
+        return SemanticIndex(rows, self.vocabulary, self.idf, self.basis, vectors, fingerprints, folded)
+
+    def scores(self, queries):
+        """Cosine similarity of every document to each query, as a (documents x queries) array"""
+        return self.vectors @ self.embed([tokenize(query) for query in queries]).T
+
+    def search(self, query, location='', required_sdgs=0, sdg_mode='all', source='', limit=None, min_score=0.0):
+        """Return ([(row, score)] best first, number of documents above min_score) for the filters"""
+        if not query or not len(self.rows):
+            return [], 0
+
+        scores = self.scores([query])[:, 0]
+        keep = scores > min_score
+        if source:
+            keep &= self.source_codes == SOURCES.index(source)
+        if required_sdgs:
+            matched = self.sdg_masks & required_sdgs
+            keep &= (matched != 0) if sdg_mode == 'any' else (matched == required_sdgs)
+        candidates = np.flatnonzero(keep)
+        if location:
+            candidates = np.array(
+                [doc for doc in candidates if location in self.locations[doc]], dtype=np.int64
+            )
+
+        total = len(candidates)
+        if limit is not None and total > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.rows[doc], float(scores[doc])) for doc in candidates], total
+
+    def store(self, directory):
+        """Move the document vectors to a memory-mapped file so they live in the page cache"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'semantic-{os.getpid()}.npy')
+        temporary = f'{path}.tmp'
+        with open(temporary, 'wb') as f:
+            np.save(f, self.vectors)
+        # Replacing the file keeps the previous mapping valid for threads still using it
+        os.replace(temporary, path)
+        self.vectors = np.load(path, mmap_mode='r')
+
+
+def tfidf(tokens, vocabulary, idf):
+    """Sublinear TF-IDF weights of the in-vocabulary tokens as (indices, values), L2-normalized"""
+    counts = Counter(vocabulary[token] for token in tokens if token in vocabulary)
+    if not counts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    values = (1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))) * idf[indices]
+    return indices, (values / np.linalg.norm(values)).astype(np.float32)
+
+
+def build_semantic_index(previous=None):
+    started = time.monotonic()
+    rows = load_rows()
+    dimensions = getattr(settings, 'SEARCH_SEMANTIC_DIMENSIONS', 128)
+    if previous is None:
+        index = SemanticIndex.fit(rows, dimensions)
+    else:
+        index = previous.refresh(rows, dimensions, getattr(settings, 'SEARCH_SEMANTIC_REFIT_RATIO', 0.2))
+
+    directory = getattr(settings, 'SEARCH_SEMANTIC_DIR', None)
+    if directory:
+        index.store(directory)
+    logger.info(
+        f"Semantic index built in {time.monotonic() - started:.2f}s "
+        f"({len(rows)} documents, {len(index.vocabulary)} terms, {index.folded} folded in)"
+    )
+    return index
+
+
+_semantic_index = CatalogBoundResource(build_semantic_index, incremental=True)
+
+
+def semantic_search_enabled():
+    return getattr(settings, 'SEARCH_SEMANTIC', False)
+
+
+def get_semantic_index():
+    return _semantic_index.get()
+
+
+def reset_semantic_index():
+    _semantic_index.reset()
+
+
+def blend_results(lexical_rows, semantic_matches, weight):
+    """
+    Merge lexical rows (with `relevance`) and semantic (row, score) matches.
+    Lexical relevance is scaled to [0, 1] by the best lexical score; the
+    blended relevance is (1 - weight) * lexical + weight * cosine, times 100.
+    """
+    best = max((float(row.get('relevance') or 0) for row in lexical_rows), default=0) or 1
+    blended = {}
+    for row in lexical_rows:
+        blended[(row['source'], row['id'])] = [row, (1 - weight) * max(float(row.get('relevance') or 0), 0) / best]
+    for row, score in semantic_matches:
+        entry = blended.setdefault((row['source'], row['id']), [dict(row), 0.0])
+        entry[1] += weight * score
+
+    results = []
+    for row, score in sorted(blended.values(), key=lambda entry: -entry[1]):
+        row['relevance'] = round(score * 100, 4)
+        results.append(row)
+    return results
@@ -0,0 +1,150 @@
+"""
+Spelling correction for unified_search queries.
+
+A symmetric-delete (SymSpell) dictionary is built from the words of the
+columns unified_search matches against. The searches match a term anywhere
+inside a word (LIKE '%term%', SubstringIndex.find), so only a term that
+occurs in no catalog word is certain to find nothing. Such a term is
+replaced by the most frequent catalog word within
+SEARCH_SPELLING_MAX_DISTANCE edits before the query reaches the database;
+every other term is left alone.
+"""
+import logging
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from apps.actions.models import ActionDb
+from apps.catalog.version import CatalogBoundResource
+from apps.education.models import EducationDb
+from apps.keywords.models import KeywordSummary
+
+from .engine import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Shorter terms have too many close neighbours to be corrected reliably
+MIN_WORD_LENGTH = 4
+# Deletes are generated from this many leading characters only, which bounds the dictionary size
+PREFIX_LENGTH = 7
+
+
+def edit_distance(a, b, max_distance):
+    """Optimal string alignment distance, or max_distance + 1 as soon as it is exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before_previous[j - 2] + 1)
+            current[j] = value
+        if min(current) > max_distance:
+            return max_distance + 1
+        before_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+
+def deletes(word, max_distance):
+    """The word and every string obtained by deleting up to max_distance characters"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def correctable(term):
+    return len(term) >= MIN_WORD_LENGTH and term.isalpha()
+
+
+class SpellingIndex:
+    def __init__(self, word_counts, max_distance=2):
+        self.max_distance = max_distance
+        self.counts = dict(word_counts)
+        self.words = sorted(self.counts)
+        # One string for substring tests; terms are letters only, so they can't span the separator
+        self.text = '\n'.join(self.words)
+        self.candidates = {}
+        for word in self.words:
+            if correctable(word):
+                for variant in deletes(word[:PREFIX_LENGTH], max_distance):
+                    self.candidates.setdefault(variant, []).append(word)
+
+    @classmethod
+    def build(cls):
+        started = time.monotonic()
+        index = cls(load_word_counts(), getattr(settings, 'SEARCH_SPELLING_MAX_DISTANCE', 2))
+        logger.info(f"Spelling index built in {time.monotonic() - started:.2f}s ({len(index.words)} words)")
+        return index
+
+    def is_known(self, term):
+        """True if term occurs inside a catalog word, so the substring searches can match it"""
+        return term in self.text
+
+    def suggest(self, term):
+        """Closest catalog word to term, preferring the more frequent word on ties"""
+        candidates = set()
+        for variant in deletes(term[:PREFIX_LENGTH], self.max_distance):
+            candidates.update(self.candidates.get(variant, ()))
+
+        best = None
+        for word in candidates:
+            distance = edit_distance(term, word, self.max_distance)
+            if distance <= self.max_distance:
+                key = (distance, -self.counts[word], word)
+                if best is None or key < best:
+                    best = key
+        return best[2] if best else None
+
+    def correct(self, query):
+        """The query with unknown terms replaced by their suggestion, or None if nothing changed"""
+        terms = query.split()
+        corrected = [
+            (self.suggest(term) or term) if correctable(term) and not self.is_known(term) else term
+            for term in terms
+        ]
+        return ' '.join(corrected) if corrected != terms else None
+
+
+def load_word_counts():
+    """Word frequencies over the title and description columns searched by unified_search"""
+    counts = Counter()
+    for title, description in EducationDb.objects.values_list('title', 'descriptions').iterator():
+        counts.update(tokenize(title))
+        counts.update(tokenize(description))
+    for title, description in ActionDb.objects.values_list('actions', 'action_detail').iterator():
+        counts.update(tokenize(title))
+        counts.update(tokenize(description))
+    for keyword in KeywordSummary.objects.values_list('keyword', flat=True).iterator():
+        counts.update(tokenize(keyword))
+    return counts
+
+
+_spelling_index = CatalogBoundResource(SpellingIndex.build)
+
+
+def spelling_enabled():
+    return getattr(settings, 'SEARCH_SPELLING', False)
+
+
+def correct_query(query):
+    """Spelling-corrected query, or None if the query needs no correction or the index is unavailable"""
+    if not query or not spelling_enabled():
+        return None
+    try:
+        return _spelling_index.get().correct(query)
+    except Exception:
+        logger.exception("Spelling correction failed")
+        return None
+
+
+def reset_spelling_index():
+    _spelling_index.reset()
@@ -0,0 +1,23 @@
+"""Fixtures shared by the search test modules"""
+from apps.search.engine import SearchEngine
+
+
+def make_engine():
+    return SearchEngine(
+        education=[
+            {'id': 1, 'title': 'Climate Course', 'description': 'Climate education for all',
+             'organization': 'UN', 'year': '2022', 'link': 'https://example.com',
+             'sdgs': '13,4', 'location': 'Global'},
+            {'id': 2, 'title': 'Water Basics', 'description': 'Clean water and sanitation',
+             'organization': 'UNSW', 'year': '2021', 'link': '', 'sdgs': '6', 'location': 'Australia'},
+        ],
+        actions=[
+            {'id': 7, 'title': 'Plant Trees', 'description': 'Local tree planting to fight climate change',
+             'organization': 'organization', 'year': '', 'link': 'https://tree.org',
+             'sdgs': '15,13', 'location': 'City Park', 'award': 1},
+        ],
+        keywords=[
+            {'id': 3, 'title': 'climate', 'description': '1', 'organization': '13.1, 13.2',
+             'year': '', 'link': '', 'sdgs': '13', 'location': ''},
+        ],
+    )
@@ -0,0 +1,76 @@
+import threading
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.base import BaseHandler
+from django.http import JsonResponse
+from django.test import AsyncRequestFactory, SimpleTestCase, override_settings
+
+from apps.catalog import async_views
+from apps.catalog.async_views import async_catalog_view, catalog_view
+from apps.search.views import unified_search
+from sdg_backend import settings as production_settings
+from sdg_backend.middleware import CharsetMiddleware
+
+from .helpers import make_engine
+
+
+@override_settings(SEARCH_ENGINE='memory', SEARCH_CACHE_TTL=0)
+class AsyncCatalogViewTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+
+    async def test_runs_sync_view_on_catalog_pool(self):
+        threads = []
+
+        def view(request):
+            threads.append(threading.current_thread().name)
+            return unified_search(request)
+
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()):
+            response = await async_catalog_view(view)(self.factory.get('/api/search/', {'q': 'climate'}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_rendered)
+        self.assertTrue(threads[0].startswith('catalog'))
+
+    @override_settings(CATALOG_ASYNC_QUEUE_LIMIT=2)
+    async def test_rejects_requests_over_the_limit(self):
+        with patch.object(async_views, '_pending', 2):
+            response = await async_catalog_view(unified_search)(self.factory.get('/api/search/'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_catalog_view_follows_setting(self):
+        self.assertIs(catalog_view(unified_search), unified_search)
+        with self.settings(CATALOG_ASYNC_VIEWS=True):
+            wrapped = catalog_view(unified_search)
+        self.assertIsNot(wrapped, unified_search)
+        self.assertTrue(wrapped.csrf_exempt)
+
+
+class AsyncMiddlewareChainTest(SimpleTestCase):
+    @override_settings(MIDDLEWARE=production_settings.MIDDLEWARE)
+    def test_production_middleware_chain_stays_async(self):
+        """No middleware forces the ASGI chain into sync mode (and a thread per request)"""
+        adapt = BaseHandler.adapt_method_mode
+        adapted = []
+
+        def record(handler, is_async, method, method_is_async=None, debug=False, name=None):
+            if name and method_is_async is not None and is_async != method_is_async:
+                adapted.append(name)
+            return adapt(handler, is_async, method, method_is_async, debug, name)
+
+        with patch.object(BaseHandler, 'adapt_method_mode', record):
+            ASGIHandler().load_middleware(is_async=True)
+        self.assertEqual(adapted, [])
+
+    async def test_charset_middleware_async_mode(self):
+        async def get_response(request):
+            return JsonResponse({})
+
+        middleware = CharsetMiddleware(get_response)
+        response = await middleware(AsyncRequestFactory().get('/'))
+        self.assertEqual(response['Content-Type'], 'application/json; charset=utf-8')
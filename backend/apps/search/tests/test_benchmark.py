@@ -0,0 +1,40 @@
+from django.test import TestCase
+
+from apps.actions.models import ActionDb
+from apps.analytics.models import UserBehavior
+from apps.education.models import EducationDb
+from apps.keywords.models import KeywordResource, KeywordSummary
+from apps.keywords.tests.test_summary import KeywordResourceTableMixin
+from apps.search.benchmark import generate_corpus, percentile, query_mix
+
+
+class BenchmarkHelpersTest(KeywordResourceTableMixin, TestCase):
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_generate_corpus_is_reproducible(self):
+        generate_corpus(50, seed=3)
+        self.assertEqual(EducationDb.objects.count(), 50)
+        self.assertEqual(ActionDb.objects.count(), 50)
+        self.assertEqual(KeywordResource.objects.count(), 50)
+        self.assertTrue(KeywordSummary.objects.exists())
+        self.assertFalse(EducationDb.objects.filter(sdg_mask=0).exists())
+        titles = list(EducationDb.objects.order_by('id').values_list('title', flat=True))
+
+        EducationDb.objects.all().delete()
+        ActionDb.objects.all().delete()
+        KeywordResource.objects.all().delete()
+        generate_corpus(50, seed=3)
+        self.assertEqual(list(EducationDb.objects.order_by('id').values_list('title', flat=True)), titles)
+
+    def test_query_mix_replays_recorded_searches(self):
+        queries, source = query_mix(5)
+        self.assertEqual((len(queries), source), (5, 'synthetic'))
+
+        UserBehavior.objects.create(user_id='u1', type='search', detail={'query': 'Clean Water'})
+        queries, source = query_mix(5)
+        self.assertEqual(source, 'user_behavior')
+        self.assertEqual(set(queries), {'clean water'})
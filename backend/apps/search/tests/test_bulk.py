@@ -0,0 +1,29 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.actions.models import ActionDb
+from apps.education.models import EducationDb
+from apps.keywords.models import KeywordResource
+from apps.keywords.tests.test_summary import KeywordResourceTableMixin
+
+
+class BulkDetailTestCase(KeywordResourceTableMixin, TestCase):
+    def test_mixed_sources_keep_requested_order(self):
+        education = EducationDb.objects.create(title='Water course')
+        action = ActionDb.objects.create(actions='Save water')
+        keyword = KeywordResource.objects.create(keyword='water', sdg_number=6, target_code='6.1')
+        items = f'keywords:{keyword.id},education:{education.id},actions:999,actions:{action.id}'
+
+        with self.assertNumQueries(3):
+            response = APIClient().get('/api/search/bulk/', {'items': items})
+        body = response.json()
+        self.assertEqual(
+            [(item['source'], item['id']) for item in body['results']],
+            [('keywords', keyword.id), ('education', education.id), ('actions', action.id)],
+        )
+        self.assertEqual(body['results'][1]['data']['title'], 'Water course')
+        self.assertEqual(body['missing'], [{'source': 'actions', 'id': 999}])
+
+    def test_rejects_unknown_sources(self):
+        response = APIClient().get('/api/search/bulk/', {'items': 'users:1'})
+        self.assertEqual(response.status_code, 400)
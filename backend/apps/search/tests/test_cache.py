@@ -0,0 +1,70 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.catalog.version import CatalogBoundResource, bump_catalog_version, get_catalog_version
+from apps.search.cache import get_cache_stats
+from apps.search.views import unified_search
+
+from .helpers import make_engine
+
+
+class CatalogVersionTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_changes_version(self):
+        version = get_catalog_version()
+        self.assertEqual(get_catalog_version(), version)
+        self.assertNotEqual(bump_catalog_version(), version)
+
+    @override_settings(CATALOG_VERSION_CHECK_SECONDS=0)
+    def test_bound_resource_rebuilds_on_bump(self):
+        builds = []
+        resource = CatalogBoundResource(lambda: builds.append(1) or len(builds))
+        self.assertEqual(resource.get(), 1)
+        self.assertEqual(resource.get(), 1)
+        bump_catalog_version()
+        self.assertEqual(resource.get(), 2)
+
+
+@override_settings(SEARCH_ENGINE='memory', SEARCH_CACHE_TTL=60)
+class SearchResultCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def search(self, params):
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()) as engine:
+            response = unified_search(self.factory.get('/api/search/', params))
+        self.assertEqual(response.status_code, 200)
+        return response, engine.called
+
+    def test_repeat_query_is_served_from_cache(self):
+        first, computed = self.search({'q': 'Climate ', 'sdg': '15,13'})
+        self.assertTrue(computed)
+        second, computed = self.search({'q': 'climate', 'sdg': '13,15'})
+        self.assertFalse(computed)
+        self.assertEqual(second.data, first.data)
+
+        stats = get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_different_page_is_not_shared(self):
+        self.search({'q': 'climate', 'size': 1})
+        _, computed = self.search({'q': 'climate', 'size': 1, 'page': 2})
+        self.assertTrue(computed)
+
+    def test_catalog_bump_invalidates(self):
+        self.search({'q': 'climate'})
+        bump_catalog_version()
+        _, computed = self.search({'q': 'climate'})
+        self.assertTrue(computed)
+
+    @override_settings(SEARCH_CACHE_TTL=0)
+    def test_zero_ttl_disables_cache(self):
+        self.search({'q': 'climate'})
+        _, computed = self.search({'q': 'climate'})
+        self.assertTrue(computed)
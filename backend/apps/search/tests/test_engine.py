@@ -0,0 +1,148 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.search.engine import SubstringIndex, parse_boolean_query
+from apps.search.views import build_flexible_search_queries, search_facets, unified_search
+
+from .helpers import make_engine
+
+
+class SubstringIndexTest(SimpleTestCase):
+    def test_find_returns_each_document_once(self):
+        index = SubstringIndex(['climate climate', None, 'water', 'microclimate'])
+        self.assertEqual(index.find('climate'), {0, 3})
+        self.assertEqual(index.find('nothing'), set())
+
+
+class SearchEngineTest(SimpleTestCase):
+    def setUp(self):
+        self.engine = make_engine()
+
+    def search(self, query, **kwargs):
+        boolean_query = build_flexible_search_queries(query)['boolean_query']
+        return self.engine.search(query, boolean_query=boolean_query, **kwargs)
+
+    def test_parse_boolean_query(self):
+        self.assertEqual(parse_boolean_query('+clean* +water* energy*'), (['clean', 'water'], ['energy']))
+
+    def test_results_have_sql_row_shape(self):
+        results, total = self.search('climate')
+        self.assertEqual(total, 3)
+        for row in results:
+            self.assertEqual(
+                set(row),
+                {'id', 'title', 'description', 'organization', 'year', 'link',
+                 'sdgs', 'location', 'source', 'relevance'},
+            )
+
+    def test_exact_keyword_ranks_first(self):
+        results, _ = self.search('climate')
+        self.assertEqual((results[0]['source'], results[0]['id']), ('keywords', 3))
+
+    def test_prefix_terms_match(self):
+        results, _ = self.search('plant tre')
+        self.assertEqual([(r['source'], r['id']) for r in results], [('actions', 7)])
+
+    def test_no_match(self):
+        results, total = self.search('nonexistentkeyword')
+        self.assertEqual((results, total), ([], 0))
+
+    def test_filters(self):
+        _, total = self.search('climate', source='education')
+        self.assertEqual(total, 1)
+        _, total = self.search('climate', sdg_list=['15'])
+        self.assertEqual(total, 1)
+        _, total = self.search('climate', sdg_list=['18'])
+        self.assertEqual(total, 3)
+        _, total = self.search('climate', sdg_list=['15', '4'])
+        self.assertEqual(total, 0)
+        _, total = self.search('climate', sdg_list=['15', '4'], sdg_mode='any')
+        self.assertEqual(total, 2)
+        _, total = self.search('', location='australia')
+        self.assertEqual(total, 1)
+
+    def test_pagination_reports_full_total(self):
+        results, total = self.search('', offset=1, limit=2)
+        self.assertEqual(total, 4)
+        self.assertEqual(len(results), 2)
+
+    def test_sort_by_title(self):
+        results, _ = self.search('', sort='title')
+        self.assertEqual([r['title'] for r in results], ['climate', 'Climate Course', 'Plant Trees', 'Water Basics'])
+
+    def test_after_cursor_continues_ordering(self):
+        results, _ = self.search('', sort='title')
+        last = results[1]
+        after = {'relevance': last['relevance'], 'title': last['title'].lower(),
+                 'source': last['source'], 'id': last['id']}
+        rest, total = self.search('', sort='title', limit=10, after=after)
+        self.assertEqual(total, 4)
+        self.assertEqual([r['title'] for r in rest], ['Plant Trees', 'Water Basics'])
+
+
+@override_settings(SEARCH_ENGINE='memory')
+class UnifiedSearchMemoryBackendTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_view_uses_memory_engine(self):
+        request = APIRequestFactory().get('/api/search/', {'q': 'climate', 'size': 2})
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()):
+            response = unified_search(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(response.data['num_pages'], 2)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['results'][0]['sdgs_list'], [13])
+
+    def test_cursor_pagination_walks_every_row_once(self):
+        request_factory = APIRequestFactory()
+        seen = []
+        params = {'q': '', 'size': 3, 'cursor': ''}
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()):
+            while True:
+                response = unified_search(request_factory.get('/api/search/', params))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['total'], 4)
+                seen.extend((r['source'], r['id']) for r in response.data['results'])
+                if not response.data['next_cursor']:
+                    break
+                params['cursor'] = response.data['next_cursor']
+
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+
+    def test_invalid_cursor_is_rejected(self):
+        request = APIRequestFactory().get('/api/search/', {'q': 'climate', 'cursor': 'not-a-cursor'})
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()):
+            response = unified_search(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_requires_supported_sort(self):
+        request = APIRequestFactory().get('/api/search/', {'q': 'climate', 'cursor': '', 'sort': 'sdg_count'})
+        response = unified_search(request)
+        self.assertEqual(response.status_code, 400)
+
+    def test_facets_ignore_their_own_filter(self):
+        request = APIRequestFactory().get('/api/search/facets/', {'q': 'climate', 'source': 'education', 'sdg': '13'})
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()):
+            response = search_facets(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], 1)
+        facets = response.data['facets']
+        self.assertEqual(facets['source'], {'education': 1, 'actions': 1, 'keywords': 1})
+        self.assertEqual(facets['sdg']['13'], 1)
+        self.assertEqual(facets['sdg']['4'], 1)
+        self.assertEqual(facets['sdg']['15'], 0)
+        self.assertEqual(facets['location'], [{'value': 'Global', 'count': 1}])
+
+    def test_facets_opt_in_on_unified_search(self):
+        request = APIRequestFactory().get('/api/search/', {'q': 'climate', 'facets': '1'})
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()):
+            response = unified_search(request)
+        self.assertEqual(response.data['facets']['sdg']['13'], 3)
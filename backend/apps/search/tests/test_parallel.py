@@ -0,0 +1,100 @@
+import unicodedata
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.search.engine import SOURCES, sql_title_order_key
+from apps.search.views import run_parallel_sql_search, unified_search
+
+
+def row(source, row_id, title, relevance):
+    return {'source': source, 'id': row_id, 'title': title, 'relevance': relevance, 'sdgs': ''}
+
+
+ROWS = {
+    'education': [row('education', 1, 'Water', 3.0), row('education', 2, 'Climate', 1.0)],
+    'actions': [row('actions', 5, 'Oceans', 2.5), row('actions', 6, 'Energy', 0.5)],
+    'keywords': [row('keywords', 9, 'Poverty', 2.0)],
+}
+
+
+def fake_source_search(search_queries, where_clause, sort_clause, filter_params, size, offset,
+                       after=None, sort='relevance', total_mode='exact', sources=(), timer=None):
+    rows = ROWS[sources[0]]
+    return rows[offset:offset + size], len(rows)
+
+
+@patch('apps.search.views.run_source_search', side_effect=fake_source_search)
+class ParallelSearchTest(SimpleTestCase):
+    def search(self, size, offset, **kwargs):
+        return run_parallel_sql_search([], '', '', [], size, offset, **kwargs)
+
+    def test_merges_sources_by_relevance(self, runner):
+        results, total = self.search(3, 0)
+        self.assertEqual([r['id'] for r in results], [1, 5, 9])
+        self.assertEqual(total, 5)
+
+    def test_each_source_fetches_only_top_k(self, runner):
+        results, _ = self.search(2, 2)
+        self.assertEqual([r['id'] for r in results], [9, 2])
+        for call in runner.call_args_list:
+            self.assertEqual(call.args[4:6], (4, 0))
+
+    def test_title_sort(self, runner):
+        results, _ = self.search(5, 0, sort='title')
+        self.assertEqual([r['title'] for r in results], ['Climate', 'Energy', 'Oceans', 'Poverty', 'Water'])
+
+    def test_only_requested_sources_run(self, runner):
+        results, total = self.search(5, 0, sources=('actions',))
+        self.assertEqual(runner.call_count, 1)
+        self.assertEqual({r['source'] for r in results}, {'actions'})
+        self.assertEqual(total, 2)
+
+    def test_unknown_total_propagates(self, runner):
+        runner.side_effect = lambda *args, **kwargs: (fake_source_search(*args, **kwargs)[0], None)
+        _, total = self.search(3, 0, total_mode='estimate')
+        self.assertIsNone(total)
+
+
+CATALOG = [
+    row('education', 1, 'Éducation', 1.0), row('education', 2, 'apple', 1.0), row('education', 3, 'Zebra', 1.0),
+    row('actions', 4, 'économie', 1.0), row('actions', 5, 'Banana', 1.0), row('keywords', 6, 'ÅLAND', 1.0),
+]
+
+
+def collation_key(title):
+    """Stand-in for utf8mb4_unicode_ci: accents and case are ignored"""
+    decomposed = unicodedata.normalize('NFKD', sql_title_order_key(title))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def fake_mysql_search(search_queries, where_clause, sort_clause, filter_params, size, offset,
+                      after=None, sort='relevance', total_mode='exact', sources=SOURCES, timer=None):
+    """run_sql_search over CATALOG, sorting and applying the cursor in the database's collation"""
+    def key(r):
+        return (collation_key(r['title']), r['source'], r['id'])
+
+    rows = sorted((dict(r) for r in CATALOG if r['source'] in sources), key=key)
+    if after is not None:
+        rows = [r for r in rows if key(r) > (collation_key(after['title']), after['source'], after['id'])]
+    return rows[offset:offset + size], len(rows)
+
+
+@override_settings(SEARCH_PARALLEL=True, SEARCH_ENGINE='sql', SEARCH_CACHE_TTL=0, SEARCH_SPELLING=False)
+@patch('apps.search.views.run_sql_search', side_effect=fake_mysql_search)
+class ParallelCursorTest(SimpleTestCase):
+    def test_cursor_walk_visits_every_row_once_in_collation_order(self, runner):
+        factory = APIRequestFactory()
+        titles, cursor = [], ''
+        for _ in range(len(CATALOG)):
+            response = unified_search(factory.get('/api/search/', {'sort': 'title', 'size': 2, 'cursor': cursor}))
+            self.assertEqual(response.status_code, 200)
+            titles.extend(r['title'] for r in response.data['results'])
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(titles, ['ÅLAND', 'apple', 'Banana', 'économie', 'Éducation', 'Zebra'])
+        # One UNION query per page, never the per-source queries of the parallel path
+        self.assertEqual({call.kwargs['sources'] for call in runner.call_args_list}, {SOURCES})
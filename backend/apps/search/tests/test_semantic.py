@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.search.semantic import SemanticIndex, SparseRows, blend_results
+from apps.search.views import unified_search
+
+from .helpers import make_engine
+
+
+def row(row_id, title, description, source='education', sdgs='7', location='Global'):
+    return {'id': row_id, 'title': title, 'description': description, 'organization': '', 'year': '',
+            'link': '', 'sdgs': sdgs, 'location': location, 'source': source}
+
+
+ROWS = [
+    row(1, 'Solar energy curriculum', 'solar panels and wind power for schools'),
+    row(2, 'Renewables in the city', 'renewables like solar and wind power replace coal'),
+    row(3, 'Clean water basics', 'water sanitation and hygiene', sdgs='6'),
+    row(4, 'Ocean plastics', 'plastic waste in the ocean and water', sdgs='14'),
+    row(5, 'Wind farm visit', 'wind power energy tour', source='actions'),
+    row(6, 'Hygiene workshop', 'sanitation and hygiene for children', source='actions', sdgs='6'),
+]
+
+
+class SparseRowsTest(SimpleTestCase):
+    def test_products_match_dense(self):
+        dense = np.array([[0, 2, 0], [0, 0, 0], [1, 0, 3]], dtype=np.float32)
+        rows = [(np.flatnonzero(r), r[np.flatnonzero(r)]) for r in dense]
+        matrix = SparseRows.from_rows(rows, 3)
+        other = np.arange(6, dtype=np.float32).reshape(3, 2)
+        np.testing.assert_allclose(matrix.dot(other), dense @ other)
+        np.testing.assert_allclose(matrix.transpose().dot(other), dense.T @ other)
+
+
+class SemanticIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = SemanticIndex.fit(ROWS, dimensions=4)
+
+    def test_finds_related_documents_without_the_query_word(self):
+        matches, total = self.index.search('renewables', limit=2)
+        self.assertEqual(matches[0][0]['id'], 2)
+        self.assertEqual(matches[1][0]['id'], 1)
+        self.assertGreaterEqual(total, 2)
+
+    def test_filters(self):
+        matches, _ = self.index.search('hygiene', source='actions')
+        self.assertEqual([match[0]['id'] for match in matches], [6])
+        matches, _ = self.index.search('hygiene', required_sdgs=1 << 5, min_score=0.1)
+        self.assertEqual({match[0]['id'] for match in matches}, {3, 6})
+
+    def test_refresh_reuses_unchanged_vectors(self):
+        rows = ROWS[:5] + [row(6, 'Hygiene workshop', 'handwashing and sanitation', source='actions', sdgs='6')]
+        refreshed = self.index.refresh(rows, dimensions=4, refit_ratio=0.5)
+        self.assertEqual(refreshed.folded, 1)
+        self.assertIs(refreshed.basis, self.index.basis)
+        np.testing.assert_array_equal(refreshed.vectors[:5], self.index.vectors[:5])
+
+        refitted = refreshed.refresh(rows + [row(7, 'Solar cooking', 'solar energy')], dimensions=4, refit_ratio=0.2)
+        self.assertEqual(refitted.folded, 0)
+
+    def test_blend_keeps_rows_from_both_rankings(self):
+        lexical = [dict(ROWS[0], relevance=80), dict(ROWS[2], relevance=40)]
+        semantic = [(ROWS[1], 0.9), (ROWS[0], 0.5)]
+        blended = blend_results(lexical, semantic, weight=0.5)
+        self.assertEqual([r['id'] for r in blended], [1, 2, 3])
+        self.assertAlmostEqual(blended[0]['relevance'], 75.0)
+
+
+@override_settings(SEARCH_ENGINE='memory', SEARCH_SEMANTIC=True, SEARCH_CACHE_TTL=0)
+class SemanticModeViewTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def search(self, params):
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()), \
+                patch('apps.search.views.get_semantic_index', return_value=SemanticIndex.fit(ROWS, 4)):
+            return unified_search(self.factory.get('/api/search/', params))
+
+    def test_semantic_mode(self):
+        response = self.search({'q': 'renewables', 'mode': 'semantic', 'size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['id'], 2)
+
+    def test_hybrid_mode_adds_semantic_matches(self):
+        lexical = self.search({'q': 'climate'}).data
+        hybrid = self.search({'q': 'climate', 'mode': 'hybrid', 'size': 20}).data
+        lexical_keys = {(r['source'], r['id']) for r in lexical['results']}
+        hybrid_keys = {(r['source'], r['id']) for r in hybrid['results']}
+        self.assertTrue(lexical_keys <= hybrid_keys)
+
+    @override_settings(SEARCH_SEMANTIC=False)
+    def test_disabled(self):
+        response = self.search({'q': 'renewables', 'mode': 'semantic'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,67 @@
+from collections import Counter
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.search.engine import tokenize
+from apps.search.spelling import SpellingIndex, edit_distance
+from apps.search.views import unified_search
+
+from .helpers import make_engine
+
+WORDS = Counter(tokenize(
+    'sustainability sustainable education educational climate climate climate '
+    'water sanitation clean change course basics'
+))
+
+
+class SpellingIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = SpellingIndex(WORDS)
+
+    def test_edit_distance_counts_transpositions_once(self):
+        self.assertEqual(edit_distance('educaton', 'education', 2), 1)
+        self.assertEqual(edit_distance('cliamte', 'climate', 2), 1)
+        self.assertEqual(edit_distance('clmte', 'climate', 2), 2)
+        self.assertEqual(edit_distance('water', 'sanitation', 2), 3)
+
+    def test_corrects_unknown_terms(self):
+        self.assertEqual(self.index.correct('sustainibility'), 'sustainability')
+        self.assertEqual(self.index.correct('educaton for clmate'), 'education for climate')
+
+    def test_leaves_known_words_and_substrings_alone(self):
+        self.assertIsNone(self.index.correct('climate education'))
+        self.assertIsNone(self.index.correct('sustain'))
+        self.assertIsNone(self.index.correct('imate'))
+        self.assertIsNone(SpellingIndex({'biology': 5, 'ecology': 3}).correct('ology'))
+        self.assertIsNone(self.index.correct('zzzzzzzz'))
+
+
+@override_settings(SEARCH_ENGINE='memory', SEARCH_SPELLING=True, SEARCH_CACHE_TTL=0)
+class SpellingSearchTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def search(self, params):
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()), \
+                patch('apps.search.spelling._spelling_index.get', return_value=SpellingIndex(WORDS)):
+            return unified_search(self.factory.get('/api/search/', params))
+
+    def test_misspelled_query_is_searched_corrected(self):
+        response = self.search({'q': 'clmate'})
+        self.assertEqual(response.data['did_you_mean'], 'climate')
+        self.assertTrue(response.data['query_corrected'])
+        self.assertGreater(response.data['total'], 0)
+
+    def test_spellcheck_off_only_suggests(self):
+        response = self.search({'q': 'clmate', 'spellcheck': '0'})
+        self.assertEqual(response.data['did_you_mean'], 'climate')
+        self.assertFalse(response.data['query_corrected'])
+        self.assertEqual(response.data['total'], 0)
+
+    def test_correct_query_has_no_suggestion(self):
+        response = self.search({'q': 'climate'})
+        self.assertNotIn('did_you_mean', response.data)
@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from apps.search.timing import (
+    SearchTimer, get_latency_histograms, log_slow_search, record_latency, reset_latency_histograms,
+)
+from apps.search.views import unified_search
+
+from .helpers import make_engine
+
+
+class SearchTimerTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        reset_latency_histograms()
+
+    def test_phases_accumulate_and_format_as_server_timing(self):
+        timer = SearchTimer()
+        timer.add('sql', 2.0)
+        timer.add('sql', 1.5)
+        timer.add('count', 0.25)
+        self.assertEqual(timer.server_timing(), 'sql;dur=3.5, count;dur=0.2')
+
+    def test_histogram_buckets_are_cumulative(self):
+        record_latency({'sql': 3, 'total': 40})
+        record_latency({'sql': 700, 'total': 9000})
+        histograms = get_latency_histograms()
+        self.assertEqual(histograms['sql']['buckets']['5'], 1)
+        self.assertEqual(histograms['sql']['buckets']['1000'], 2)
+        self.assertEqual(histograms['total']['buckets']['5000'], 1)
+        self.assertEqual(histograms['total']['buckets']['inf'], 2)
+        self.assertEqual(histograms['total']['sum_ms'], 9040)
+        self.assertEqual(histograms['facets']['count'], 0)
+
+    @override_settings(SEARCH_LATENCY_FLUSH_SECONDS=60)
+    def test_latency_is_counted_in_memory_until_flushed(self):
+        with patch('apps.search.timing.increment_counter') as increment:
+            record_latency({'sql': 3, 'total': 40})
+            record_latency({'sql': 7, 'total': 45})
+        increment.assert_not_called()
+
+        histograms = get_latency_histograms()
+        self.assertEqual(histograms['sql']['count'], 2)
+        self.assertEqual(histograms['total']['sum_ms'], 85)
+        # The flush itself is timed and written with the next one
+        self.assertEqual(histograms['metrics']['count'], 0)
+        self.assertEqual(get_latency_histograms()['metrics']['count'], 1)
+
+    @override_settings(SEARCH_SLOW_MS=100)
+    def test_slow_search_is_logged(self):
+        timer = SearchTimer()
+        timer.context = {'query': 'climate', 'boolean_query': '+climate*'}
+        with patch('apps.search.timing.slow_logger') as slow_logger:
+            timer.phases['total'] = 50
+            log_slow_search(timer)
+            slow_logger.warning.assert_not_called()
+
+            timer.phases['total'] = 250
+            log_slow_search(timer)
+        slow_logger.warning.assert_called_once()
+        self.assertIn('+climate*', slow_logger.warning.call_args.args[0])
+
+
+@override_settings(SEARCH_ENGINE='memory', SEARCH_CACHE_TTL=0)
+class SearchViewTimingTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        reset_latency_histograms()
+
+    def test_response_carries_server_timing(self):
+        request = APIRequestFactory().get('/api/search/', {'q': 'climate'})
+        with patch('apps.search.views.get_search_engine', return_value=make_engine()):
+            response = unified_search(request)
+
+        self.assertEqual(response.status_code, 200)
+        phases = [part.split(';')[0] for part in response['Server-Timing'].split(', ')]
+        for phase in ('engine', 'postprocess', 'serialize', 'total'):
+            self.assertIn(phase, phases)
+        self.assertEqual(get_latency_histograms()['total']['count'], 1)
@@ -0,0 +1,200 @@
+"""
+Per-phase latency of the search views.
+
+`timed_search` gives every request a SearchTimer. The phases recorded while
+serving it (main SQL query, count query, post-processing, serialization...)
+are returned in a Server-Timing header and added to latency histograms kept
+in the cache. Each process counts into memory and writes its counts to the
+cache every SEARCH_LATENCY_FLUSH_SECONDS, so a request normally costs no
+cache round trip; the flushes are timed as the 'metrics' phase. Requests
+slower than SEARCH_SLOW_MS go to the `apps.search.slow` log with the query
+and filters and, for a sampled share (SEARCH_SLOW_EXPLAIN_RATE), the MySQL
+EXPLAIN of the SQL that was run.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .cache import increment_counter
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger('apps.search.slow')
+
+PHASES = (
+    'cache', 'spelling', 'semantic', 'engine', 'sql', 'count', 'facets', 'postprocess', 'serialize', 'total',
+    'metrics',
+)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Histogram counts of this process not yet written to the cache
+_pending = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+class SearchTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.context = {}
+        self.statements = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name, duration_ms):
+        # Per-source queries of a parallel search add to the same phase from pool threads
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0) + duration_ms
+
+    def record_statement(self, sql, params):
+        with self._lock:
+            self.statements.append((sql, list(params)))
+
+    def finish(self):
+        self.phases['total'] = (time.perf_counter() - self.started) * 1000
+        return self.phases['total']
+
+    def server_timing(self):
+        return ', '.join(f'{name};dur={duration:.1f}' for name, duration in self.phases.items())
+
+
+def timed(timer, name):
+    """timer.phase(name), or a no-op when the caller is not being timed"""
+    return timer.phase(name) if timer is not None else nullcontext()
+
+
+def histogram_key(phase, bucket):
+    return f'search:latency:{phase}:{bucket}'
+
+
+def _count(name, duration):
+    bucket = next((b for b in LATENCY_BUCKETS_MS if duration <= b), 'inf')
+    _pending[histogram_key(name, bucket)] += 1
+    _pending[histogram_key(name, 'sum')] += int(round(duration))
+
+
+def record_latency(phases):
+    """Count a request's phases in memory, flushing to the cache once SEARCH_LATENCY_FLUSH_SECONDS have passed"""
+    with _pending_lock:
+        for name, duration in phases.items():
+            if name in PHASES:
+                _count(name, duration)
+        due = time.monotonic() - _last_flush >= getattr(settings, 'SEARCH_LATENCY_FLUSH_SECONDS', 10)
+    if due:
+        flush_latency()
+
+
+def flush_latency():
+    """Add this process's pending counts to the shared histograms"""
+    global _last_flush
+    with _pending_lock:
+        pending = {key: delta for key, delta in _pending.items() if delta}
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+
+    start = time.perf_counter()
+    try:
+        for key, delta in pending.items():
+            increment_counter(key, delta)
+    except Exception as e:
+        logger.warning(f"Search latency metrics update failed: {e}")
+    with _pending_lock:
+        _count('metrics', (time.perf_counter() - start) * 1000)
+
+
+def get_latency_histograms():
+    """
+    Cumulative bucket counts, request count and summed milliseconds per phase.
+    Other processes' counts show up once they flush.
+    """
+    flush_latency()
+    labels = [str(b) for b in LATENCY_BUCKETS_MS] + ['inf']
+    keys = [histogram_key(phase, label) for phase in PHASES for label in labels + ['sum']]
+    values = cache.get_many(keys)
+
+    histograms = {}
+    for phase in PHASES:
+        running = 0
+        buckets = {}
+        for label in labels:
+            running += values.get(histogram_key(phase, label), 0)
+            buckets[label] = running
+        histograms[phase] = {
+            'buckets': buckets,
+            'count': running,
+            'sum_ms': values.get(histogram_key(phase, 'sum'), 0),
+        }
+    return histograms
+
+
+def reset_latency_histograms():
+    with _pending_lock:
+        _pending.clear()
+    labels = [str(b) for b in LATENCY_BUCKETS_MS] + ['inf', 'sum']
+    cache.delete_many([histogram_key(phase, label) for phase in PHASES for label in labels])
+
+
+def explain(sql, params):
+    if connection.vendor != 'mysql':
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.warning(f"EXPLAIN of slow search failed: {e}")
+        return None
+
+
+def log_slow_search(timer):
+    threshold = getattr(settings, 'SEARCH_SLOW_MS', 1000)
+    total = timer.phases.get('total', 0)
+    if not threshold or total < threshold:
+        return
+
+    entry = dict(timer.context, total_ms=round(total, 1),
+                 phases={name: round(duration, 1) for name, duration in timer.phases.items()})
+    if timer.statements and random.random() < getattr(settings, 'SEARCH_SLOW_EXPLAIN_RATE', 0):
+        entry['explain'] = [explain(sql, params) for sql, params in timer.statements]
+    slow_logger.warning(f"Slow search: {json.dumps(entry, default=str)}")
+
+
+def timed_search(view):
+    """
+    Time a search view. The view reads its timer from `request.search_timer`;
+    the response is rendered here so serialization is part of the timing.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        timer = SearchTimer()
+        request.search_timer = timer
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and not response.is_rendered:
+            with timer.phase('serialize'):
+                response.render()
+        timer.finish()
+
+        response['Server-Timing'] = timer.server_timing()
+        record_latency(timer.phases)
+        log_slow_search(timer)
+        return response
+    return wrapper
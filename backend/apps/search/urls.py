@@ -1,6 +1,12 @@
 from django.urls import path
-from .views import unified_search
+
+from apps.catalog.async_views import catalog_view
+from .views import bulk_detail, search_cache_stats, search_facets, search_latency, unified_search
 
 urlpatterns = [
-    path('', unified_search),  # to /api/search/
+    path('', catalog_view(unified_search)),  # to /api/search/
+    path('facets/', catalog_view(search_facets)),
+    path('bulk/', catalog_view(bulk_detail)),
+    path('cache-stats/', search_cache_stats),
+    path('latency/', search_latency),
 ]
@@ -1,9 +1,36 @@
-from rest_framework.decorators import api_view  
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from django.conf import settings
 from django.db import connection
+import heapq
+import itertools
+import logging
 import math
 import re
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from apps.catalog.bulk import InvalidBulkRequest
+from apps.catalog.cursors import InvalidCursor, decode_cursor, encode_cursor
+from apps.catalog.sdg import sdgs_to_mask
+from .bulk import fetch_items, parse_items
+from .cache import get_cache_stats, get_cached_search, search_cache_key, set_cached_search
+from .engine import SOURCES, get_search_engine, result_sort_key, search_engine_enabled, sql_title_order_key
+from .facets import count_facets
+from .semantic import blend_results, get_semantic_index, semantic_search_enabled
+from .spelling import correct_query
+from .timing import get_latency_histograms, timed, timed_search
+
+logger = logging.getLogger(__name__)
+
+TOTAL_MODES = ('exact', 'inline', 'estimate')
+CURSOR_SORTS = ('relevance', 'title')
+SEARCH_MODES = ('lexical', 'semantic', 'hybrid')
+# Hybrid mode blends the top rows of the lexical and the semantic ranking
+HYBRID_CANDIDATES = 200
 
 def build_flexible_search_queries(query):
     """
@@ -80,35 +107,103 @@ def calculate_word_match_penalty(title, query_terms):
     else:
         return 0  # No penalty for good matches
 
-@api_view(['GET'])
-def unified_search(request):
-    query = request.GET.get('q', '').strip().lower()
-    page = int(request.GET.get('page', 1))
-    size = int(request.GET.get('size', 5))
-    offset = (page - 1) * size
+def read_search_filters(request):
+    """Normalised filter parameters shared by unified_search and search_facets"""
+    sdg_list = [s.strip() for s in request.GET.get('sdg', '').split(',') if s.strip().isdigit()]
+    source = request.GET.get('source', '').strip().lower()
+    return {
+        'location': request.GET.get('location', '').strip().lower(),
+        'sdg_list': sdg_list,
+        # 18 means every SDG, i.e. no SDG filter
+        'required_sdgs': sdgs_to_mask(sdg_list) if '18' not in sdg_list else 0,
+        # Every requested SDG by default, any of them with sdg_mode=any
+        'sdg_mode': 'any' if request.GET.get('sdg_mode', '').strip().lower() == 'any' else 'all',
+        'source': source if source in SOURCES else '',
+    }
 
-    sort = request.GET.get('sort', 'relevance')
-    location = request.GET.get('location', '').strip().lower()
-    sdg = request.GET.get('sdg', '').strip()
-    source_filter = request.GET.get('source', '').strip().lower()
 
+def build_filter_conditions(search_filters):
+    """SQL conditions on the combined search rows for the given filters"""
     filters = []
     filter_params = []
 
-    if location:
+    if search_filters['location']:
         filters.append("LOWER(location) LIKE %s")
-        filter_params.append(f"%{location}%")
+        filter_params.append(f"%{search_filters['location']}%")
 
-    if sdg:
-        sdg_list = [s.strip() for s in sdg.split(',') if s.strip().isdigit()]
-        if '18' not in sdg_list:
-            for s in sdg_list:
-                filters.append("(sdgs REGEXP %s OR sdgs = '18')")
-                filter_params.append(r'\b' + s + r'\b')
+    required_sdgs = search_filters['required_sdgs']
+    if required_sdgs:
+        if search_filters['sdg_mode'] == 'any':
+            filters.append("(sdg_mask & %s) != 0")
+            filter_params.append(required_sdgs)
+        else:
+            filters.append("(sdg_mask & %s) = %s")
+            filter_params.extend([required_sdgs, required_sdgs])
 
-    if source_filter in ['education', 'actions', 'keywords']:
+    if search_filters['source']:
         filters.append("source = %s")
-        filter_params.append(source_filter)
+        filter_params.append(search_filters['source'])
+
+    return filters, filter_params
+
+
+def run_semantic_search(query, search_filters, limit):
+    """(row, cosine) matches from the semantic index for the unified_search filters, and their count"""
+    return get_semantic_index().search(
+        query,
+        location=search_filters['location'],
+        required_sdgs=search_filters['required_sdgs'],
+        sdg_mode=search_filters['sdg_mode'],
+        source=search_filters['source'],
+        limit=limit,
+        min_score=getattr(settings, 'SEARCH_SEMANTIC_MIN_SCORE', 0.2),
+    )
+
+
+def compute_facets(query, search_queries, search_filters, timer=None):
+    """Facet counts for the rows matching `query`, see apps.search.facets"""
+    groups = None
+    if search_engine_enabled():
+        try:
+            groups = get_search_engine().facet_groups(query, boolean_query=search_queries['boolean_query'])
+        except Exception:
+            logger.exception("In-memory facet counting failed, falling back to SQL")
+            groups = None
+
+    if groups is None:
+        with timed(timer, 'sql'):
+            groups = run_sql_facet_groups(search_queries)
+
+    return count_facets(
+        groups,
+        location=search_filters['location'],
+        required_sdgs=search_filters['required_sdgs'],
+        sdg_mode=search_filters['sdg_mode'],
+        source=search_filters['source'],
+    )
+
+@timed_search
+@api_view(['GET'])
+def unified_search(request):
+    timer = request.search_timer
+    query = request.GET.get('q', '').strip().lower()
+    page = int(request.GET.get('page', 1))
+    size = int(request.GET.get('size', 5))
+    offset = (page - 1) * size
+
+    sort = request.GET.get('sort', 'relevance')
+    search_filters = read_search_filters(request)
+    location = search_filters['location']
+    sdg_list = search_filters['sdg_list']
+    sdg_mode = search_filters['sdg_mode']
+    source_filter = search_filters['source']
+    include_facets = request.GET.get('facets', '').strip().lower() in ('1', 'true')
+    spellcheck = request.GET.get('spellcheck', '1').strip().lower() not in ('0', 'false')
+    search_mode = request.GET.get('mode', 'lexical').strip().lower()
+    if search_mode not in SEARCH_MODES or not query:
+        search_mode = 'lexical'
+
+    filters, filter_params = build_filter_conditions(search_filters)
 
     where_clause = ""
     if filters:
@@ -127,12 +222,241 @@ def unified_search(request):
     else:
         sort_clause = "ORDER BY relevance DESC, LOWER(TRIM(title)) ASC"
 
+    # Keyset pagination: `cursor` (empty for the first page) switches from OFFSET to cursor mode
+    cursor_mode = 'cursor' in request.GET
+    after = None
+    if cursor_mode:
+        if sort not in CURSOR_SORTS:
+            return Response(
+                {'error': 'Cursor pagination supports sort=relevance or sort=title'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        token = request.GET.get('cursor', '').strip()
+        if token:
+            try:
+                after = decode_cursor(token, ['relevance', 'title', 'source', 'id'])
+            except InvalidCursor:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+        offset = 0
+        sort_clause = cursor_sort_clause(sort)
+
+    if search_mode != 'lexical':
+        if not semantic_search_enabled():
+            return Response({'error': 'Semantic search is not enabled'}, status=status.HTTP_400_BAD_REQUEST)
+        if cursor_mode:
+            return Response(
+                {'error': 'Cursor pagination is only available in lexical mode'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    # exact: separate count query, inline: counted in the same pass, estimate: no count
+    total_mode = request.GET.get('total', 'exact').strip().lower()
+    if total_mode not in TOTAL_MODES:
+        total_mode = 'exact'
+
+    timer.context = {'query': query, 'sort': sort, 'filters': search_filters, 'page': page, 'size': size}
+
+    cache_key = search_cache_key({
+        'q': query,
+        'page': page,
+        'size': size,
+        'sort': sort,
+        'location': location,
+        'sdg': sorted(sdg_list, key=int),
+        'sdg_mode': sdg_mode,
+        'source': source_filter,
+        'cursor': request.GET.get('cursor', '').strip() if cursor_mode else None,
+        'total': total_mode,
+        'facets': include_facets,
+        'spellcheck': spellcheck,
+        'mode': search_mode,
+    })
+    with timer.phase('cache'):
+        cached = get_cached_search(cache_key)
+    if cached is not None:
+        timer.context['cached'] = True
+        return Response(cached)
+
+    # Terms no catalog word can match ("educaton") are replaced before querying, unless spellcheck=0
+    with timer.phase('spelling'):
+        suggestion = correct_query(query)
+    if suggestion and spellcheck:
+        timer.context['corrected_query'] = suggestion
+        query = suggestion
+
+    # Fetch one extra row to know whether another page exists without counting
+    limit = size + 1 if cursor_mode or total_mode == 'estimate' else size
+
     # Build flexible search queries
     search_queries = build_flexible_search_queries(query)
     search_terms = query.split() if query else []
+    timer.context['boolean_query'] = search_queries['boolean_query']
 
-    raw_query = f"""
-        SELECT * FROM (
+    # Hybrid mode ranks a fixed pool of lexical candidates, paginated after blending
+    lexical_offset, lexical_limit, lexical_total_mode = offset, limit, total_mode
+    if search_mode == 'hybrid':
+        lexical_offset, lexical_limit, lexical_total_mode = 0, HYBRID_CANDIDATES, 'estimate'
+
+    raw_results = None
+    if search_mode == 'semantic':
+        with timer.phase('semantic'):
+            matches, total = run_semantic_search(query, search_filters, offset + limit)
+        raw_results = [dict(row, relevance=round(score * 100, 4)) for row, score in matches[offset:]]
+
+    if raw_results is None and search_engine_enabled():
+        try:
+            with timer.phase('engine'):
+                raw_results, total = get_search_engine().search(
+                    query,
+                    boolean_query=search_queries['boolean_query'],
+                    location=location,
+                    sdg_list=sdg_list,
+                    sdg_mode=sdg_mode,
+                    source=source_filter,
+                    sort=sort,
+                    offset=lexical_offset,
+                    limit=lexical_limit,
+                    after=after,
+                )
+        except Exception:
+            # Fall back to the SQL path if the in-memory index is unavailable
+            logger.exception("In-memory search failed, falling back to SQL")
+            raw_results = None
+
+    if raw_results is None:
+        # Cursors compare titles in MySQL's collation, which the parallel merge can't reproduce
+        # in Python, so cursor pages always come from the single UNION query
+        parallel = getattr(settings, 'SEARCH_PARALLEL', False) and not cursor_mode
+        sql_search = run_parallel_sql_search if parallel else run_sql_search
+        raw_results, total = sql_search(
+            search_queries, where_clause, sort_clause, filter_params, lexical_limit, lexical_offset,
+            after=after, sort=sort, total_mode=lexical_total_mode,
+            sources=(source_filter,) if source_filter else SOURCES, timer=timer,
+        )
+
+    if search_mode == 'hybrid':
+        with timer.phase('semantic'):
+            matches, _ = run_semantic_search(query, search_filters, HYBRID_CANDIDATES)
+            blended = blend_results(raw_results, matches, getattr(settings, 'SEARCH_SEMANTIC_WEIGHT', 0.5))
+        total = len(blended)
+        raw_results = blended[offset:offset + limit]
+
+    has_more = len(raw_results) > size
+    raw_results = raw_results[:size]
+
+    next_cursor = None
+    if cursor_mode and has_more:
+        last = raw_results[-1]
+        next_cursor = encode_cursor({
+            'relevance': float(last.get('relevance') or 0),
+            'title': sql_title_order_key(last.get('title')),
+            'source': last['source'],
+            'id': last['id'],
+        })
+
+    total_is_estimate = total is None
+    if total is None:
+        total = offset + len(raw_results) + (1 if has_more else 0)
+
+    # Title word penalties only apply to the lexical ranking
+    penalty_terms = search_terms if search_mode == 'lexical' else []
+    with timer.phase('postprocess'):
+        postprocess_results(raw_results, penalty_terms)
+
+        # Re-sort by updated relevance scores if we applied penalties
+        if penalty_terms:
+            raw_results.sort(key=lambda x: x.get('relevance', 0), reverse=True)
+
+    results = raw_results
+
+    response_data = {
+        'results': results,
+        'total': total,
+        'num_pages': math.ceil(total / size),
+        'current_page': page,
+    }
+    if total_is_estimate:
+        response_data['total_is_estimate'] = True
+    if suggestion:
+        response_data['did_you_mean'] = suggestion
+        response_data['query_corrected'] = spellcheck
+    if cursor_mode:
+        response_data['next_cursor'] = next_cursor
+    if include_facets:
+        with timer.phase('facets'):
+            response_data['facets'] = compute_facets(query, search_queries, search_filters, timer)['facets']
+
+    response_data['debug_info'] = {
+        'query_used': query,
+        'boolean_query': search_queries['boolean_query'],
+        'word_count': search_queries['word_count'],
+        'filters_applied': len(filters),
+        'total_results': len(results)
+    }
+    set_cached_search(cache_key, response_data)
+
+    return Response(response_data)
+
+
+@api_view(['GET'])
+def search_facets(request):
+    """Counts per SDG, source and location for a query, without fetching any results"""
+    query = request.GET.get('q', '').strip().lower()
+    search_filters = read_search_filters(request)
+
+    cache_key = search_cache_key({
+        'view': 'facets',
+        'q': query,
+        'location': search_filters['location'],
+        'sdg': sorted(search_filters['sdg_list'], key=int),
+        'sdg_mode': search_filters['sdg_mode'],
+        'source': search_filters['source'],
+    })
+    cached = get_cached_search(cache_key)
+    if cached is not None:
+        return Response(cached)
+
+    response_data = compute_facets(query, build_flexible_search_queries(query), search_filters)
+    set_cached_search(cache_key, response_data)
+    return Response(response_data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def search_cache_stats(request):
+    """Hit/miss counters of the unified search result cache"""
+    return Response(get_cache_stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def search_latency(request):
+    """Per-phase latency histograms of unified_search"""
+    return Response(get_latency_histograms())
+
+
+def cursor_sort_clause(sort):
+    """ORDER BY with a unique tie-breaker, required for keyset pagination"""
+    if sort == 'title':
+        return "ORDER BY COALESCE(LOWER(TRIM(title)), '') ASC, source ASC, id ASC"
+    return "ORDER BY relevance DESC, COALESCE(LOWER(TRIM(title)), '') ASC, source ASC, id ASC"
+
+
+def cursor_condition(sort, after):
+    """WHERE condition selecting the rows that sort after the cursor"""
+    title_expr = "COALESCE(LOWER(TRIM(title)), '')"
+    condition = f"({title_expr} > %s OR ({title_expr} = %s AND (source > %s OR (source = %s AND id > %s))))"
+    params = [after['title'], after['title'], after['source'], after['source'], after['id']]
+    if sort != 'title':
+        condition = f"(relevance < %s OR (relevance = %s AND {condition}))"
+        params = [after['relevance'], after['relevance']] + params
+    return condition, params
+
+
+# One SELECT per source; unified_search runs them as a single UNION ALL or, in
+# parallel mode, as separate queries. Every branch yields the same columns.
+SEARCH_BRANCH_SQL = {
+    'education': """
             SELECT
                 id,
                 Title COLLATE utf8mb4_unicode_ci AS title,
@@ -141,6 +465,7 @@ def unified_search(request):
                 Year AS year,
                 Link COLLATE utf8mb4_unicode_ci AS link,
                 `SDGs related` COLLATE utf8mb4_unicode_ci AS sdgs,
+                sdg_mask,
                 Location COLLATE utf8mb4_unicode_ci AS location,
                 'education' AS source,
                 (MATCH(Title, descriptions) AGAINST (%s IN BOOLEAN MODE) * 8 +
@@ -155,9 +480,8 @@ def unified_search(request):
             WHERE (%s != '' AND (MATCH(Title, descriptions) AGAINST (%s IN BOOLEAN MODE) > 0
                OR LOWER(Title) LIKE %s
                OR LOWER(descriptions) LIKE %s)) OR %s = ''
-
-            UNION ALL
-
+""",
+    'actions': """
             SELECT
                 id,
                 Actions COLLATE utf8mb4_unicode_ci AS title,
@@ -170,6 +494,7 @@ def unified_search(request):
                 '' AS year,
                 `Source Links` COLLATE utf8mb4_unicode_ci AS link,
                 ` SDGs` COLLATE utf8mb4_unicode_ci AS sdgs,
+                sdg_mask,
                 `Location (specific actions/org onlyonly)` COLLATE utf8mb4_unicode_ci AS location,
                 'actions' AS source,
                 (MATCH(Actions, `Action detail`) AGAINST (%s IN BOOLEAN MODE) * 8 +
@@ -186,217 +511,335 @@ def unified_search(request):
             WHERE (%s != '' AND (MATCH(Actions, `Action detail`) AGAINST (%s IN BOOLEAN MODE) > 0
                OR LOWER(Actions) LIKE %s
                OR LOWER(`Action detail`) LIKE %s)) OR %s = ''
-
-            UNION ALL
-
+""",
+    'keywords': """
             SELECT
-                MIN(id) AS id,
+                first_resource_id AS id,
                 keyword COLLATE utf8mb4_unicode_ci AS title,
-                GROUP_CONCAT(DISTINCT reference1 ORDER BY reference1 SEPARATOR ' | ') COLLATE utf8mb4_unicode_ci AS description,
-                GROUP_CONCAT(DISTINCT CASE WHEN target_code IS NOT NULL AND target_code != '' THEN target_code END ORDER BY CAST(SUBSTRING_INDEX(target_code, '.', 1) AS UNSIGNED), CAST(SUBSTRING_INDEX(target_code, '.', -1) AS UNSIGNED) SEPARATOR ', ') COLLATE utf8mb4_unicode_ci AS organization,
+                reference_ids COLLATE utf8mb4_unicode_ci AS description,
+                target_codes COLLATE utf8mb4_unicode_ci AS organization,
                 '' AS year,
                 '' AS link,
-                GROUP_CONCAT(DISTINCT CASE WHEN sdg_number IS NOT NULL AND sdg_number != '' THEN sdg_number END ORDER BY CAST(sdg_number AS UNSIGNED) SEPARATOR ', ') COLLATE utf8mb4_unicode_ci AS sdgs,
+                sdgs COLLATE utf8mb4_unicode_ci AS sdgs,
+                sdg_mask,
                 '' AS location,
                 'keywords' AS source,
-                MAX(MATCH(keyword) AGAINST (%s IN BOOLEAN MODE) * 10 +
-                    CASE WHEN LOWER(keyword) = %s THEN 100 ELSE 0 END +
-                    CASE WHEN LOWER(keyword) LIKE %s THEN 60 ELSE 0 END) AS relevance
-            FROM keyword_resources
+                (MATCH(keyword) AGAINST (%s IN BOOLEAN MODE) * 10 +
+                    CASE WHEN keyword_key = %s THEN 100 ELSE 0 END +
+                    CASE WHEN keyword_key LIKE %s THEN 60 ELSE 0 END) AS relevance
+            FROM keyword_summary
             WHERE (%s != '' AND (MATCH(keyword) AGAINST (%s IN BOOLEAN MODE) > 0
-               OR LOWER(keyword) LIKE %s)) OR %s = ''
-            GROUP BY keyword
-        ) AS combined
-        {where_clause}
-        {sort_clause}
-        LIMIT %s OFFSET %s
-    """
+               OR keyword_key LIKE %s)) OR %s = ''
+""",
+}
 
-    count_query = f"""
-        SELECT COUNT(*) FROM (
+# Rows matching the text query, with only the columns needed for counting and filtering
+MATCHED_BRANCH_SQL = {
+    'education': """
             SELECT
                 id,
                 Title COLLATE utf8mb4_unicode_ci AS title,
                 `SDGs related` COLLATE utf8mb4_unicode_ci AS sdgs,
+                sdg_mask,
                 Location COLLATE utf8mb4_unicode_ci AS location,
                 'education' AS source
             FROM education_db
             WHERE (%s != '' AND (MATCH(Title, descriptions) AGAINST (%s IN BOOLEAN MODE) > 0
                OR LOWER(Title) LIKE %s
                OR LOWER(descriptions) LIKE %s)) OR %s = ''
-
-            UNION ALL
-
+""",
+    'actions': """
             SELECT
                 id,
                 Actions COLLATE utf8mb4_unicode_ci AS title,
                 ` SDGs` COLLATE utf8mb4_unicode_ci AS sdgs,
+                sdg_mask,
                 `Location (specific actions/org onlyonly)` COLLATE utf8mb4_unicode_ci AS location,
                 'actions' AS source
             FROM action_db
             WHERE (%s != '' AND (MATCH(Actions, `Action detail`) AGAINST (%s IN BOOLEAN MODE) > 0
                OR LOWER(Actions) LIKE %s
                OR LOWER(`Action detail`) LIKE %s)) OR %s = ''
-
-            UNION ALL
-
+""",
+    'keywords': """
             SELECT
-                MIN(id) AS id,
+                first_resource_id AS id,
                 keyword COLLATE utf8mb4_unicode_ci AS title,
-                GROUP_CONCAT(DISTINCT CASE WHEN sdg_number IS NOT NULL AND sdg_number != '' THEN sdg_number END ORDER BY CAST(sdg_number AS UNSIGNED) SEPARATOR ', ') COLLATE utf8mb4_unicode_ci AS sdgs,
+                sdgs COLLATE utf8mb4_unicode_ci AS sdgs,
+                sdg_mask,
                 '' AS location,
                 'keywords' AS source
-            FROM keyword_resources
+            FROM keyword_summary
             WHERE (%s != '' AND (MATCH(keyword) AGAINST (%s IN BOOLEAN MODE) > 0
-               OR LOWER(keyword) LIKE %s)) OR %s = ''
-            GROUP BY keyword
-        ) AS combined
-        {where_clause}
-    """
+               OR keyword_key LIKE %s)) OR %s = ''
+""",
+}
 
-    # Build optimized parameter arrays
+
+def union_sql(branch_sql, sources):
+    return "\n            UNION ALL\n".join(branch_sql[source] for source in sources)
+
+
+def search_branch_params(source, search_queries):
+    """Parameters for SEARCH_BRANCH_SQL[source] (12 for education/actions, 7 for keywords)"""
     boolean_q = search_queries['boolean_query']
     exact_q = search_queries['exact_query']
-    prefix_q = search_queries['prefix_query']  
+    prefix_q = search_queries['prefix_query']
     like_q = search_queries['like_query']
     query_len_str = str(len(exact_q)) if exact_q else '0'
-    
-    # Main query parameters (optimized structure)
-    main_params = [
-        # Education params (12 total)
-        boolean_q, exact_q, prefix_q, like_q,  # relevance calculation
-        query_len_str, exact_q, exact_q,       # word density bonus
-        boolean_q, boolean_q, like_q, like_q, boolean_q,  # where conditions
-        
-        # Actions params (13 total) 
+
+    if source == 'keywords':
+        return [
+            boolean_q, exact_q, prefix_q,          # relevance calculation
+            boolean_q, boolean_q, like_q, boolean_q,  # where conditions
+        ]
+    return [
         boolean_q, exact_q, prefix_q, like_q,  # relevance calculation
         query_len_str, exact_q, exact_q,       # word density bonus
         boolean_q, boolean_q, like_q, like_q, boolean_q,  # where conditions
-        
-        # Keywords params (7 total)
-        boolean_q, exact_q, prefix_q,          # relevance calculation
-        boolean_q, boolean_q, like_q, boolean_q,  # where conditions
-    ]
-    
-    # Count query parameters (12 total)
-    count_params = [
-        # Education count (5)
-        boolean_q, boolean_q, like_q, like_q, boolean_q,
-        # Actions count (5) 
-        boolean_q, boolean_q, like_q, like_q, boolean_q,
-        # Keywords count (3)
-        boolean_q, boolean_q, like_q, boolean_q
     ]
+
+
+def matched_branch_params(source, search_queries):
+    """Parameters for MATCHED_BRANCH_SQL[source] (5 for education/actions, 4 for keywords)"""
+    boolean_q = search_queries['boolean_query']
+    like_q = search_queries['like_query']
+    if source == 'keywords':
+        return [boolean_q, boolean_q, like_q, boolean_q]
+    return [boolean_q, boolean_q, like_q, like_q, boolean_q]
+
+
+MATCHED_ROWS_SQL = union_sql(MATCHED_BRANCH_SQL, SOURCES)
+
+
+def matched_rows_params(search_queries):
+    """Parameters for MATCHED_ROWS_SQL"""
+    params = []
+    for source in SOURCES:
+        params.extend(matched_branch_params(source, search_queries))
+    return params
+
+
+def run_sql_facet_groups(search_queries):
+    """Return (source, location, sdg_mask, count) groups for every row matching the query"""
+    facet_query = f"""
+        SELECT source, location, sdg_mask, COUNT(*) AS record_count FROM (
+{MATCHED_ROWS_SQL}
+        ) AS combined
+        GROUP BY source, location, sdg_mask
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(facet_query, matched_rows_params(search_queries))
+        return cursor.fetchall()
+
+
+def run_sql_search(search_queries, where_clause, sort_clause, filter_params, size, offset,
+                   after=None, sort='relevance', total_mode='exact', sources=SOURCES, timer=None):
+    """
+    Run the UNION ALL search query over `sources` and return (rows, total).
+
+    total_mode 'exact' runs the separate count query, 'inline' reads
+    COUNT(*) OVER() from the same pass and 'estimate' skips counting and
+    returns None for the total. The queries are timed as the 'sql' and
+    'count' phases of `timer`, if given.
+    """
+    total_column = ", COUNT(*) OVER() AS total_count" if total_mode == 'inline' else ""
+    cursor_clause = ""
+    cursor_params = []
+    if after is not None:
+        condition, cursor_params = cursor_condition(sort, after)
+        cursor_clause = f"WHERE {condition}"
+
+    raw_query = f"""
+        SELECT * FROM (
+        SELECT combined.*{total_column} FROM (
+{union_sql(SEARCH_BRANCH_SQL, sources)}
+        ) AS combined
+        {where_clause}
+        ) AS filtered
+        {cursor_clause}
+        {sort_clause}
+        LIMIT %s OFFSET %s
+    """
+
+    count_query = f"""
+        SELECT COUNT(*) FROM (
+{union_sql(MATCHED_BRANCH_SQL, sources)}
+        ) AS combined
+        {where_clause}
+    """
+
+    main_params = []
+    count_params = []
+    for source in sources:
+        main_params.extend(search_branch_params(source, search_queries))
+        count_params.extend(matched_branch_params(source, search_queries))
     
     # Add filter parameters and pagination
-    main_params.extend(filter_params + [size, offset])
+    main_params.extend(filter_params + cursor_params + [size, offset])
     count_params.extend(filter_params)
 
+    if timer is not None:
+        timer.record_statement(raw_query, main_params)
+
     with connection.cursor() as cursor:
         try:
-            cursor.execute(raw_query, main_params)
-            columns = [col[0] for col in cursor.description]
-            raw_results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        except Exception as e:
-            # Fallback to simpler query if complex query fails
-            print(f"Search query error: {e}")
-            raw_results = []
-
-        # Post-process results with word match penalties
-        for r in raw_results:
-            if search_terms and r.get('title'):
-                penalty = calculate_word_match_penalty(r['title'], search_terms)
-                r['relevance'] = (r.get('relevance', 0) or 0) + penalty
-
-        # Process SDG data (keep your existing logic)
-        for r in raw_results:
-            if r.get('source') == 'keywords':
-                if 'organization' in r and r['organization']:
-                    if isinstance(r['organization'], str):
-                        targets = [target.strip() for target in r['organization'].split(',') if target.strip()]
-                        def target_sort_key(target_str):
-                            try:
-                                if '.' in target_str:
-                                    parts = target_str.split('.')
-                                    major = int(parts[0])
-                                    minor_part = parts[1]
-                                    if minor_part.isdigit():
-                                        minor = int(minor_part)
-                                    else:
-                                        minor = ord(minor_part.upper()) - ord('A') + 100
-                                    return (major, minor)
-                                else:
-                                    return (int(target_str), 0)
-                            except:
-                                return (999, 999)
-                        
-                        r['organization'] = ', '.join(sorted(set(targets), key=target_sort_key))
-                
-                if 'sdgs' in r and isinstance(r['sdgs'], str):
-                    sdg_str = r['sdgs'].strip()
-                    if sdg_str == '18':
-                        r['sdgs_list'] = list(range(1, 18))
-                    elif sdg_str:
-                        sdg_numbers = []
-                        for s in re.split(r'[,\s]+', sdg_str):
-                            s = s.strip()
-                            if s.isdigit():
-                                num = int(s)
-                                if 1 <= num <= 17:
-                                    sdg_numbers.append(num)
-                        r['sdgs_list'] = sorted(list(set(sdg_numbers)))
-                    else:
-                        r['sdgs_list'] = []
+            with timed(timer, 'sql'):
+                cursor.execute(raw_query, main_params)
+                columns = [col[0] for col in cursor.description]
+                raw_results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Exception:
+            logger.exception("Search query failed")
+            raise
+
+        total = None
+        if total_mode == 'inline':
+            for r in raw_results:
+                total = r.pop('total_count')
+            if total is None and offset == 0 and after is None:
+                total = 0
+
+        # The inline count is unknown when the page is past the end; count separately then
+        if total_mode == 'exact' or (total_mode == 'inline' and total is None):
+            with timed(timer, 'count'):
+                cursor.execute(count_query, count_params)
+                total = cursor.fetchone()[0]
+
+    return raw_results, total
+
+
+_search_executor = None
+_search_executor_lock = threading.Lock()
+
+
+def get_search_executor():
+    """Process-wide pool for per-source queries, created on first use"""
+    global _search_executor
+    with _search_executor_lock:
+        if _search_executor is None:
+            _search_executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'SEARCH_PARALLEL_WORKERS', 6),
+                thread_name_prefix='search',
+            )
+    return _search_executor
+
+
+def run_source_search(*args, **kwargs):
+    """run_sql_search on a pool thread; the thread's own DB connection is closed afterwards"""
+    try:
+        return run_sql_search(*args, **kwargs)
+    finally:
+        connection.close()
+
+
+def merge_sort_key(sort, row):
+    return result_sort_key(sort, row, float(row.get('relevance') or 0))
+
+
+def run_parallel_sql_search(search_queries, where_clause, sort_clause, filter_params, size, offset,
+                            after=None, sort='relevance', total_mode='exact', sources=SOURCES, timer=None):
+    """
+    Same contract as run_sql_search, but each source runs as its own query on
+    the search pool. A source returns at most offset + size rows in page order
+    (its top-K), the sorted lists are merged with a heap and the page is cut
+    from the merge. Per-source totals are summed, as are the per-source query
+    times recorded on `timer`.
+
+    The merge compares titles with sql_title_order_key in Python rather than
+    in the collation the sources were sorted with, so it is only used for
+    offset pages; unified_search runs cursor pages through run_sql_search.
+    """
+    top_k = offset + size
+    executor = get_search_executor()
+    futures = [
+        executor.submit(
+            run_source_search, search_queries, where_clause, sort_clause, filter_params, top_k, 0,
+            after=after, sort=sort, total_mode=total_mode, sources=(source,), timer=timer,
+        )
+        for source in sources
+    ]
+
+    source_rows = []
+    total = 0
+    for future in futures:
+        rows, source_total = future.result()
+        # Re-sort with the Python key so heapq.merge sees consistently ordered inputs
+        source_rows.append(sorted(rows, key=lambda row: merge_sort_key(sort, row)))
+        total = None if total is None or source_total is None else total + source_total
+
+    merged = heapq.merge(*source_rows, key=lambda row: merge_sort_key(sort, row))
+    return list(itertools.islice(merged, offset, top_k)), total
+
+
+def postprocess_results(raw_results, search_terms):
+    """Apply word match penalties and normalise SDG / organization fields in place"""
+    # Post-process results with word match penalties
+    for r in raw_results:
+        r.pop('sdg_mask', None)
+        if search_terms and r.get('title'):
+            penalty = calculate_word_match_penalty(r['title'], search_terms)
+            r['relevance'] = (r.get('relevance', 0) or 0) + penalty
+
+    # Process SDG data (keep your existing logic)
+    for r in raw_results:
+        if r.get('source') == 'keywords':
+            # Target codes arrive pre-sorted from keyword_summary
+            if 'sdgs' in r and isinstance(r['sdgs'], str):
+                sdg_str = r['sdgs'].strip()
+                if sdg_str == '18':
+                    r['sdgs_list'] = list(range(1, 18))
+                elif sdg_str:
+                    sdg_numbers = []
+                    for s in re.split(r'[,\s]+', sdg_str):
+                        s = s.strip()
+                        if s.isdigit():
+                            num = int(s)
+                            if 1 <= num <= 17:
+                                sdg_numbers.append(num)
+                    r['sdgs_list'] = sorted(list(set(sdg_numbers)))
                 else:
                     r['sdgs_list'] = []
-                    
             else:
-                if 'sdgs' in r and isinstance(r['sdgs'], str):
-                    sdg_str = r['sdgs'].strip()
-                    if sdg_str == '18':
-                        r['sdgs_list'] = list(range(1, 18))
-                    elif sdg_str:
-                        sdg_numbers = []
-                        for s in re.findall(r'\d+', sdg_str):
-                            if s.isdigit():
-                                num = int(s)
-                                if 1 <= num <= 17:
-                                    sdg_numbers.append(num)
-                        r['sdgs_list'] = sorted(list(set(sdg_numbers)))
-                    else:
-                        r['sdgs_list'] = []
+                r['sdgs_list'] = []
+                
+        else:
+            if 'sdgs' in r and isinstance(r['sdgs'], str):
+                sdg_str = r['sdgs'].strip()
+                if sdg_str == '18':
+                    r['sdgs_list'] = list(range(1, 18))
+                elif sdg_str:
+                    sdg_numbers = []
+                    for s in re.findall(r'\d+', sdg_str):
+                        if s.isdigit():
+                            num = int(s)
+                            if 1 <= num <= 17:
+                                sdg_numbers.append(num)
+                    r['sdgs_list'] = sorted(list(set(sdg_numbers)))
                 else:
                     r['sdgs_list'] = []
-                
-                if 'organization' in r and r['organization']:
-                    if isinstance(r['organization'], str):
-                        orgs = [org.strip() for org in r['organization'].split(',') if org.strip() and org.strip().lower() != 'none']
-                        r['organization'] = ', '.join(sorted(set(orgs))) if orgs else ''
-                    else:
-                        r['organization'] = ''
+            else:
+                r['sdgs_list'] = []
+            
+            if 'organization' in r and r['organization']:
+                if isinstance(r['organization'], str):
+                    orgs = [org.strip() for org in r['organization'].split(',') if org.strip() and org.strip().lower() != 'none']
+                    r['organization'] = ', '.join(sorted(set(orgs))) if orgs else ''
                 else:
                     r['organization'] = ''
+            else:
+                r['organization'] = ''
 
-    # Re-sort by updated relevance scores if we applied penalties
-    if search_terms:
-        raw_results.sort(key=lambda x: x.get('relevance', 0), reverse=True)
-
-    results = raw_results
 
-    with connection.cursor() as cursor:
-        cursor.execute(count_query, count_params)
-        total = cursor.fetchone()[0]
+@api_view(['GET'])
+def bulk_detail(request):
+    """
+    Detail payloads of mixed search results in one request:
+    ?items=education:3,keywords:7,actions:1, returned in that order
+    """
+    try:
+        items = parse_items(request.query_params)
+    except InvalidBulkRequest as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    return Response({
-        'results': results,
-        'total': total,
-        'num_pages': math.ceil(total / size),
-        'current_page': page,
-        'debug_info': {
-            'query_used': query,
-            'boolean_query': search_queries['boolean_query'],
-            'word_count': search_queries['word_count'],
-            'filters_applied': len(filters),
-            'total_results': len(results)
-        }
-    })
\ No newline at end of file
+    results, missing = fetch_items(request, items)
+    return Response({'results': results, 'missing': missing})
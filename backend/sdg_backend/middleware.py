@@ -1,13 +1,29 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+
 class CharsetMiddleware:
+    # Both modes, so under ASGI the middleware chain stays async and async views keep their thread
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        response = self.get_response(request)
-        
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.set_charset(self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.set_charset(await self.get_response(request))
+
+    def set_charset(self, response):
         # Ensure JSON responses include charset
         content_type = response.get('Content-Type', '')
         if content_type.startswith('application/json') and 'charset' not in content_type:
             response['Content-Type'] = 'application/json; charset=utf-8'
             
-        return response
\ No newline at end of file
+        return response
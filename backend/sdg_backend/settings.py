@@ -244,6 +244,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'apps.search.slow': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -280,6 +285,52 @@ CACHES = {
     }
 }
 
+# Search settings
+# 'sql' runs the MySQL UNION query, 'memory' serves unified_search from the in-process index
+SEARCH_ENGINE = os.getenv('SEARCH_ENGINE', 'sql')
+# The index is rebuilt when the catalog version changes; this is only an upper bound on its age
+SEARCH_ENGINE_REFRESH_SECONDS = int(os.getenv('SEARCH_ENGINE_REFRESH_SECONDS', 3600))
+# Cached search responses are keyed by catalog version; 0 disables the cache
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 600))
+# How often each worker re-reads the shared catalog version
+CATALOG_VERSION_CHECK_SECONDS = int(os.getenv('CATALOG_VERSION_CHECK_SECONDS', 5))
+# Run the education/actions/keywords queries concurrently instead of as one UNION
+SEARCH_PARALLEL = os.getenv('SEARCH_PARALLEL', 'False').lower() == 'true'
+SEARCH_PARALLEL_WORKERS = int(os.getenv('SEARCH_PARALLEL_WORKERS', 6))
+# Searches slower than this many milliseconds are logged to apps.search.slow (0 disables);
+# the given share of them also logs the MySQL EXPLAIN of the search SQL
+SEARCH_SLOW_MS = int(os.getenv('SEARCH_SLOW_MS', 1000))
+SEARCH_SLOW_EXPLAIN_RATE = float(os.getenv('SEARCH_SLOW_EXPLAIN_RATE', 0))
+# Each worker counts search latencies in memory and adds them to the cached histograms this often
+SEARCH_LATENCY_FLUSH_SECONDS = int(os.getenv('SEARCH_LATENCY_FLUSH_SECONDS', 10))
+# Correct misspelled search terms against the catalog vocabulary (apps.search.spelling)
+SEARCH_SPELLING = os.getenv('SEARCH_SPELLING', 'True').lower() == 'true'
+SEARCH_SPELLING_MAX_DISTANCE = int(os.getenv('SEARCH_SPELLING_MAX_DISTANCE', 2))
+# Semantic (LSA) ranking for unified_search mode=semantic|hybrid (apps.search.semantic)
+SEARCH_SEMANTIC = os.getenv('SEARCH_SEMANTIC', 'False').lower() == 'true'
+SEARCH_SEMANTIC_DIMENSIONS = int(os.getenv('SEARCH_SEMANTIC_DIMENSIONS', 128))
+SEARCH_SEMANTIC_MIN_SCORE = float(os.getenv('SEARCH_SEMANTIC_MIN_SCORE', 0.2))
+# Share of the lexical score in hybrid mode is 1 - SEARCH_SEMANTIC_WEIGHT
+SEARCH_SEMANTIC_WEIGHT = float(os.getenv('SEARCH_SEMANTIC_WEIGHT', 0.5))
+SEARCH_SEMANTIC_REFIT_RATIO = float(os.getenv('SEARCH_SEMANTIC_REFIT_RATIO', 0.2))
+# Directory for the memory-mapped document vectors; empty keeps them on the heap
+SEARCH_SEMANTIC_DIR = os.getenv('SEARCH_SEMANTIC_DIR', '')
+
+# Upper bound on the age of the keyword autocomplete index, which also carries search popularity
+KEYWORD_AUTOCOMPLETE_REFRESH_SECONDS = int(os.getenv('KEYWORD_AUTOCOMPLETE_REFRESH_SECONDS', 3600))
+
+# Most texts one request to the keyword tagger (/api/keywords/tag/) may carry
+KEYWORD_TAGGER_MAX_BATCH = int(os.getenv('KEYWORD_TAGGER_MAX_BATCH', 5000))
+
+# Most records one bulk detail request (/api/education/bulk/, /api/search/bulk/...) may ask for
+CATALOG_BULK_MAX_IDS = int(os.getenv('CATALOG_BULK_MAX_IDS', 100))
+
+# Serve the search and catalog read endpoints as async views on their own thread pool
+# (apps.catalog.async_views), so search bursts can't take every thread daphne needs
+CATALOG_ASYNC_VIEWS = os.getenv('CATALOG_ASYNC_VIEWS', 'False').lower() == 'true'
+CATALOG_ASYNC_CONCURRENCY = int(os.getenv('CATALOG_ASYNC_CONCURRENCY', 8))
+CATALOG_ASYNC_QUEUE_LIMIT = int(os.getenv('CATALOG_ASYNC_QUEUE_LIMIT', 100))
+
 # Celery settings
 CELERY_BROKER_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}'
 CELERY_RESULT_BACKEND = f'redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}'
@@ -0,0 +1,16 @@
+"""
+Settings for `manage.py benchmark_search` on SQLite: the test settings with
+a file database so a generated corpus can be reused.
+"""
+import os
+
+from .settings_test import *  # noqa
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.getenv("BENCHMARK_DB", str(BASE_DIR / "benchmark.sqlite3")),
+    }
+}
+
+DEBUG = False
@@ -22,6 +22,9 @@ INSTALLED_APPS = [
     "apps.authentication.core",
     "apps.authentication.profile",
     "apps.authentication.uploads",
+    "apps.notifications",
+    "apps.keywords",
+    "apps.search",
 ]
 
 MIDDLEWARE = [
@@ -61,6 +64,10 @@ MIGRATION_MODULES = {
     "sessions": None,
     "team": None,
     "authentication": None,
+    "education": None,
+    "actions": None,
+    "keywords": None,
+    "notifications": None,
 }
 
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
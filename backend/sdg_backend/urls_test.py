@@ -8,6 +8,8 @@ urlpatterns = [
     path("api/actions/", include("apps.actions.urls")),
     path("api/team/", include("apps.team.urls")),
     path("api/authentication/", include("apps.authentication.urls")),
+    path("api/keywords/", include("apps.keywords.urls")),
+    path("api/search/", include("apps.search.urls")),
     path("profile/", profile_views.user_profile, name='user_profile'),
     path("profile/update/", profile_views.update_profile, name='update_profile'),
 ]
\ No newline at end of file